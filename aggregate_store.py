@@ -0,0 +1,210 @@
+"""
+aggregate_store.py - Rolling Aggregate Store
+Keeps per-invoice partial sums from every capture in a local SQLite file,
+so cumulative (e.g. month-to-date) by-account / by-brand / by-brand-category
+reports come from a single indexed query instead of re-reading every
+captured export.
+
+Partial sums are kept per Ship Date and reports select by Ship Date, so
+a month-to-date report covers the lines shipped that month whenever they
+were captured. Each capture replaces the partial sums of the invoices it
+contains (unless a later capture already stored them), so exporting
+overlapping date ranges never counts an invoice twice.
+
+Usage: python aggregate_store.py STORE.sqlite br --start 2025-06-01 --end 2025-06-30
+"""
+
+import sqlite3
+import argparse
+from datetime import date
+
+import pandas as pd
+
+from aggregation import format_report, report_values
+
+# Missing Account Name / Brand / CATEGORY / Ship Date are stored as '' so
+# they can be part of the primary key. ship_date selects rows for a report;
+# capture_date only decides which capture's version of an invoice is kept.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partial_sums (
+    invoice_number TEXT NOT NULL,
+    account_name   TEXT NOT NULL,
+    brand          TEXT NOT NULL,
+    category       TEXT NOT NULL,
+    ship_date      TEXT NOT NULL,
+    capture_date   TEXT NOT NULL,
+    sale_price     REAL NOT NULL,
+    unit_cost      REAL NOT NULL,
+    PRIMARY KEY (invoice_number, account_name, brand, category, ship_date)
+);
+"""
+_INDEXES = "CREATE INDEX IF NOT EXISTS partial_sums_ship_date ON partial_sums (ship_date);"
+
+# report name -> (output key column, SQL key expression, SQL filter)
+# A missing Brand is labelled 'nan' in brcat, as in the per-capture reports
+_REPORT_QUERIES = {
+    "id": ("Account Name", "account_name", "account_name != ''"),
+    "br": ("Brand", "brand", "brand != ''"),
+    "brcat": ("Brand : Category", "CASE WHEN brand = '' THEN 'nan' ELSE brand END || ' : ' || category",
+              "category != ''"),
+}
+
+_KEY_COLUMNS = ["Invoice Number", "Account Name", "Brand", "CATEGORY", "Ship Date"]
+
+
+def partial_sums(df, weighting="unit"):
+    """
+    Sum a capture's Sale Price / Unit Cost per (invoice, account, brand,
+    category, ship date).
+
+    Returns:
+        DataFrame: One row per key, missing key parts as '' and Ship Date as YYYY-MM-DD
+    """
+    text_columns = _KEY_COLUMNS[:-1]
+    keys = df[text_columns].astype(object).where(df[text_columns].notna(), "").astype(str)
+    keys["Ship Date"] = _ship_dates(df)
+    values = pd.DataFrame(report_values(df, weighting), index=df.index)
+    partial = pd.concat([keys, values], axis=1)
+    partial = partial.groupby(_KEY_COLUMNS, sort=False, as_index=False).sum()
+    return partial[partial["Invoice Number"] != ""]
+
+
+def _ship_dates(df):
+    """Ship Date as YYYY-MM-DD text ('' where missing or unparseable)."""
+    if "Ship Date" not in df.columns:
+        return pd.Series("", index=df.index)
+    parsed = pd.to_datetime(df["Ship Date"], errors="coerce")
+    return parsed.dt.strftime("%Y-%m-%d").where(parsed.notna(), "").astype(object)
+
+
+def combine_partials(partials):
+    """Merge partial_sums() frames from several chunks of one capture."""
+    partial = pd.concat(partials, ignore_index=True)
+    return partial.groupby(_KEY_COLUMNS, sort=False, as_index=False).sum()
+
+
+class AggregateStore:
+    """SQLite-backed store of per-invoice partial sums."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(partial_sums)")}
+        if "ship_date" not in columns:
+            self.conn.close()
+            raise ValueError(f"{path} was written before partial sums kept their Ship Date; "
+                             "move it aside and rebuild it with batch.py --store")
+        self.conn.executescript(_INDEXES)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append_capture(self, df, capture_date=None, weighting="unit"):
+        """
+        Fold an enriched capture into the store.
+
+        Args:
+            df (DataFrame): Enriched capture (needs Invoice Number, Account
+                Name, Brand, CATEGORY, Ship Date, Sale Price, Unit Cost)
+            capture_date (date, optional): Defaults to today
+            weighting (str): "unit" or "quantity" (see aggregation.py); use
+                the same weighting for every capture in one store
+
+        Returns:
+            int: Number of partial-sum rows written
+        """
+        return self.append_partials(partial_sums(df, weighting), capture_date)
+
+    def append_partials(self, partial, capture_date=None):
+        """
+        Store per-invoice partial sums built by partial_sums().
+
+        Lets a capture read in chunks be folded in once, after its chunks'
+        partial sums have been combined with combine_partials().
+
+        An invoice already stored from a later capture (e.g. batch.py
+        reprocessing an old export) keeps that later version.
+
+        Returns:
+            int: Number of partial-sum rows written
+        """
+        capture_date = (capture_date or date.today()).isoformat()
+        invoices = [(inv,) for inv in partial["Invoice Number"].unique()]
+
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS capture_invoices (invoice_number TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM capture_invoices")
+            self.conn.executemany("INSERT OR IGNORE INTO capture_invoices VALUES (?)", invoices)
+            newer = {
+                inv for (inv,) in self.conn.execute(
+                    "SELECT DISTINCT invoice_number FROM partial_sums WHERE capture_date > ? "
+                    "AND invoice_number IN (SELECT invoice_number FROM capture_invoices)", (capture_date,))
+            }
+            rows = [
+                (inv, acc, brand, cat, ship, capture_date, float(sale), float(cost))
+                for inv, acc, brand, cat, ship, sale, cost in partial.itertuples(index=False, name=None)
+                if inv not in newer
+            ]
+            # Re-exported invoices replace what an earlier capture stored
+            self.conn.execute("DELETE FROM capture_invoices WHERE invoice_number IN "
+                              "(SELECT DISTINCT invoice_number FROM partial_sums WHERE capture_date > ?)",
+                              (capture_date,))
+            self.conn.execute(
+                "DELETE FROM partial_sums WHERE invoice_number IN (SELECT invoice_number FROM capture_invoices)"
+            )
+            self.conn.executemany("INSERT INTO partial_sums VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def query_report(self, report, start=None, end=None):
+        """
+        Cumulative report over lines shipped in [start, end].
+
+        Args:
+            report (str): "id", "br" or "brcat"
+            start (date or str, optional): First ship date (inclusive)
+            end (date or str, optional): Last ship date (inclusive)
+
+        Returns:
+            DataFrame: Same layout as the per-capture processed reports
+        """
+        key, expression, key_filter = _REPORT_QUERIES[report]
+        where = [key_filter]
+        params = []
+        if start is not None:
+            where.append("ship_date >= ?")
+            params.append(str(start))
+        if end is not None:
+            where.append("ship_date <= ?")
+            params.append(str(end))
+
+        sql = (
+            f"SELECT {expression} AS k, SUM(sale_price), SUM(unit_cost) FROM partial_sums "
+            f"WHERE {' AND '.join(where)} GROUP BY k ORDER BY k"
+        )
+        rows = self.conn.execute(sql, params).fetchall()
+        labels = [r[0] for r in rows]
+        return format_report(key, labels, [r[1] for r in rows], [r[2] for r in rows])
+
+    def capture_dates(self):
+        """Return the sorted list of capture dates held in the store."""
+        rows = self.conn.execute("SELECT DISTINCT capture_date FROM partial_sums ORDER BY capture_date")
+        return [r[0] for r in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query cumulative reports from the rolling aggregate store.")
+    parser.add_argument("store", help="path to the SQLite store")
+    parser.add_argument("report", choices=sorted(_REPORT_QUERIES))
+    parser.add_argument("--start", help="first ship date, YYYY-MM-DD")
+    parser.add_argument("--end", help="last ship date, YYYY-MM-DD")
+    args = parser.parse_args()
+
+    with AggregateStore(args.store) as store:
+        print(store.query_report(args.report, args.start, args.end).to_string(index=False))
@@ -0,0 +1,279 @@
+"""
+aggregation.py - Single-Pass Report Aggregation
+Computes every profit report from one factorization of the key columns
+and one bincount per value column, instead of one groupby per report.
+
+Two weightings are supported:
+    "unit"     - sum Sale Price and Unit Cost once per line (the original figures)
+    "quantity" - sum extended revenue and cost: price x (Sale Quantity - RT Quantity)
+
+Sums are taken over values scaled to whole millionths (VALUE_SCALE), which
+float64 adds exactly, so totals don't depend on row order or on how rows
+are split into chunks: ReportAccumulator folding an export chunk by chunk
+produces exactly the reports build_reports does on the whole frame.
+"""
+
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# name:    key used in the result dict (and output filenames)
+# key:     column to group by
+# require: column that must be non-null for a row to count (or None)
+ReportSpec = namedtuple("ReportSpec", ["name", "key", "require"])
+
+REPORT_SPECS = [
+    ReportSpec("id", "Account Name", None),
+    ReportSpec("br", "Brand", None),
+    ReportSpec("brcat", "Brand : Category", "CATEGORY"),
+]
+
+VALUE_COLUMNS = ["Sale Price", "Unit Cost"]
+WEIGHTINGS = ("unit", "quantity")
+
+# Values are summed as whole millionths; float64 holds integers exactly up
+# to 2**53, i.e. totals up to about 9 billion per report key
+VALUE_SCALE = 1_000_000
+
+
+def _as_categorical(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    return values.astype("category")
+
+
+def add_brand_category(df):
+    """
+    Add the "Brand : Category" key column (blank where CATEGORY is missing).
+
+    Built from the Brand and CATEGORY category codes: each row gets a pair
+    code, and only the distinct pairs that occur are formatted as strings.
+    The result is a Categorical whose categories are in string order, so it
+    groups exactly like the concatenated strings would.
+    """
+    brand = _as_categorical(df["Brand"])
+    category = _as_categorical(df["CATEGORY"])
+    brand_codes = brand.cat.codes.to_numpy().astype(np.int64)
+    category_codes = category.cat.codes.to_numpy().astype(np.int64)
+    n_categories = max(len(category.cat.categories), 1)
+
+    # A missing Brand gets slot 0 and is labelled "nan", as astype(str) would
+    valid = category_codes >= 0
+    pair_codes = (brand_codes[valid] + 1) * n_categories + category_codes[valid]
+    pairs, inverse = np.unique(pair_codes, return_inverse=True)
+
+    brand_labels = np.concatenate([["nan"], brand.cat.categories.astype(str)])
+    category_labels = np.asarray(category.cat.categories.astype(str))
+    labels = np.array([
+        f"{b} : {c}"
+        for b, c in zip(brand_labels[pairs // n_categories], category_labels[pairs % n_categories])
+    ], dtype=object)
+
+    order = np.argsort(labels, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    codes = np.full(len(df), -1, dtype=np.int64)
+    codes[valid] = rank[inverse.ravel()]
+
+    try:
+        df["Brand : Category"] = pd.Categorical.from_codes(codes, categories=labels[order])
+    except ValueError:
+        # Two different pairs formatted to the same string; fall back to concatenation
+        df["Brand : Category"] = (df["Brand"].astype(str) + " : " + df["CATEGORY"].astype(str)).where(df["CATEGORY"].notna())
+    return df
+
+
+def _column_values(df, column):
+    # Always a fresh float64 array (NaN -> 0), so callers may modify it in place
+    return np.nan_to_num(df[column].to_numpy(dtype=np.float64))
+
+
+def report_values(df, weighting="unit"):
+    """
+    Per-row Sale Price and Unit Cost contributions under a weighting.
+
+    For "quantity", each price is multiplied by the net units shipped
+    (Sale Quantity minus RT Quantity returns, if that column exists). The
+    net quantity is computed once and both price arrays are scaled in
+    place, so the weighting adds no extra copies of the data.
+
+    Args:
+        df (DataFrame): Enriched capture
+        weighting (str): "unit" or "quantity"
+
+    Returns:
+        dict: value column -> float64 array (missing values count as 0)
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"Unknown weighting {weighting!r} (choose from {', '.join(WEIGHTINGS)})")
+
+    values = {column: _column_values(df, column) for column in VALUE_COLUMNS}
+    if weighting == "quantity":
+        net_quantity = _column_values(df, "Sale Quantity")
+        if "RT Quantity" in df.columns:
+            np.subtract(net_quantity, _column_values(df, "RT Quantity"), out=net_quantity)
+        for array in values.values():
+            np.multiply(array, net_quantity, out=array)
+    return values
+
+
+def _factorize(values):
+    """
+    Sorted integer codes (-1 for missing) and labels for one key column.
+
+    Categorical columns with sorted categories already are a factorization,
+    so their codes are used as-is instead of re-hashing every string;
+    unused categories are dropped later because they never get a count.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.is_monotonic_increasing:
+        return values.cat.codes.to_numpy().astype(np.intp), np.asarray(values.cat.categories)
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes, np.asarray(uniques)
+
+
+def profit_ratio(sale, cost):
+    """
+    Profit as a fraction of sale price (0.1912 for 19.12%), rounded to 4 places.
+
+    Rows with zero Sale Price have no meaningful margin and get NaN (an empty
+    cell) rather than inf.
+    """
+    sale = np.asarray(sale, dtype=np.float64)
+    cost = np.asarray(cost, dtype=np.float64)
+    ratio = np.full(len(sale), np.nan)
+    nonzero = sale != 0
+    np.divide(sale - cost, sale, out=ratio, where=nonzero)
+    return np.round(ratio, 4)
+
+
+def format_report(key, labels, sale_sum, cost_sum):
+    """
+    Build a report frame in the layout the processed files have always used.
+
+    Profit % stays numeric (a fraction); the report writers give the column
+    a percentage number format, so Excel shows 19.12% and can sort on it.
+    """
+    grouped_df = pd.DataFrame({
+        key: labels,
+        "Sale Price": sale_sum,
+        "Unit Cost": cost_sum,
+    })
+    grouped_df["Profit %"] = profit_ratio(grouped_df["Sale Price"], grouped_df["Unit Cost"])
+    grouped_df.rename(columns={"Sale Price": "Agg Sale Price", "Unit Cost": "Agg Unit Cost"}, inplace=True)
+    return grouped_df
+
+
+def _scaled_sums(df, specs, weighting):
+    """
+    Per-key scaled sums for every spec in one pass.
+
+    Each distinct key column is factorized once (sorted, NaN dropped, same
+    as groupby; categorical columns reuse their codes). The per-report codes
+    are offset into one shared code space so a single np.bincount per value
+    column produces all report sums.
+
+    Returns:
+        dict: spec.name -> (sorted labels, scaled Sale Price sums, scaled Unit Cost sums)
+    """
+    factorized = {}
+    for spec in specs:
+        if spec.key not in factorized:
+            factorized[spec.key] = _factorize(df[spec.key])
+
+    all_codes = []
+    offsets = []
+    total = 0
+    for spec in specs:
+        codes, uniques = factorized[spec.key]
+        if spec.require is not None:
+            codes = np.where(df[spec.require].notna().to_numpy(), codes, -1)
+        offsets.append(total)
+        all_codes.append(np.where(codes >= 0, codes + total, -1))
+        total += len(uniques)
+
+    all_codes = np.concatenate(all_codes) if all_codes else np.empty(0, dtype=np.intp)
+    valid = all_codes >= 0
+    all_codes = all_codes[valid]
+
+    counts = np.bincount(all_codes, minlength=total)
+    sums = {}
+    for column, values in report_values(df, weighting).items():
+        np.round(np.multiply(values, VALUE_SCALE, out=values), out=values)
+        weights = np.tile(values, len(specs))[valid]
+        sums[column] = np.bincount(all_codes, weights=weights, minlength=total)
+
+    results = {}
+    for spec, offset in zip(specs, offsets):
+        codes, uniques = factorized[spec.key]
+        # Keys with no surviving rows (filtered by spec.require) are dropped,
+        # just as groupby never sees them.
+        span = slice(offset, offset + len(uniques))
+        seen = counts[span] > 0
+        results[spec.name] = (uniques[seen], sums["Sale Price"][span][seen], sums["Unit Cost"][span][seen])
+    return results
+
+
+def build_reports(df, specs=REPORT_SPECS, weighting="unit"):
+    """
+    Aggregate Sale Price and Unit Cost for every report spec in one pass.
+
+    Args:
+        df (DataFrame): Enriched capture
+        specs (list): ReportSpec entries to compute
+        weighting (str): "unit" (per line) or "quantity" (extended by net units)
+
+    Returns:
+        dict: spec.name -> report DataFrame
+    """
+    sums = _scaled_sums(df, specs, weighting)
+    reports = {}
+    for spec in specs:
+        labels, sale, cost = sums[spec.name]
+        reports[spec.name] = format_report(spec.key, labels, sale / VALUE_SCALE, cost / VALUE_SCALE)
+    return reports
+
+
+class ReportAccumulator:
+    """
+    Running per-key report sums, fed one chunk of an export at a time.
+
+    Memory grows with the number of distinct keys (accounts, brands,
+    brand-categories), not with the number of rows. reports() returns
+    exactly what build_reports would on all the chunks concatenated.
+    """
+
+    def __init__(self, specs=REPORT_SPECS, weighting="unit"):
+        self.specs = specs
+        self.weighting = weighting
+        self.rows = 0
+        self._totals = {spec.name: {} for spec in specs}
+
+    def add(self, df):
+        """Fold one enriched chunk into the running sums."""
+        for name, (labels, sale, cost) in _scaled_sums(df, self.specs, self.weighting).items():
+            totals = self._totals[name]
+            for label, sale_sum, cost_sum in zip(labels.tolist(), sale.tolist(), cost.tolist()):
+                previous = totals.get(label)
+                if previous is not None:
+                    sale_sum += previous[0]
+                    cost_sum += previous[1]
+                totals[label] = (sale_sum, cost_sum)
+        self.rows += len(df)
+
+    def reports(self):
+        """
+        Returns:
+            dict: spec.name -> report DataFrame, same layout as build_reports
+        """
+        reports = {}
+        for spec in self.specs:
+            totals = self._totals[spec.name]
+            labels = sorted(totals)
+            sums = np.array([totals[label] for label in labels], dtype=np.float64).reshape(-1, 2)
+            reports[spec.name] = format_report(
+                spec.key,
+                np.array(labels, dtype=object),
+                sums[:, 0] / VALUE_SCALE,
+                sums[:, 1] / VALUE_SCALE,
+            )
+        return reports
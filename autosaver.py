@@ -1,56 +1,70 @@
 """
 autosaver.py - Reliable Excel Book1 Capture Module
 Based on proven DDE + foreground approach
+
+Only win32gui loads with the module, so scanning for Book1
+starts right away; win32ui + dde and psutil are imported the first time
+a save or a workbook listing needs them.
+
+Saves go through one persistent DDE session (dde_session.py), set up on
+the first capture and reconnected if Excel goes away, rather than a new
+DDE server and conversation per capture.
+
+Window lookups go through a shared ExcelWindowRegistry (window_registry.py)
+instead of a full EnumWindows + GetClassName/GetWindowText pass per call,
+and "is this pid excel.exe?" through the shared ProcessInfoCache
+(process_cache.py) instead of a psutil lookup per window per call.
 """
 
-import time
-import win32ui
 import win32gui
-import win32process
-import psutil
-import dde
 import os
-from datetime import datetime
+from completion import wait_until, wait_for_file_complete
+from xlsx_probe import read_sheet_dimension
+from instrument import span
+from window_registry import ExcelWindowRegistry, book_name
+from capture_queue import CaptureQueue, capture_filename
+from process_cache import get_process_cache
+from dde_session import get_dde_session
+
+FOREGROUND_TIMEOUT = 1.5  # Seconds to wait for the window manager to switch
+SAVE_TIMEOUT = 15.0       # Seconds to wait for Excel to finish SAVE.AS
 
-def list_excel_windows():
+_registry = None
+
+def get_window_registry():
+    """Return the shared ExcelWindowRegistry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = ExcelWindowRegistry()
+    return _registry
+
+def list_excel_windows(max_age=None):
     """Return [(pid, hwnd, title, visible)] for every XLMAIN window."""
-    windows = []
-    def _enum(hwnd, _):
-        if win32gui.GetClassName(hwnd) == "XLMAIN":
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            title = win32gui.GetWindowText(hwnd)
-            vis = win32gui.IsWindowVisible(hwnd)
-            windows.append((pid, hwnd, title, vis))
-    win32gui.EnumWindows(_enum, None)
-    return windows
+    return get_window_registry().excel_windows(max_age)
 
-def find_book1_window_filtered():
+def find_book1_window_filtered(max_age=None):
     """Find Book1 Excel window, excluding captured files."""
-    excel_windows = list_excel_windows()
-    for pid, hwnd, title, vis in excel_windows:
-        if vis and 'book1' in title.lower():
-            if 'captured_' not in title.lower():
-                return pid, hwnd, title
-    return None, None, None
+    return get_window_registry().find_book1(max_age)
+
+def find_unsaved_book_windows(max_age=None):
+    """Find every unsaved BookN Excel window (Book1, Book2, ...), excluding captured files."""
+    return [tuple(window) for window in get_window_registry().find_unsaved_books(max_age)]
 
-def bring_to_foreground(target_hwnd, verbose=True):
+def bring_to_foreground(target_hwnd, verbose=True, name="Book1"):
     """Bring target window to foreground."""
     if verbose:
-        print(f"🎯 Bringing Book1 to foreground...")
+        print(f"🎯 Bringing {name} to foreground...")
     
     try:
         win32gui.ShowWindow(target_hwnd, 9)  # SW_RESTORE
-        time.sleep(0.5)
+        wait_until(lambda: not win32gui.IsIconic(target_hwnd), timeout=FOREGROUND_TIMEOUT)
         win32gui.SetForegroundWindow(target_hwnd)
-        time.sleep(0.5)
         win32gui.BringWindowToTop(target_hwnd)
-        time.sleep(0.5)
         
-        # Verify it worked
-        current_fg = win32gui.GetForegroundWindow()
-        if current_fg == target_hwnd:
+        # Verify it worked (poll rather than sleeping a fixed amount)
+        if wait_until(lambda: win32gui.GetForegroundWindow() == target_hwnd, timeout=FOREGROUND_TIMEOUT):
             if verbose:
-                print(f"   ✅ Book1 brought to foreground")
+                print(f"   ✅ {name} brought to foreground")
             return True
         else:
             if verbose:
@@ -62,21 +76,21 @@ def bring_to_foreground(target_hwnd, verbose=True):
             print(f"   ❌ Error bringing to foreground: {e}")
         return False
 
-def save_book1_dde(target_title, save_folder, filename=None, verbose=True):
-    """Save Book1 using DDE to specified location."""
+def save_book1_dde(target_title, save_folder, filename=None, verbose=True, session=None):
+    """Save Book1 using DDE to specified location (session defaults to the shared DDESession)."""
     
     # Ensure save folder exists
     os.makedirs(save_folder, exist_ok=True)
     
-    # Generate filename if not provided
+    # Generate filename if not provided: unique per save, so an earlier capture
+    # still queued for processing is never removed or overwritten below
     if filename is None:
-        timestamp = datetime.now().strftime("%m-%d-%Y_%H.%M")  # Match your original format
-        filename = f"Captured_{timestamp}.xlsx"
+        filename = capture_filename(book_name(target_title) or "Book1", save_folder)
     
     full_path = os.path.join(save_folder, filename)
     
     if verbose:
-        print(f"💾 Saving Book1 to: {full_path}")
+        print(f"💾 Saving {book_name(target_title) or 'Book1'} to: {full_path}")
     
     # Clean up existing file
     if os.path.exists(full_path):
@@ -87,60 +101,43 @@ def save_book1_dde(target_title, save_folder, filename=None, verbose=True):
         except:
             pass
     
+    if session is None:
+        session = get_dde_session()
+    
     try:
-        # Create DDE server
-        server = dde.CreateServer()
-        server.Create("CaptureClient")
-        
-        # Connect to Excel
-        conversation = dde.CreateConversation(server)
-        conversation.ConnectTo("Excel", "System")
-        
-        if verbose:
-            print(f"   ✅ DDE Connected")
-        
-        # Simple save operation
-        result = conversation.Exec(f'[SAVE.AS("{full_path}")]')
+        # Simple save operation (connects on first use, reconnects if Excel went away)
+        connected = session.execute(f'[SAVE.AS("{full_path}")]')
         if verbose:
+            if connected:
+                print(f"   ✅ DDE Connected")
             print(f"   📤 Save command sent")
         
-        # Wait and check result
-        time.sleep(2)
+        # Wait until Excel has finished writing the workbook
+        complete = wait_for_file_complete(full_path, timeout=SAVE_TIMEOUT)
         if os.path.exists(full_path):
             file_size = os.path.getsize(full_path)
-            if file_size > 0:
+            if complete and file_size > 0:
                 if verbose:
                     print(f"   ✅ File saved successfully!")
                     print(f"   📊 File size: {file_size} bytes")
                     
-                    # Verify it's a valid Excel file
-                    try:
-                        import pandas as pd
-                        df = pd.read_excel(full_path)
-                        print(f"   📋 Content: {len(df)} rows, {len(df.columns)} columns")
-                    except Exception as e:
-                        print(f"   ⚠️ Verification failed: {e}")
+                    # Verify it's a valid Excel file (reads only the sheet's
+                    # dimension record; the transform step does the real parse)
+                    dimension = read_sheet_dimension(full_path)
+                    if dimension:
+                        rows, columns = dimension
+                        print(f"   📋 Content: {rows - 1} rows, {columns} columns")
+                    else:
+                        print(f"   ⚠️ Verification failed: no sheet dimension found")
                 
-                # Close DDE
-                try:
-                    conversation.Close()
-                except:
-                    pass
-                server.Shutdown()
                 return full_path
             else:
                 if verbose:
-                    print(f"   ❌ File created but empty")
+                    print(f"   ❌ File created but incomplete after {SAVE_TIMEOUT:.0f}s ({file_size} bytes)")
         else:
             if verbose:
                 print(f"   ❌ File not created")
         
-        # Close DDE
-        try:
-            conversation.Close()
-        except:
-            pass
-        server.Shutdown()
         return None
         
     except Exception as e:
@@ -164,8 +161,9 @@ def capture_book1(save_folder, filename=None, verbose=True):
     if verbose:
         print("🔍 Looking for Book1 workbook...")
     
-    # Find target Book1
-    target_result = find_book1_window_filtered()
+    # Find target Book1 (always a fresh look: titles change after each capture)
+    with span("detect"):
+        target_result = find_book1_window_filtered(max_age=0)
     if not target_result[0]:
         if verbose:
             print("❌ No Book1 found (excluding captured files)")
@@ -177,13 +175,17 @@ def capture_book1(save_folder, filename=None, verbose=True):
         print(f"🎯 Found Book1: {target_title}")
     
     # Bring to foreground
-    success = bring_to_foreground(target_hwnd, verbose)
+    with span("foreground"):
+        success = bring_to_foreground(target_hwnd, verbose)
     if not success and verbose:
         print("⚠️ Warning: Foreground operation failed, abortion...")
         return
     
     # Save using DDE
-    saved_file = save_book1_dde(target_title, save_folder, filename, verbose)
+    with span("dde_save"):
+        saved_file = save_book1_dde(target_title, save_folder, filename, verbose)
+    # The saved window is retitled; don't let a cached "Book1" trigger another capture
+    get_window_registry().invalidate()
     
     if saved_file and verbose:
         print(f"✅ Book1 captured successfully!")
@@ -193,6 +195,62 @@ def capture_book1(save_folder, filename=None, verbose=True):
     
     return saved_file
 
+def capture_book_window(job, save_folder, filename=None, verbose=True):
+    """
+    Capture one queued Book window (the capture_one step of a CaptureQueue).
+    
+    Args:
+        job (WindowCapture): Window to capture
+        save_folder (str): Directory to save the captured file
+        filename (str, optional): Custom filename. If None, auto-generates with timestamp
+        verbose (bool): Whether to print status messages
+    
+    Returns:
+        str: Path to saved file on success, None on failure
+    """
+    if verbose:
+        print(f"🎯 Capturing {job.name}: {job.title}")
+    
+    with span("foreground"):
+        success = bring_to_foreground(job.hwnd, verbose, job.name)
+    if not success:
+        # SAVE.AS saves whichever workbook is active - never risk saving the wrong one
+        if verbose:
+            print(f"⚠️ Could not activate {job.name}, skipping it this sweep")
+        return None
+    
+    with span("dde_save"):
+        saved_file = save_book1_dde(job.title, save_folder, filename, verbose)
+    get_window_registry().invalidate()
+    return saved_file
+
+def capture_all_books(save_folder, on_captured=None, verbose=True, queue=None):
+    """
+    Capture every unsaved Book window (Book1, Book2, ...) in one sweep.
+    
+    Args:
+        save_folder (str): Directory to save the captured files
+        on_captured (callable, optional): Called with each saved path as soon as it lands
+        verbose (bool): Whether to print status messages
+        queue (CaptureQueue, optional): Queue to record per-window state in
+    
+    Returns:
+        list: WindowCapture jobs in capture order (empty if no Book window was found)
+    """
+    if verbose:
+        print("🔍 Looking for unsaved workbooks...")
+    
+    with span("detect"):
+        windows = find_unsaved_book_windows(max_age=0)
+    if not windows:
+        if verbose:
+            print("❌ No unsaved workbooks found (excluding captured files)")
+        return []
+    
+    if queue is None:
+        queue = CaptureQueue(capture_book_window)
+    return queue.sweep(windows, save_folder, on_captured, verbose)
+
 def is_book1_available():
     """
     Check if Book1 workbook is available for capture.
@@ -203,6 +261,15 @@ def is_book1_available():
     target_result = find_book1_window_filtered()
     return target_result[0] is not None
 
+def is_any_book_available():
+    """
+    Check if any unsaved BookN workbook is available for capture.
+    
+    Returns:
+        bool: True if at least one is available, False otherwise
+    """
+    return bool(find_unsaved_book_windows())
+
 def get_available_workbooks():
     """
     Get list of available unsaved workbook names.
@@ -210,22 +277,19 @@ def get_available_workbooks():
     Returns:
         list: List of workbook titles available for capture
     """
+    processes = get_process_cache()
     excel_windows = list_excel_windows()
+    processes.forget(pid for pid, hwnd, title, vis in excel_windows)
     workbooks = []
     
     for pid, hwnd, title, vis in excel_windows:
-        if vis:
-            try:
-                exe = psutil.Process(pid).name()
-                if exe.lower() == "excel.exe":
-                    # Extract workbook name from title
-                    if " - Excel" in title:
-                        workbook_name = title.replace(" - Excel", "").strip()
-                        # Only include unsaved workbooks (Book1, Book2, etc.)
-                        if workbook_name.lower().startswith('book') and not workbook_name.lower().startswith('captured_'):
-                            workbooks.append(workbook_name)
-            except:
-                continue
+        if vis and processes.is_excel(pid):
+            # Extract workbook name from title
+            if " - Excel" in title:
+                workbook_name = title.replace(" - Excel", "").strip()
+                # Only include unsaved workbooks (Book1, Book2, etc.)
+                if workbook_name.lower().startswith('book') and not workbook_name.lower().startswith('captured_'):
+                    workbooks.append(workbook_name)
     
     return workbooks
 
@@ -235,17 +299,14 @@ def test_capture():
     print("Excel Book1 Auto-Saver Test")
     print("=" * 30)
     
+    processes = get_process_cache()
+
     # Show current Excel windows
     print("Current Excel windows:")
     excel_windows = list_excel_windows()
     for pid, hwnd, title, vis in excel_windows:
-        if vis:
-            try:
-                exe = psutil.Process(pid).name()
-                if exe.lower() == "excel.exe":
-                    print(f"  PID {pid:>5}: {title}")
-            except:
-                continue
+        if vis and processes.is_excel(pid):
+            print(f"  PID {pid:>5}: {title}")
     
     print("\n" + "─" * 30)
     
@@ -259,6 +320,7 @@ def test_capture():
     else:
         print(f"\n❌ Failed to save Book1")
     
+    print(f"🧮 Process cache: {processes.stats['hits']} hits, {processes.stats['misses']} misses")
     print("\n✅ Test completed")
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+"""
+batch.py - Batch / Backfill Processing
+Re-runs the report transform over a whole directory (or glob) of captured
+exports across a process pool. Files whose reports are already newer than
+both the export and brand_map.csv, and were written with the same report
+settings (writer, mode, weighting), are skipped. Nothing is opened in Excel.
+
+Usage:
+    python batch.py "C:\\Users\\sasuk\\Documents\\CapturedExports"
+    python batch.py "CapturedExports\\Captured_06-*.xlsx" --workers 4 --force
+    python batch.py CapturedExports --output backfill --store backfill\\rolling_totals.sqlite
+
+The rolling aggregate store is only written when --store is given, so a
+backfill never touches the live store by accident.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import main
+from brand_cache import get_brand_map_cache
+
+EXPORT_EXTENSIONS = (".xlsx", ".csv")
+
+# Settings that change what a report contains; recorded per report in
+# SETTINGS_STAMP in the output folder so a rerun with different ones isn't skipped
+REPORT_SETTINGS = ["REPORT_WRITER", "OUTPUT_MODE", "PROFIT_WEIGHTING"]
+SETTINGS_STAMP = "batch_settings.json"
+
+
+def find_exports(source):
+    """Expand a directory or glob pattern into a sorted list of export files."""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source)
+    return sorted(
+        path for path in paths
+        if os.path.isfile(path)
+        and path.lower().endswith(EXPORT_EXTENSIONS)
+        and not os.path.basename(path).startswith(("~$", "processed_"))
+    )
+
+
+def report_settings():
+    """The current REPORT_SETTINGS values from main."""
+    return {name: getattr(main, name) for name in REPORT_SETTINGS}
+
+
+def load_stamps(processed_folder):
+    """Return {report file name: settings it was written with} for processed_folder."""
+    try:
+        with open(os.path.join(processed_folder, SETTINGS_STAMP)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_stamps(processed_folder, stamps):
+    os.makedirs(processed_folder, exist_ok=True)
+    path = os.path.join(processed_folder, SETTINGS_STAMP)
+    with open(path + ".tmp", "w") as f:
+        json.dump(stamps, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def is_up_to_date(filepath, processed_folder, stamps=None):
+    """
+    True if every report for filepath exists, is newer than its inputs and
+    was written by a batch run with the current report settings.
+
+    Reports with no recorded settings (e.g. written by the capture loop)
+    count as out of date.
+    """
+    if stamps is None:
+        stamps = load_stamps(processed_folder)
+    settings = report_settings()
+    newest_input = max(os.path.getmtime(filepath), os.path.getmtime(get_brand_map_cache().path))
+    for report in main.planned_report_paths(filepath, processed_folder):
+        if not os.path.exists(report) or os.path.getmtime(report) < newest_input:
+            return False
+        if stamps.get(os.path.basename(report)) != settings:
+            return False
+    return True
+
+
+def _init_worker(settings):
+    # Runs once per worker: apply CLI overrides and load the brand map once
+    for name, value in settings.items():
+        setattr(main, name, value)
+    get_brand_map_cache().get()
+
+
+def _process_one(filepath, processed_folder):
+    start = time.perf_counter()
+    try:
+        _, rows = main.process_export(filepath, processed_folder, verbose=False)
+        return filepath, rows, time.perf_counter() - start, None
+    except Exception as e:
+        return filepath, 0, time.perf_counter() - start, str(e)
+
+
+def run_batch(source, processed_folder, workers=None, force=False, settings=None):
+    """
+    Process every export matched by source.
+
+    Args:
+        source (str): Directory or glob of captured exports
+        processed_folder (str): Where processed reports are written
+        workers (int, optional): Process count (defaults to CPU count)
+        force (bool): Re-process files even if their reports are up to date
+            (see is_up_to_date)
+        settings (dict, optional): main.py settings to override in workers
+
+    Returns:
+        dict: Counts of processed/skipped/failed files and total rows
+    """
+    settings = settings or {}
+    for name, value in settings.items():
+        setattr(main, name, value)
+
+    exports = find_exports(source)
+    stamps = load_stamps(processed_folder)
+    todo = exports if force else [p for p in exports if not is_up_to_date(p, processed_folder, stamps)]
+    skipped = len(exports) - len(todo)
+
+    print(f"📂 {len(exports)} exports found, {skipped} up to date, {len(todo)} to process")
+    summary = {"processed": 0, "skipped": skipped, "failed": 0, "rows": 0}
+    if not todo:
+        return summary
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,)) as pool:
+        futures = [pool.submit(_process_one, path, processed_folder) for path in todo]
+        for future in as_completed(futures):
+            filepath, rows, elapsed, error = future.result()
+            if error:
+                summary["failed"] += 1
+                print(f"   ❌ {os.path.basename(filepath)}: {error}")
+            else:
+                summary["processed"] += 1
+                summary["rows"] += rows
+                for report in main.planned_report_paths(filepath, processed_folder):
+                    stamps[os.path.basename(report)] = report_settings()
+                print(f"   ✅ {os.path.basename(filepath)}: {rows:,} rows in {elapsed:.2f}s")
+    save_stamps(processed_folder, stamps)
+    wall = time.perf_counter() - start
+
+    print(f"\n📊 {summary['processed']} processed, {summary['failed']} failed, {skipped} skipped in {wall:.2f}s")
+    print(f"   ⚡ {summary['processed'] / wall:.2f} files/s, {summary['rows'] / wall:,.0f} rows/s")
+    return summary
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run report processing over captured exports.")
+    parser.add_argument("source", help="directory or glob of captured exports")
+    parser.add_argument("--output", default=main.PROCESSED_FOLDER, help="processed report folder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-process files even if their reports are newer than the export and "
+                             "brand_map.csv and were written with the same --writer/--mode/--weighting")
+    parser.add_argument("--writer", default=main.REPORT_WRITER, help="report writer backend")
+    parser.add_argument("--mode", default=main.OUTPUT_MODE, choices=["workbook", "separate"])
+    parser.add_argument("--weighting", default=main.PROFIT_WEIGHTING, choices=["unit", "quantity"],
+                        help="per-line prices or price x net quantity")
+    parser.add_argument("--store", default=None,
+                        help="rolling aggregate store to update (default: none)")
+    args = parser.parse_args(argv)
+
+    # Backfills re-read files on purpose, so never drop lines as "already seen"
+    settings = {
+        "REPORT_WRITER": args.writer,
+        "OUTPUT_MODE": args.mode,
+        "PROFIT_WEIGHTING": args.weighting,
+        "DEDUPE_INDEX_PATH": None,
+        "AGGREGATE_STORE_PATH": args.store,
+    }
+    summary = run_batch(args.source, args.output, args.workers, args.force, settings)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,121 @@
+"""
+bench_capture_pipeline.py - Inline vs Background Capture Processing
+Feeds bursts of synthetic exports through a BurstCaptureBackend and runs
+the capture loop two ways: transforming each capture inline (the old
+loop) and handing captures to a ProcessingPipeline. Reports total time,
+how long exports waited to be captured, the deepest queue seen, and
+checks that completions were logged in capture order.
+
+Usage:
+    python benchmarks/bench_capture_pipeline.py
+    python benchmarks/bench_capture_pipeline.py --rows 200000 --bursts 3 --burst-size 8 --workers 2 --queue 2
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from synth import write_export
+import main
+from brand_cache import get_brand_map_cache
+from fakes import BurstCaptureBackend
+from pipeline import ProcessingPipeline
+from window_watcher import PollingWatcher
+
+
+def run_loop(backend, save_folder, processed_folder, pipeline=None):
+    """Drive a capture loop until the backend is exhausted; returns (wall s, completion order)."""
+    watcher = PollingWatcher(backend.detect, min_interval=0.01, max_interval=0.05)
+    completed = []
+    start = time.perf_counter()
+    while not backend.exhausted:
+        if not watcher.wait(timeout=1.0):
+            continue
+        saved_file = backend.capture(save_folder, verbose=False)
+        if not saved_file:
+            continue
+        if pipeline is not None:
+            pipeline.submit(saved_file)
+        else:
+            main.process_export(saved_file, processed_folder, verbose=False)
+            completed.append(saved_file)
+    if pipeline is not None:
+        pipeline.join()
+    watcher.close()
+    return time.perf_counter() - start, completed
+
+
+def capture_lag(backend, capture_times):
+    lags = [captured - ready for ready, captured in zip(backend.ready_times, capture_times)]
+    return max(lags), sum(lags) / len(lags)
+
+
+def timed_capture(backend):
+    """Wrap backend.capture to record when each capture happened."""
+    times = []
+    capture = backend.capture
+
+    def wrapper(*args, **kwargs):
+        path = capture(*args, **kwargs)
+        if path:
+            times.append(time.perf_counter())
+        return path
+
+    backend.capture = wrapper
+    return times
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="rows per synthetic export")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="xlsx")
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--burst-size", type=int, default=4)
+    parser.add_argument("--burst-gap", type=float, default=3.0, help="seconds between bursts")
+    parser.add_argument("--workers", type=int, default=main.PROCESS_WORKERS)
+    parser.add_argument("--queue", type=int, default=main.PROCESS_QUEUE_SIZE, help="max exports waiting for a worker")
+    args = parser.parse_args()
+
+    main.AGGREGATE_STORE_PATH = None
+    main.DEDUPE_INDEX_PATH = None
+    main.PARQUET_ARCHIVE_PATH = None
+    get_brand_map_cache().get()
+
+    with tempfile.TemporaryDirectory() as folder:
+        template = write_export(args.rows, os.path.join(folder, f"template.{args.format}"))
+        print(f"{args.bursts} bursts x {args.burst_size} exports of {args.rows:,} rows ({args.format})\n")
+        print(f"{'mode':<10} {'wall s':>8} {'max lag s':>10} {'mean lag s':>11} {'max queue':>10} {'in order':>9}")
+
+        for mode in ("inline", "pipeline"):
+            backend = BurstCaptureBackend(template, args.bursts, args.burst_size, args.burst_gap)
+            capture_times = timed_capture(backend)
+            save_folder = os.path.join(folder, mode, "captured")
+            processed_folder = os.path.join(folder, mode, "processed")
+            os.makedirs(processed_folder)
+
+            pipeline = None
+            completed = []
+            if mode == "pipeline":
+                pipeline = ProcessingPipeline(
+                    lambda path: main.process_export(path, processed_folder, verbose=False),
+                    args.workers, args.queue,
+                    on_complete=lambda result: completed.append(result.path),
+                )
+            wall, inline_completed = run_loop(backend, save_folder, processed_folder, pipeline)
+            completed = completed or inline_completed
+            max_depth = pipeline.max_depth if pipeline else 0
+            if pipeline is not None:
+                pipeline.close()
+
+            captured = sorted(completed)
+            max_lag, mean_lag = capture_lag(backend, capture_times)
+            print(f"{mode:<10} {wall:>8.2f} {max_lag:>10.2f} {mean_lag:>11.2f} {max_depth:>10} {str(completed == captured):>9}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,78 @@
+"""
+bench_categorical.py - Object vs Categorical String Columns
+Compares memory (deep memory_usage) and aggregation time of the enriched
+capture with its repetitive string columns held as Python objects versus
+pandas Categoricals, on a synthetic export.
+
+Usage:
+    python benchmarks/bench_categorical.py
+    python benchmarks/bench_categorical.py --rows 5000000 --repeat 5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from synth import generate_export
+from brand_cache import BrandMapCache
+from export_reader import CATEGORICAL_COLUMNS, normalize_categoricals
+from aggregation import add_brand_category, build_reports
+
+STRING_KEYS = CATEGORICAL_COLUMNS + ["Brand", "CATEGORY", "Brand : Category"]
+
+
+def as_objects(df):
+    """Copy of df with every categorical key column turned back into object strings."""
+    df = df.copy()
+    for column in STRING_KEYS:
+        if column in df.columns:
+            df[column] = df[column].astype(object)
+    return df
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cache = BrandMapCache()
+    categorical = add_brand_category(cache.enrich(normalize_categoricals(generate_export(args.rows))))
+    objects = as_objects(categorical)
+
+    columns = [c for c in STRING_KEYS if c in categorical.columns]
+    print(f"{args.rows:,} rows\n")
+    print(f"{'column':<18} {'object MB':>10} {'category MB':>12} {'saved':>7}")
+    for column in columns:
+        obj_mb = objects[column].memory_usage(deep=True, index=False) / 1e6
+        cat_mb = categorical[column].memory_usage(deep=True, index=False) / 1e6
+        print(f"{column:<18} {obj_mb:>10.1f} {cat_mb:>12.1f} {1 - cat_mb / obj_mb:>7.0%}")
+    obj_total = objects.memory_usage(deep=True).sum() / 1e6
+    cat_total = categorical.memory_usage(deep=True).sum() / 1e6
+    print(f"{'whole frame':<18} {obj_total:>10.1f} {cat_total:>12.1f} {1 - cat_total / obj_total:>7.0%}")
+
+    print(f"\n{'stage':<18} {'object s':>10} {'category s':>12} {'speedup':>8}")
+    for stage, fn in [
+        ("brand : category", lambda df: add_brand_category(df.drop(columns=["Brand : Category"]))),
+        ("build_reports", build_reports),
+    ]:
+        obj_s = best_of(lambda: fn(objects), args.repeat)
+        cat_s = best_of(lambda: fn(categorical), args.repeat)
+        print(f"{stage:<18} {obj_s:>10.3f} {cat_s:>12.3f} {obj_s / cat_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
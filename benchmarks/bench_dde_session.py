@@ -0,0 +1,96 @@
+"""
+bench_dde_session.py - Per-Capture DDE Setup vs Persistent Session
+Runs a series of SAVE.AS captures against a FakeDDETransport two ways:
+the old per-capture pattern (create server, connect, Exec, close, shut
+down, with no cleanup when Exec raises) and one DDESession. Part way
+through Excel "crashes" and refuses connections for a few captures, then
+comes back.
+
+Reports DDE overhead per capture, servers created, servers leaked and
+how many captures saved their file.
+
+Usage:
+    python benchmarks/bench_dde_session.py
+    python benchmarks/bench_dde_session.py --captures 200 --server-ms 20 --connect-ms 30
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from dde_session import DDESession, FakeDDETransport
+
+
+def per_capture_save(transport, command):
+    """What save_book1_dde used to do on every capture."""
+    server = transport.create_server("CaptureClient")
+    conversation = transport.connect(server, "Excel", "System")  # raising here leaks the server
+    transport.execute(conversation, command)                      # ...and so does raising here
+    try:
+        transport.disconnect(conversation)
+    except Exception:
+        pass
+    transport.shutdown(server)
+
+
+def run(strategy, transport, folder, captures, outage):
+    """Save `captures` files; Excel is down for captures in the outage range. Returns (saved, seconds)."""
+    session = DDESession(transport, health_interval=0.5) if strategy == "session" else None
+    saved = 0
+    spent = 0.0
+    for i in range(captures):
+        if i == outage.start:
+            transport.crash()
+            transport.refuse_connects = True
+        elif i == outage.stop:
+            transport.refuse_connects = False
+        path = os.path.join(folder, f"{strategy}_{i:04d}.xlsx")
+        command = f'[SAVE.AS("{path}")]'
+        start = time.perf_counter()
+        try:
+            if session is not None:
+                session.execute(command)
+            else:
+                per_capture_save(transport, command)
+        except Exception:
+            pass
+        spent += time.perf_counter() - start
+        saved += os.path.exists(path)
+    if session is not None:
+        session.close()
+    return saved, spent, session
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--captures", type=int, default=100)
+    parser.add_argument("--server-ms", type=float, default=20.0, help="simulated CreateServer + Create cost")
+    parser.add_argument("--connect-ms", type=float, default=30.0, help="simulated ConnectTo cost")
+    args = parser.parse_args()
+
+    outage = range(args.captures // 2, args.captures // 2 + 3)
+    print(f"{args.captures} captures, Excel unavailable for captures {outage.start}-{outage.stop - 1}\n")
+    print(f"{'strategy':<12} {'ms/capture':>11} {'servers':>8} {'leaked':>7} {'saved':>9}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        template = os.path.join(folder, "template.xlsx")
+        with open(template, "wb") as f:
+            f.write(b"PK" + b"\0" * 1022)
+
+        for strategy in ("per-capture", "session"):
+            transport = FakeDDETransport(template, args.server_ms / 1000, args.connect_ms / 1000)
+            saved, spent, session = run(strategy, transport, folder, args.captures, outage)
+            print(f"{strategy:<12} {spent / args.captures * 1000:>11.2f} {transport.calls['create_server']:>8} "
+                  f"{transport.live_servers:>7} {saved:>5}/{args.captures:<3}")
+
+    print(f"\nSession: {session.stats['connects']} connects ({session.stats['reconnects']} reconnects), "
+          f"{session.stats['health_checks']} health checks, {session.stats['failures']} failed attempts")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,104 @@
+"""
+bench_multi_capture.py - Book1-Only vs Multi-Window Capture
+Opens N unsaved BookN windows at once on a FakeExcelBackend desktop (each
+"save" takes --save-seconds, like foreground + DDE SAVE.AS) and runs the
+capture loop three ways:
+
+    book1     - the old rule: only a window titled Book1 is ever captured
+    sweep     - every BookN captured in one sweep, transformed inline after
+    pipeline  - every BookN captured in one sweep, each handed to a
+                ProcessingPipeline as soon as it is saved
+
+For each N it reports how many exports were captured, when the last one
+was saved, and the time from the windows opening until every captured
+export was transformed.
+
+Usage:
+    python benchmarks/bench_multi_capture.py
+    python benchmarks/bench_multi_capture.py --rows 100000 --windows 1 2 4 8 --workers 4
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from synth import write_export
+import main
+from brand_cache import get_brand_map_cache
+from fakes import FakeExcelBackend
+from pipeline import ProcessingPipeline
+from window_watcher import PollingWatcher
+
+
+def run_loop(backend, save_folder, processed_folder, mode, workers, idle_timeout):
+    """
+    Open-to-processed loop; stops once nothing is detected for idle_timeout s.
+    Returns (exports captured, seconds until the last was saved, seconds until all were transformed).
+    """
+    process = lambda path: main.process_export(path, processed_folder, verbose=False)
+    pipeline = ProcessingPipeline(process, workers, max_queued=8) if mode == "pipeline" else None
+    watcher = PollingWatcher(backend.detect, min_interval=0.01, max_interval=0.05)
+    captured = []
+    start = time.perf_counter()
+    saved_at = done_at = start
+    while watcher.wait(timeout=idle_timeout):
+        if mode == "book1":
+            path = backend.capture(save_folder, verbose=False)
+            paths = [path] if path else []
+        else:
+            paths = backend.capture_all(save_folder, pipeline.submit if pipeline else None, verbose=False)
+        if paths:
+            saved_at = time.perf_counter()
+        if pipeline is None:
+            for path in paths:
+                process(path)
+        captured.extend(paths)
+        done_at = time.perf_counter()
+    if pipeline is not None:
+        pipeline.join()
+        done_at = time.perf_counter()
+        pipeline.close()
+    watcher.close()
+    return len(captured), saved_at - start, done_at - start
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000, help="rows per synthetic export")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="xlsx")
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 2, 4, 8], help="exports open at once")
+    parser.add_argument("--save-seconds", type=float, default=0.3, help="simulated foreground + SAVE.AS time")
+    parser.add_argument("--workers", type=int, default=main.PROCESS_WORKERS)
+    args = parser.parse_args()
+
+    main.AGGREGATE_STORE_PATH = None
+    main.DEDUPE_INDEX_PATH = None
+    main.PARQUET_ARCHIVE_PATH = None
+    get_brand_map_cache().get()
+
+    with tempfile.TemporaryDirectory() as folder:
+        template = write_export(args.rows, os.path.join(folder, f"template.{args.format}"))
+        print(f"{args.rows:,}-row exports ({args.format}), {args.save_seconds}s per save, {args.workers} workers\n")
+        print(f"{'windows':>7} {'mode':<9} {'captured':>9} {'saved s':>8} {'done s':>7} {'exports/s':>10}")
+
+        for count in args.windows:
+            for mode in ("book1", "sweep", "pipeline"):
+                backend = FakeExcelBackend(template, all_books=mode != "book1", save_seconds=args.save_seconds)
+                for _ in range(count):
+                    backend.open_export()
+                run_folder = os.path.join(folder, f"{count}-{mode}")
+                processed_folder = os.path.join(run_folder, "processed")
+                os.makedirs(processed_folder)
+                captured, saved, seconds = run_loop(backend, os.path.join(run_folder, "captured"),
+                                                 processed_folder, mode, args.workers, idle_timeout=0.2)
+                print(f"{count:>7} {mode:<9} {captured:>5}/{count:<3} {saved:>8.2f} {seconds:>7.2f} "
+                      f"{captured / seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
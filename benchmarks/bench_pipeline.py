@@ -0,0 +1,152 @@
+"""
+bench_pipeline.py - Transform Pipeline Benchmark Suite
+Times each stage of the report transform (read, merge, aggregate, write)
+on synthetic exports of several sizes and tracks each stage's peak memory.
+Results are appended to benchmarks/results.jsonl tagged with the current
+git commit, and compared with the most recent run from a different commit
+so regressions show up.
+
+Usage:
+    python benchmarks/bench_pipeline.py                       # 1k, 100k, 1M rows
+    python benchmarks/bench_pipeline.py --sizes 1000 10000000 --no-save
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import pandas as pd
+
+from synth import generate_export
+from brand_cache import BrandMapCache
+from export_reader import REPORT_COLUMNS, read_export
+from aggregation import add_brand_category, build_reports
+from report_writer import get_writer
+
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.jsonl")
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+XLSX_MAX_ROWS = 1_048_575  # Excel's sheet limit, minus the header
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(fn):
+    """Run fn twice: once for wall time, once under tracemalloc for peak MB."""
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+
+def run_size(n_rows, export_format, folder):
+    """Benchmark every stage on one synthetic export; returns result dicts."""
+    df = generate_export(n_rows)
+    path = os.path.join(folder, f"export_{n_rows}.{export_format}")
+    if export_format == "csv":
+        df.to_csv(path, index=False)
+    else:
+        get_writer("xlsx").write(df, path)
+    del df
+
+    cache = BrandMapCache()
+    cache.get()
+    writer = get_writer("xlsx")
+    out_path = os.path.join(folder, f"processed_{n_rows}.xlsx")
+
+    captured, read_s, read_mb = measure(lambda: read_export(path, usecols=REPORT_COLUMNS))
+    enriched, merge_s, merge_mb = measure(lambda: add_brand_category(cache.enrich(captured)))
+    reports, agg_s, agg_mb = measure(lambda: build_reports(enriched))
+    sheets = {"By Account": reports["id"], "By Brand": reports["br"], "By Brand-Category": reports["brcat"]}
+    _, write_s, write_mb = measure(lambda: writer.write_book(sheets, out_path))
+
+    return [
+        {"stage": "read", "seconds": read_s, "peak_mb": read_mb},
+        {"stage": "merge", "seconds": merge_s, "peak_mb": merge_mb},
+        {"stage": "aggregate", "seconds": agg_s, "peak_mb": agg_mb},
+        {"stage": "write", "seconds": write_s, "peak_mb": write_mb},
+    ]
+
+
+def load_results():
+    if not os.path.exists(RESULTS_PATH):
+        return []
+    with open(RESULTS_PATH) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_run(results, commit):
+    """Latest result per (rows, stage) from the most recent other commit."""
+    others = [r for r in results if r["commit"] != commit]
+    if not others:
+        return None, {}
+    last_commit = others[-1]["commit"]
+    return last_commit, {(r["rows"], r["stage"]): r for r in others if r["commit"] == last_commit}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv",
+                        help="export format to read (xlsx caps at 1,048,575 rows)")
+    parser.add_argument("--no-save", action="store_true", help="don't append to results.jsonl")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    base_commit, baseline = previous_run(load_results(), commit)
+    meta = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.node(),
+        "format": args.format,
+    }
+
+    print(f"commit {commit}" + (f" (vs {base_commit})" if base_commit else ""))
+    print(f"{'rows':>10} {'stage':<10} {'seconds':>9} {'peak MB':>9} {'vs prev':>9}")
+    new_results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for n_rows in args.sizes:
+            export_format = args.format
+            if export_format == "xlsx" and n_rows > XLSX_MAX_ROWS:
+                print(f"{n_rows:>10} (too large for xlsx, using csv)")
+                export_format = "csv"
+            for result in run_size(n_rows, export_format, folder):
+                result = dict(meta, rows=n_rows, format=export_format, **result)
+                new_results.append(result)
+                prev = baseline.get((n_rows, result["stage"]))
+                delta = f"{(result['seconds'] / prev['seconds'] - 1) * 100:+.0f}%" if prev and prev["seconds"] else ""
+                print(f"{n_rows:>10} {result['stage']:<10} {result['seconds']:>9.3f} {result['peak_mb']:>9.1f} {delta:>9}")
+
+    if not args.no_save:
+        with open(RESULTS_PATH, "a") as f:
+            for result in new_results:
+                f.write(json.dumps(result) + "\n")
+        print(f"\nSaved {len(new_results)} results to {os.path.relpath(RESULTS_PATH, REPO_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
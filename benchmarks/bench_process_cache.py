@@ -0,0 +1,108 @@
+"""
+bench_process_cache.py - psutil Lookups vs ProcessInfoCache
+Starts a few real child processes to stand in for Excel instances, puts
+several windows for each on a FakeWin32 desktop, and lists the workbooks
+over and over the way get_available_workbooks does: once calling
+psutil.Process(pid).name() per window, once through ProcessInfoCache.
+
+Halfway through one child exits, to check the cache evicts it instead
+of reporting a dead process.
+
+Usage:
+    python benchmarks/bench_process_cache.py
+    python benchmarks/bench_process_cache.py --processes 4 --windows-per-process 5 --checks 5000
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import psutil
+
+from process_cache import ProcessInfoCache
+from window_registry import EXCEL_WINDOW_CLASS, ExcelWindowRegistry, FakeWin32
+
+
+def uncached_names(windows):
+    """The pre-cache lookup: one psutil.Process(pid).name() per visible window."""
+    names = []
+    for pid, hwnd, title, vis in windows:
+        if vis:
+            try:
+                names.append(psutil.Process(pid).name())
+            except psutil.Error:
+                continue
+    return names
+
+
+def cached_names(windows, cache):
+    cache.forget(pid for pid, hwnd, title, vis in windows)
+    return [name for name in (cache.name(pid) for pid, hwnd, title, vis in windows if vis) if name]
+
+
+def run(lookup, api, registry, children, checks):
+    """List names `checks` times, ending one child halfway; returns (seconds, names per check)."""
+    victim = children[0]
+    answers = []
+    spent = 0.0
+    for check in range(checks):
+        if check == checks // 2:
+            victim.terminate()
+            victim.wait()
+            for hwnd, (_, _, pid, _) in list(api.windows.items()):
+                if pid == victim.pid:
+                    api.close_window(hwnd)
+        windows = registry.excel_windows()
+        start = time.perf_counter()
+        answers.append(len(lookup(windows)))
+        spent += time.perf_counter() - start
+    return spent, answers
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=3, help="child processes standing in for Excel")
+    parser.add_argument("--windows-per-process", type=int, default=3)
+    parser.add_argument("--checks", type=int, default=2_000, help="workbook listings per strategy")
+    args = parser.parse_args()
+
+    print(f"{args.processes} processes x {args.windows_per_process} windows, {args.checks:,} listings\n")
+    print(f"{'strategy':<10} {'us/listing':>11} {'psutil lookups':>15} {'hit rate':>9}")
+
+    results = {}
+    for name in ("psutil", "cache"):
+        children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+                    for _ in range(args.processes)]
+        try:
+            api = FakeWin32()
+            for child in children:
+                for i in range(args.windows_per_process):
+                    api.open_window(EXCEL_WINDOW_CLASS, f"Book{i + 1} - Excel", pid=child.pid)
+            registry = ExcelWindowRegistry(api, max_age=0)
+
+            if name == "cache":
+                cache = ProcessInfoCache()
+                spent, answers = run(lambda windows: cached_names(windows, cache), api, registry, children, args.checks)
+                lookups, hit_rate = cache.stats["misses"], f"{cache.hit_rate():.1%}"
+                evicted = cache.stats["evictions"]
+            else:
+                spent, answers = run(uncached_names, api, registry, children, args.checks)
+                lookups, hit_rate = sum(answers), "-"  # one name() per window listed
+        finally:
+            for child in children:
+                child.kill()
+                child.wait()
+        results[name] = answers
+        print(f"{name:<10} {spent / args.checks * 1e6:>11.1f} {lookups:>15,} {hit_rate:>9}")
+
+    print(f"\nExited process evicted: {evicted > 0}")
+    print(f"Answers identical: {results['psutil'] == results['cache']}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,89 @@
+"""
+bench_reader.py - Captured Export Reader Benchmark
+Parses a synthetic export (default 500k rows) with each reader
+configuration and reports parse time and peak RSS. Every configuration
+runs in its own subprocess so peak memory isn't shared between them.
+
+Usage: python benchmarks/bench_reader.py [--rows 500000] [--keep DIR]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+# name -> (columns, engine); "all" reads every column, "report" only REPORT_COLUMNS
+CONFIGS = {
+    "full/openpyxl": ("all", "openpyxl"),
+    "projected/openpyxl": ("report", "openpyxl"),
+    "projected/calamine": ("report", "calamine"),
+    "full/calamine": ("all", "calamine"),
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak / 1024 if sys.platform != "darwin" else peak / 1e6
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1e6
+
+
+def run_one(path, usecols, engine):
+    """Child process: parse once and print a JSON result line."""
+    from export_reader import REPORT_COLUMNS, read_export
+
+    if engine == "calamine":
+        from export_reader import _calamine_available
+        if not _calamine_available():
+            print(json.dumps({"skipped": "python-calamine not installed"}))
+            return
+
+    start = time.perf_counter()
+    df = read_export(path, usecols=None if usecols == "all" else REPORT_COLUMNS, engine=engine)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "rows": len(df), "peak_rss_mb": _peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--keep", help="directory to keep the generated export in")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_one(*args.child)
+        return
+
+    from synth import write_export
+
+    folder = args.keep or tempfile.mkdtemp()
+    path = os.path.join(folder, f"synthetic_{args.rows}.xlsx")
+    print(f"Preparing {args.rows:,}-row export at {path}...")
+    write_export(args.rows, path)
+
+    print(f"{'config':<20} {'seconds':>10} {'peak RSS MB':>12}")
+    for name, (usecols, engine) in CONFIGS.items():
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", path, usecols, engine],
+            capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if "skipped" in result:
+            print(f"{name:<20} {'skipped':>10}  ({result['skipped']})")
+        else:
+            print(f"{name:<20} {result['seconds']:>10.2f} {result['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
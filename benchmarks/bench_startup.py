@@ -0,0 +1,137 @@
+"""
+bench_startup.py - Startup Time Budget
+Measures what launching the automation loop costs before it is useful:
+
+    import time      - `python -X importtime`: cumulative import time of
+                       main and of each module the preload defers
+    first scan       - seconds from process launch to the first Book1 check
+    first report     - seconds from process launch until the reports are
+                       opened for an export that appears --delay seconds
+                       after launch
+
+Each is measured for the lazy startup (pandas imported by the background
+preload) and for an eager startup that imports everything up front, the
+way main.py used to.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 5 --rows 50000 --delay 0
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from synth import write_export
+
+# Runs in a fresh interpreter; argv: launch time, eager flag, template, work folder, delay
+CHILD = r"""
+import os, sys, json, time
+launched, eager, template, folder = float(sys.argv[1]), sys.argv[2] == "1", sys.argv[3], sys.argv[4]
+delay = float(sys.argv[5])
+marks = {}
+def mark(name):
+    marks.setdefault(name, time.time() - launched)
+
+if eager:
+    import numpy, pandas, brand_cache, export_reader, aggregation, aggregate_store, dedupe_index, parquet_archive
+import main
+mark("import")
+
+from fakes import BurstCaptureBackend
+from window_watcher import PollingWatcher
+
+backend = BurstCaptureBackend(template, bursts=1, burst_size=1,
+                              start_delay=max(0.0, delay - (time.time() - launched)))
+detect = backend.detect
+def detect_and_mark():
+    mark("first_scan")
+    return detect()
+
+class StopAfterReport(PollingWatcher):
+    def wait(self, timeout=None):
+        if "first_report" in marks:
+            raise KeyboardInterrupt
+        return super().wait(0.1)
+
+os.startfile = lambda path: mark("first_report")
+main.SAVE_FOLDER = os.path.join(folder, "captured")
+main.PROCESSED_FOLDER = os.path.join(folder, "processed")
+main.AGGREGATE_STORE_PATH = None
+main.OPEN_REPORTS = True
+main.auto_capture_and_transform(StopAfterReport(detect_and_mark, 0.01, 0.05), backend)
+print("MARKS " + json.dumps(marks))
+"""
+
+
+def import_times(statement):
+    """Run statement under -X importtime; return {module: cumulative seconds}."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                         cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def launch(eager, template, folder, delay):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([REPO_DIR, BENCH_DIR, os.environ.get("PYTHONPATH", "")]))
+    launched = time.time()
+    argv = [sys.executable, "-c", CHILD, str(launched), "1" if eager else "0", template, folder, str(delay)]
+    out = subprocess.run(argv, cwd=REPO_DIR, capture_output=True, text=True, env=env)
+    for line in out.stdout.splitlines():
+        if line.startswith("MARKS "):
+            return json.loads(line[len("MARKS "):])
+    raise RuntimeError(f"startup run failed:\n{out.stdout}\n{out.stderr}")
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="launches per mode (median reported)")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows in the export")
+    parser.add_argument("--delay", type=float, default=2.0, help="seconds after launch the export appears")
+    args = parser.parse_args()
+
+    import main
+
+    # Plain import statements: modules loaded through importlib.import_module()
+    # don't get a top-level -X importtime line
+    deferred = main.PRELOAD_MODULES + main.OPTIONAL_PRELOAD_MODULES
+    lazy = import_times("import main")
+    preloaded = import_times("import main\n" + "\n".join(
+        f"try:\n    import {name}\nexcept ImportError:\n    pass" for name in deferred
+    ))
+    print(f"{'module':<20} {'import s':>9} {'at startup':>11}")
+    for name in ["main"] + deferred:
+        if name in preloaded:
+            print(f"{name:<20} {preloaded[name]:>9.3f} {'yes' if name in lazy else 'deferred':>11}")
+
+    print(f"\n{'startup':<8} {'import s':>9} {'first scan s':>13} {'first report s':>15}")
+    with tempfile.TemporaryDirectory() as folder:
+        template = write_export(args.rows, os.path.join(folder, "template.xlsx"))
+        for mode in ("eager", "lazy"):
+            runs = [launch(mode == "eager", template, os.path.join(folder, f"{mode}{i}"), args.delay)
+                    for i in range(args.runs)]
+            print(f"{mode:<8} {median(r['import'] for r in runs):>9.3f} "
+                  f"{median(r['first_scan'] for r in runs):>13.3f} "
+                  f"{median(r['first_report'] for r in runs):>15.3f}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,69 @@
+"""
+bench_streaming.py - In-Memory vs Chunked Transform
+Runs main.process_export on one synthetic export with the whole file in
+memory and again with STREAM_CHUNK_ROWS set, and reports time, peak
+traced memory and whether the reports came out identical.
+
+Usage:
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --rows 5000000 --chunk 250000 --format csv
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import pandas as pd
+
+from synth import write_export
+import main
+from brand_cache import get_brand_map_cache
+
+
+def run(source, processed_folder, chunk_rows):
+    main.STREAM_CHUNK_ROWS = chunk_rows
+    tracemalloc.start()
+    start = time.perf_counter()
+    paths, rows = main.process_export(source, processed_folder, verbose=False)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return [pd.read_parquet(path) for path in paths], seconds, peak / 1e6
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=100_000, help="rows per chunk when streaming")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    args = parser.parse_args()
+
+    # Parquet reports so the comparison reads back exactly what was written
+    main.REPORT_WRITER = "parquet"
+    main.OUTPUT_MODE = "separate"
+    main.AGGREGATE_STORE_PATH = None
+    main.DEDUPE_INDEX_PATH = None
+    main.PARQUET_ARCHIVE_PATH = None
+    get_brand_map_cache().get()
+
+    with tempfile.TemporaryDirectory() as folder:
+        source = write_export(args.rows, os.path.join(folder, f"export.{args.format}"))
+        print(f"{args.rows:,} rows ({args.format}), {args.chunk:,}-row chunks\n")
+        print(f"{'mode':<10} {'seconds':>9} {'peak MB':>9}")
+        in_memory, seconds, peak = run(source, os.path.join(folder, "memory"), None)
+        print(f"{'in-memory':<10} {seconds:>9.2f} {peak:>9.1f}")
+        streamed, seconds, peak = run(source, os.path.join(folder, "stream"), args.chunk)
+        print(f"{'streaming':<10} {seconds:>9.2f} {peak:>9.1f}")
+
+    identical = all(a.equals(b) for a, b in zip(in_memory, streamed))
+    print(f"\nReports identical: {identical}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,72 @@
+"""
+bench_watcher.py - Book1 Watcher Latency / Idle Cost Benchmark
+Runs each watcher against a FakeDesktop: idles for a while, then opens a
+Book1 window and measures how long the watcher takes to notice, how many
+window checks it made and how much CPU it burned.
+
+Usage: python benchmarks/bench_watcher.py [--idle 3] [--rounds 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from window_watcher import FakeDesktop, FakeWatcher, PollingWatcher
+
+
+def _fixed_poll(desktop):
+    # The old loop: full check every 5 seconds
+    return PollingWatcher(desktop.is_book1_available, min_interval=5.0, max_interval=5.0)
+
+
+def _adaptive_poll(desktop):
+    return PollingWatcher(desktop.is_book1_available)
+
+
+WATCHERS = {
+    "fixed-5s": _fixed_poll,
+    "adaptive": _adaptive_poll,
+    "event": FakeWatcher,
+}
+
+
+def run_round(make_watcher, idle):
+    desktop = FakeDesktop()
+    watcher = make_watcher(desktop)
+    opened_at = []
+
+    def _export():
+        time.sleep(idle)
+        opened_at.append(time.perf_counter())
+        desktop.open_window("Book1 - Excel")
+
+    threading.Thread(target=_export, daemon=True).start()
+    cpu_start = time.process_time()
+    watcher.wait()
+    noticed_at = time.perf_counter()
+    cpu = time.process_time() - cpu_start
+    watcher.close()
+    return noticed_at - opened_at[0], desktop.checks, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--idle", type=float, default=3.0, help="seconds before Book1 appears")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'watcher':<10} {'latency ms':>12} {'checks':>8} {'cpu ms':>8}")
+    for name, make_watcher in WATCHERS.items():
+        results = [run_round(make_watcher, args.idle) for _ in range(args.rounds)]
+        latency = sum(r[0] for r in results) / len(results) * 1000
+        checks = sum(r[1] for r in results) / len(results)
+        cpu = sum(r[2] for r in results) / len(results) * 1000
+        print(f"{name:<10} {latency:>12.1f} {checks:>8.1f} {cpu:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
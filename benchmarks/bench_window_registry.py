@@ -0,0 +1,129 @@
+"""
+bench_window_registry.py - Full Window Scan vs Incremental Registry
+Builds a FakeWin32 desktop with a few hundred ordinary windows and a
+handful of Excel windows, then answers the same stream of Book1 checks
+two ways: the old full scan (GetClassName on every window, every time)
+and ExcelWindowRegistry. Windows open, close and get retitled along the
+way; at max_age 0 both strategies must agree on every answer.
+
+Reports win32 calls per check, time per check and the registry's cache
+hit rates.
+
+Usage:
+    python benchmarks/bench_window_registry.py
+    python benchmarks/bench_window_registry.py --windows 1000 --checks 20000 --max-age 0
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from window_registry import EXCEL_WINDOW_CLASS, ExcelWindowRegistry, FakeWin32, is_capturable_book1
+
+
+def full_scan_find_book1(api):
+    """The pre-registry lookup: enumerate and query every window on each call."""
+    windows = []
+
+    def _enum(hwnd, _):
+        if api.GetClassName(hwnd) == EXCEL_WINDOW_CLASS:
+            _, pid = api.GetWindowThreadProcessId(hwnd)
+            windows.append((pid, hwnd, api.GetWindowText(hwnd), api.IsWindowVisible(hwnd)))
+
+    api.EnumWindows(_enum, None)
+    for pid, hwnd, title, vis in windows:
+        if vis and is_capturable_book1(title):
+            return pid, hwnd, title
+    return None, None, None
+
+
+def build_desktop(other_windows, excel_windows, seed):
+    rng = random.Random(seed)
+    api = FakeWin32()
+    classes = ["Chrome_WidgetWin_1", "CabinetWClass", "Shell_TrayWnd", "tooltips_class32", "IME"]
+    for i in range(other_windows):
+        api.open_window(rng.choice(classes), f"window {i}", pid=2000 + i, visible=rng.random() < 0.3)
+    excel = [api.open_window(EXCEL_WINDOW_CLASS, f"Report{i}.xlsx - Excel", pid=900) for i in range(excel_windows)]
+    return api, excel
+
+
+def churn_schedule(checks, seed):
+    """Desktop events, keyed by check number: Book1 appears/gets captured, other windows come and go."""
+    rng = random.Random(seed)
+    events = {}
+    for check in range(0, checks, 50):
+        events[check] = rng.choice(["book1", "capture", "open", "close"])
+    return events
+
+
+def run(strategy, api, events, checks):
+    """Answer `checks` Book1 queries; returns (answers, seconds spent in queries)."""
+    book1 = None
+    opened = []
+    answers = []
+    spent = 0.0
+    for check in range(checks):
+        event = events.get(check)
+        if event == "book1" and book1 is None:
+            book1 = api.open_window(EXCEL_WINDOW_CLASS, "Book1 - Excel", pid=900)
+        elif event == "capture" and book1 is not None:
+            api.set_title(book1, f"captured_{check}.xlsx - Excel")
+            book1 = None
+            if isinstance(strategy, ExcelWindowRegistry):
+                strategy.invalidate()  # what capture_book1 does after a save
+        elif event == "open":
+            opened.append(api.open_window("Chrome_WidgetWin_1", f"popup {check}"))
+        elif event == "close" and opened:
+            api.close_window(opened.pop())
+
+        start = time.perf_counter()
+        if isinstance(strategy, ExcelWindowRegistry):
+            found = strategy.find_book1()
+        else:
+            found = strategy(api)
+        spent += time.perf_counter() - start
+        answers.append(found[1])
+    return answers, spent
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--windows", type=int, default=300, help="non-Excel top-level windows")
+    parser.add_argument("--excel", type=int, default=3, help="saved Excel windows already open")
+    parser.add_argument("--checks", type=int, default=5_000, help="Book1 checks to answer")
+    parser.add_argument("--max-age", type=float, default=0.0,
+                        help="registry reuse window in seconds (0 = enumerate on every check)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    events = churn_schedule(args.checks, args.seed)
+    print(f"{args.windows} other windows, {args.excel} Excel windows, {args.checks:,} checks, "
+          f"max_age={args.max_age}s\n")
+    print(f"{'strategy':<10} {'calls/check':>12} {'us/check':>9} {'GetClassName':>13} {'GetWindowText':>14}")
+
+    results = {}
+    for name in ("full scan", "registry"):
+        api, _ = build_desktop(args.windows, args.excel, args.seed)
+        strategy = ExcelWindowRegistry(api, max_age=args.max_age) if name == "registry" else full_scan_find_book1
+        answers, spent = run(strategy, api, events, args.checks)
+        results[name] = answers
+        calls = sum(api.calls.values())
+        print(f"{name:<10} {calls / args.checks:>12.1f} {spent / args.checks * 1e6:>9.1f} "
+              f"{api.calls['GetClassName']:>13,} {api.calls['GetWindowText']:>14,}")
+        if name == "registry":
+            registry = strategy
+
+    print(f"\nQueries served without enumerating: {registry.hit_rate():.1%}")
+    print(f"Windows whose class came from cache: {registry.class_hit_rate():.1%}")
+    identical = results["full scan"] == results["registry"]
+    note = " (max_age > 0 lets answers lag a refresh behind)" if args.max_age > 0 else ""
+    print(f"Answers identical: {identical}{note}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,47 @@
+"""
+bench_writers.py - Report Writer Backend Benchmark
+Writes test123.csv scaled up to N rows (default 1M) with every
+report_writer backend and prints wall time and output size.
+
+Usage: python benchmarks/bench_writers.py [--rows 1000000] [--backends xlsx csv]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synth import scale_export
+from report_writer import WRITERS, get_writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--backends", nargs="+", default=list(WRITERS))
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} rows...")
+    df = scale_export(args.rows)
+
+    print(f"{'backend':<10} {'seconds':>10} {'MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.backends:
+            writer = get_writer(name)
+            path = os.path.join(tmp, "bench" + writer.extension)
+            start = time.perf_counter()
+            try:
+                writer.write(df, path)
+            except ImportError as e:
+                print(f"{name:<10} {'skipped':>10}  ({e})")
+                continue
+            elapsed = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{name:<10} {elapsed:>10.2f} {size_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+fakes.py - Fake Capture Backends
+Capture backends that stand in for Excel in benchmarks and tests:
+
+    BurstCaptureBackend - copies of a template export arriving in bursts
+                          (exercising the processing pipeline without Excel)
+    FakeExcelBackend    - BookN windows on a FakeWin32 desktop, "saved" by
+                          copying a template (exercising multi-window
+                          capture without Excel)
+"""
+
+import os
+import time
+import shutil
+import threading
+
+from capture_backends import CaptureBackend
+from capture_queue import CaptureQueue
+from window_registry import EXCEL_WINDOW_CLASS, ExcelWindowRegistry, FakeWin32
+
+
+class BurstCaptureBackend(CaptureBackend):
+    """
+    Fake backend: exports arrive in bursts of copies of a template file.
+
+    The first burst is available after start_delay seconds; each later
+    burst becomes available burst_gap seconds after the previous one was
+    fully captured.
+    ready_times records when each export became available, so callers can
+    measure how long exports waited to be captured.
+    """
+
+    name = "burst"
+
+    def __init__(self, template, bursts=3, burst_size=5, burst_gap=1.0, start_delay=0.0):
+        self.template = template
+        self.bursts = bursts
+        self.burst_size = burst_size
+        self.burst_gap = burst_gap
+        self.captured = 0
+        self.ready_times = []
+        self._lock = threading.Lock()
+        self._burst_ready_at = time.perf_counter() + start_delay
+
+    @property
+    def total(self):
+        return self.bursts * self.burst_size
+
+    @property
+    def exhausted(self):
+        return self.captured >= self.total
+
+    def detect(self):
+        return not self.exhausted and time.perf_counter() >= self._burst_ready_at
+
+    def list_available(self):
+        if not self.detect():
+            return []
+        left_in_burst = self.burst_size - self.captured % self.burst_size
+        return [f"Book1 ({i + 1})" for i in range(left_in_burst)]
+
+    def capture(self, save_folder, filename=None, verbose=True):
+        with self._lock:
+            if not self.detect():
+                if verbose:
+                    print("❌ No burst export waiting")
+                return None
+            index = self.captured
+            self.captured += 1
+            self.ready_times.append(self._burst_ready_at)
+            if self.captured % self.burst_size == 0:
+                self._burst_ready_at = time.perf_counter() + self.burst_gap
+
+        os.makedirs(save_folder, exist_ok=True)
+        extension = os.path.splitext(self.template)[1]
+        target = os.path.join(save_folder, filename or f"Captured_burst_{index:04d}{extension}")
+        shutil.copyfile(self.template, target)
+        if verbose:
+            print(f"✅ Burst export {index + 1}/{self.total} saved to: {target}")
+        return target
+
+
+class FakeExcelBackend(CaptureBackend):
+    """
+    Fake backend: unsaved BookN windows on a FakeWin32 desktop.
+
+    open_export() opens the next BookN window, numbered the way Excel
+    numbers new workbooks in a session. Capturing one waits save_seconds
+    (standing in for foreground + SAVE.AS), copies the template and
+    retitles the window to the captured file, like a real DDE save.
+    opened_at maps each window to when it appeared, so callers can measure
+    how long exports waited to be captured.
+    """
+
+    name = "fake-excel"
+
+    def __init__(self, template, all_books=True, save_seconds=0.2, api=None):
+        self.template = template
+        self.all_books = all_books
+        self.save_seconds = save_seconds
+        self.api = api if api is not None else FakeWin32()
+        self.registry = ExcelWindowRegistry(self.api, max_age=0)
+        self.queue = CaptureQueue(self._capture_window)
+        self.opened_at = {}
+        self.captured_at = {}
+        self._next_book = 1
+        self._lock = threading.Lock()
+
+    def open_export(self):
+        """Open the next BookN window; returns its hwnd."""
+        with self._lock:
+            title = f"Book{self._next_book} - Excel"
+            self._next_book += 1
+        hwnd = self.api.open_window(EXCEL_WINDOW_CLASS, title, pid=900)
+        self.opened_at[hwnd] = time.perf_counter()
+        return hwnd
+
+    def detect(self):
+        if self.all_books:
+            return bool(self.registry.find_unsaved_books())
+        return self.registry.has_book1()
+
+    def list_available(self):
+        return [window.title for window in self.registry.find_unsaved_books()]
+
+    def _capture_window(self, job, save_folder, filename, verbose):
+        time.sleep(self.save_seconds)
+        os.makedirs(save_folder, exist_ok=True)
+        target = os.path.join(save_folder, os.path.splitext(filename)[0] + os.path.splitext(self.template)[1])
+        shutil.copyfile(self.template, target)
+        self.api.set_title(job.hwnd, f"{os.path.basename(target)} - Excel")
+        self.captured_at[job.hwnd] = time.perf_counter()
+        if verbose:
+            print(f"✅ {job.name} saved to: {target}")
+        return target
+
+    def capture(self, save_folder, filename=None, verbose=True):
+        pid, hwnd, title = self.registry.find_book1()
+        if hwnd is None:
+            if verbose:
+                print("❌ No Book1 found (excluding captured files)")
+            return None
+        return self.queue.sweep([(pid, hwnd, title)], save_folder, verbose=verbose)[0].path
+
+    def capture_all(self, save_folder, on_captured=None, verbose=True, max_captures=100):
+        if not self.all_books:
+            return super().capture_all(save_folder, on_captured, verbose, max_captures)
+        windows = self.registry.find_unsaved_books()[:max_captures]
+        jobs = self.queue.sweep(windows, save_folder, on_captured, verbose)
+        return [job.path for job in jobs if job.path]
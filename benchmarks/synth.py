@@ -0,0 +1,138 @@
+"""
+synth.py - Synthetic Export Generator
+Builds ERP-style exports for benchmarks, either by resampling the rows of
+test123.csv (scale_export) or by generating fresh rows with realistic
+cardinalities - items from brand_map.csv, accounts and invoices that grow
+with the export (generate_export).
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_EXPORT = os.path.join(REPO_DIR, "test123.csv")
+BRAND_MAP = os.path.join(REPO_DIR, "brand_map.csv")
+
+LINES_PER_INVOICE = 8
+SHIP_DAYS = 90
+
+
+def load_sample():
+    """Load test123.csv as a raw export (without the enrichment columns)."""
+    df = pd.read_csv(SAMPLE_EXPORT, dtype={"Item ID": str, "Acctid": str, "Zipcode": str})
+    return df.drop(columns=["Unnamed: 0", "Brand", "CATEGORY", "Brand : Category"], errors="ignore")
+
+
+def scale_export(n_rows, seed=0):
+    """
+    Resample test123.csv rows up to n_rows.
+
+    Prices are jittered so sums are not just multiples of the sample.
+
+    Args:
+        n_rows (int): Number of rows to generate
+        seed (int): RNG seed, for repeatable runs
+
+    Returns:
+        DataFrame: Export with test123.csv's raw columns
+    """
+    sample = load_sample()
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(sample), n_rows)
+    df = sample.iloc[picks].reset_index(drop=True)
+    jitter = rng.uniform(0.9, 1.1, n_rows)
+    df["Sale Price"] = (df["Sale Price"] * jitter).round(2)
+    df["Unit Cost"] = (df["Unit Cost"] * jitter).round(2)
+    return df
+
+
+def generate_export(n_rows, seed=0):
+    """
+    Generate an export with test123.csv's columns and realistic cardinalities.
+
+    Items are drawn from brand_map.csv with a Zipf-like popularity, accounts
+    scale with size (~1 per 50 lines, 141-20,000), invoices hold ~8 lines
+    for one account on one ship date, and dates span 90 days.
+
+    Args:
+        n_rows (int): Number of rows to generate
+        seed (int): RNG seed, for repeatable runs
+
+    Returns:
+        DataFrame: Raw export (no Brand/CATEGORY columns)
+    """
+    rng = np.random.default_rng(seed)
+    sample = load_sample()
+
+    # Items: every brand_map ID, popularity ~ 1/rank
+    item_ids = pd.read_csv(BRAND_MAP, dtype={"Item ID": str})["Item ID"].drop_duplicates().to_numpy()
+    n_items = len(item_ids)
+    popularity = 1.0 / np.arange(1, n_items + 1)
+    item_idx = rng.choice(n_items, size=n_rows, p=popularity / popularity.sum())
+    item_price = np.round(rng.uniform(5, 120, n_items), 2)
+    item_cost = np.round(item_price * rng.uniform(0.6, 0.9, n_items), 2)
+    item_upc = rng.integers(10**11, 10**12, n_items).astype(np.float64)
+    item_size = rng.choice(sample["Item Size"].dropna().unique(), n_items)
+    item_status = rng.choice(sample["Item Status"].dropna().unique(), n_items)
+    item_stock = np.round(rng.uniform(0, 50, n_items) * 2) / 2
+
+    # Accounts, each with one salesman and address
+    n_accounts = int(min(max(n_rows // 50, 141), 20000))
+    acct_ids = np.array([f"{i:05d}" for i in range(n_accounts)], dtype=object)
+    acct_names = np.array([f"ACCOUNT {i:05d} MARKET" for i in range(n_accounts)], dtype=object)
+    acct_city = rng.choice(sample["City"].dropna().unique(), n_accounts)
+    acct_state = rng.choice(sample["State"].dropna().unique(), n_accounts)
+    acct_zip = rng.choice(sample["Zipcode"].dropna().unique(), n_accounts)
+    acct_street = np.array([f"{i} MAIN ST" for i in range(n_accounts)], dtype=object)
+    acct_salesman = rng.choice(sample["Salesman"].dropna().unique(), n_accounts)
+
+    # Invoices: consecutive blocks of lines, one account and ship date each
+    n_invoices = max(n_rows // LINES_PER_INVOICE, 1)
+    invoice_idx = np.sort(rng.integers(0, n_invoices, n_rows))
+    invoice_acct = rng.integers(0, n_accounts, n_invoices)
+    invoice_day = rng.integers(0, SHIP_DAYS, n_invoices)
+    ship_dates = (pd.Timestamp("2025-04-01") + pd.to_timedelta(np.arange(SHIP_DAYS), unit="D")).strftime("%Y-%m-%d").to_numpy()
+    acct = invoice_acct[invoice_idx]
+
+    order_qty = rng.choice([0.5, 1.0, 1.0, 1.0, 2.0, 3.0, 5.0], n_rows)
+    returns = np.where(rng.random(n_rows) < 0.02, 1, 0)
+
+    return pd.DataFrame({
+        "Item ID": item_ids[item_idx],
+        "Item Name": pd.Series(item_ids[item_idx]).radd("ITEM "),
+        "Item Size": item_size[item_idx],
+        "Current Stock": item_stock[item_idx],
+        "Acctid": acct_ids[acct],
+        "Account Name": acct_names[acct],
+        "Street": acct_street[acct],
+        "City": acct_city[acct],
+        "State": acct_state[acct],
+        "Zipcode": acct_zip[acct],
+        "Ship Date": ship_dates[invoice_day[invoice_idx]],
+        "Invoice Number": (20000000 + invoice_idx).astype(str),
+        "Unit Price": item_price[item_idx],
+        "Sale Price": np.round(item_price[item_idx] * rng.uniform(0.8, 1.0, n_rows), 2),
+        "Unit Cost": item_cost[item_idx],
+        "Order Quantity": order_qty,
+        "Sale Quantity": order_qty,
+        "RT Quantity": returns,
+        "Salesman": acct_salesman[acct],
+        "Item Status": item_status[item_idx],
+    }).assign(**{"Unnamed: 0": item_upc[item_idx]})[["Unnamed: 0"] + list(sample.columns)]
+
+
+def write_export(n_rows, path, seed=0):
+    """
+    Write a synthetic export of n_rows to path (xlsx or csv), reusing an
+    existing file of the same name so large exports are only built once.
+    """
+    if os.path.exists(path):
+        return path
+    df = scale_export(n_rows, seed)
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        from report_writer import get_writer
+        get_writer("xlsx").write(df, path)
+    return path
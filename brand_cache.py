@@ -0,0 +1,109 @@
+"""
+brand_cache.py - Persistent Brand Map Lookup
+Loads brand_map.csv once and keeps it indexed on Item ID so every capture
+can enrich its rows with a single index lookup instead of re-reading the CSV.
+"""
+
+import os
+import hashlib
+import threading
+import pandas as pd
+
+BRAND_MAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "brand_map.csv")
+BRAND_COLUMNS = ["Brand", "CATEGORY"]
+
+
+def _file_digest(path):
+    """Return the SHA-1 hex digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BrandMapCache:
+    """
+    Brand map held in memory, indexed on Item ID.
+
+    The table is re-read only when the file's mtime or size changes, and
+    even then it is re-parsed only if the content hash differs.
+    """
+
+    def __init__(self, path=BRAND_MAP_PATH):
+        self.path = path
+        self.loads = 0
+        self._table = None
+        self._stat = None
+        self._digest = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        brand_map_df = pd.read_csv(self.path, dtype={"Item ID": str})
+        # A repeated Item ID made the old left merge count each of its lines
+        # once per brand_map row. Keep the first row so processing carries on
+        # (the map is hot-reloaded), but say so on every load until it's fixed.
+        duplicated = brand_map_df["Item ID"].duplicated()
+        if duplicated.any():
+            ids = sorted(brand_map_df.loc[duplicated, "Item ID"].unique())
+            print(f"⚠️ {os.path.basename(self.path)} lists {len(ids)} Item ID(s) more than once "
+                  f"({', '.join(ids)}); using the first row for each")
+            brand_map_df = brand_map_df[~duplicated]
+        table = brand_map_df.set_index("Item ID")[BRAND_COLUMNS]
+        for column in BRAND_COLUMNS:
+            table[column] = table[column].astype("category")
+        self.loads += 1
+        return table
+
+    def get(self):
+        """
+        Return the indexed brand table, reloading it if the file changed.
+
+        Returns:
+            DataFrame: Brand/CATEGORY columns indexed by Item ID
+        """
+        st = os.stat(self.path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            if self._table is not None and stat_key == self._stat:
+                return self._table
+
+            digest = _file_digest(self.path)
+            if self._table is None or digest != self._digest:
+                self._table = self._load()
+                self._digest = digest
+            self._stat = stat_key
+            return self._table
+
+    def enrich(self, df):
+        """
+        Attach Brand and CATEGORY to each row of a captured export.
+
+        Equivalent to a left merge on Item ID, done as an index lookup
+        against the cached table.
+
+        Args:
+            df (DataFrame): Captured export with an "Item ID" column
+
+        Returns:
+            DataFrame: Copy of df with Brand and CATEGORY columns
+        """
+        table = self.get()
+        looked_up = table.reindex(df["Item ID"].to_numpy())
+
+        enriched = df.drop(columns=[c for c in BRAND_COLUMNS if c in df.columns])
+        for column in BRAND_COLUMNS:
+            enriched[column] = looked_up[column].array
+        return enriched
+
+
+_default_cache = None
+
+
+def get_brand_map_cache(path=BRAND_MAP_PATH):
+    """Return the shared process-wide BrandMapCache for path."""
+    global _default_cache
+    if _default_cache is None or _default_cache.path != path:
+        _default_cache = BrandMapCache(path)
+    return _default_cache
@@ -0,0 +1,226 @@
+"""
+capture_backends.py - Capture Backend Interface
+Separates "where do exports come from" from the processing loop in main.py.
+
+Backends:
+    DDECaptureBackend   - unsaved Book1 (or every BookN) window in Excel,
+                          saved via DDE (autosaver.py; interactive Windows
+                          desktop only)
+    WatchFolderBackend  - xlsx/csv files dropped into a directory
+                          (ERP file dumps, headless servers, benchmarks)
+
+Fake backends for benchmarks and tests live in benchmarks/fakes.py.
+"""
+
+import os
+import time
+import uuid
+import shutil
+from datetime import datetime
+from completion import has_zip_eocd
+from instrument import span
+from capture_queue import CaptureQueue
+
+
+class CaptureBackend:
+    """
+    Interface shared by all capture backends.
+
+    detect()              -> bool, is there an export waiting to be captured?
+    capture(folder)       -> path of the captured file in folder, or None
+    capture_all(folder)   -> paths of every export captured in one sweep
+    list_available()      -> names of exports waiting to be captured
+    """
+
+    name = None
+    # True when a WinEvent window watcher can wake the loop for this backend
+    supports_window_events = False
+
+    def detect(self):
+        raise NotImplementedError
+
+    def capture(self, save_folder, filename=None, verbose=True):
+        raise NotImplementedError
+
+    def capture_all(self, save_folder, on_captured=None, verbose=True, max_captures=100):
+        """
+        Capture every waiting export, calling on_captured(path) as each one lands.
+
+        The default captures one at a time until detect() is False (or a
+        capture fails); backends that can see all waiting exports at once
+        override it.
+
+        Returns:
+            list: Paths of the captured files, in capture order
+        """
+        paths = []
+        while len(paths) < max_captures and self.detect():
+            path = self.capture(save_folder, verbose=verbose)
+            if not path:
+                break
+            paths.append(path)
+            if on_captured is not None:
+                on_captured(path)
+        return paths
+
+    def list_available(self):
+        raise NotImplementedError
+
+
+class DDECaptureBackend(CaptureBackend):
+    """
+    Capture unsaved workbooks from Excel (autosaver.py).
+
+    With all_books, detect() fires for any unsaved BookN window and
+    capture_all() saves every one of them in a single sweep; otherwise
+    only Book1 is looked for, as before.
+    """
+
+    name = "dde"
+    supports_window_events = True
+
+    def __init__(self, all_books=False):
+        self.all_books = all_books
+        self.queue = None
+
+    def detect(self):
+        if self.all_books:
+            from autosaver import is_any_book_available
+            return is_any_book_available()
+        from autosaver import is_book1_available
+        return is_book1_available()
+
+    def capture(self, save_folder, filename=None, verbose=True):
+        from autosaver import capture_book1
+        return capture_book1(save_folder, filename, verbose)
+
+    def capture_all(self, save_folder, on_captured=None, verbose=True, max_captures=100):
+        if not self.all_books:
+            return super().capture_all(save_folder, on_captured, verbose, max_captures)
+        from autosaver import capture_all_books, capture_book_window
+        if self.queue is None:
+            self.queue = CaptureQueue(capture_book_window)
+        jobs = capture_all_books(save_folder, on_captured, verbose, queue=self.queue)
+        return [job.path for job in jobs if job.path]
+
+    def list_available(self):
+        from autosaver import get_available_workbooks
+        return get_available_workbooks()
+
+
+class WatchFolderBackend(CaptureBackend):
+    """
+    Pick up export files dropped into a directory.
+
+    Capturing claims the oldest waiting file by renaming it to a .claimed
+    name inside the drop folder (atomic, so exactly one worker gets it),
+    then moves it into the save folder - a rename on the same volume, a
+    copy and delete across volumes - and returns its new path. Files still
+    being written - modified within the last settle_seconds - are left alone.
+
+    A .claimed file is only left behind if the process dies mid-move;
+    rename it back to pick it up again.
+    """
+
+    name = "folder"
+    EXTENSIONS = (".xlsx", ".csv")
+
+    def __init__(self, drop_folder, settle_seconds=1.0):
+        self.drop_folder = drop_folder
+        self.settle_seconds = settle_seconds
+        os.makedirs(drop_folder, exist_ok=True)
+
+    def _waiting_files(self):
+        now = time.time()
+        entries = []
+        with os.scandir(self.drop_folder) as it:
+            for entry in it:
+                name = entry.name
+                # Skip Excel lock files (~$Book1.xlsx) and anything unfamiliar
+                if name.startswith("~$") or not name.lower().endswith(self.EXTENSIONS):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if not entry.is_file() or now - st.st_mtime < self.settle_seconds:
+                    continue
+                # A half-written xlsx has no ZIP end-of-central-directory yet
+                if name.lower().endswith(".xlsx") and not has_zip_eocd(entry.path):
+                    continue
+                entries.append((st.st_mtime, entry.path))
+        entries.sort()
+        return [path for _, path in entries]
+
+    def detect(self):
+        return bool(self._waiting_files())
+
+    def list_available(self):
+        return [os.path.basename(path) for path in self._waiting_files()]
+
+    def capture(self, save_folder, filename=None, verbose=True):
+        os.makedirs(save_folder, exist_ok=True)
+
+        with span("detect"):
+            waiting = self._waiting_files()
+
+        for source in waiting:
+            if filename is None:
+                timestamp = datetime.now().strftime("%m-%d-%Y_%H.%M.%S")
+                target_name = f"Captured_{timestamp}_{os.path.basename(source)}"
+            else:
+                target_name = filename
+            target = os.path.join(save_folder, target_name)
+
+            claimed = f"{source}.{uuid.uuid4().hex[:8]}.claimed"
+            try:
+                os.replace(source, claimed)
+            except OSError as e:
+                # Another worker got it first, or it's still locked
+                if verbose:
+                    print(f"   ⚠️ Could not claim {os.path.basename(source)}: {e}")
+                continue
+
+            try:
+                shutil.move(claimed, target)
+            except OSError as e:
+                # Drop any partial copy and put it back so a later capture can try again
+                try:
+                    if os.path.exists(target):
+                        os.remove(target)
+                    os.replace(claimed, source)
+                except OSError:
+                    pass
+                if verbose:
+                    print(f"   ⚠️ Could not move {os.path.basename(source)} to {save_folder}: {e}")
+                continue
+
+            if verbose:
+                print(f"✅ Picked up {os.path.basename(source)}")
+                print(f"📁 Saved to: {target}")
+            return target
+
+        if verbose:
+            print(f"❌ No export files waiting in {self.drop_folder}")
+        return None
+
+
+def create_capture_backend(name, drop_folder=None, all_books=False):
+    """
+    Build a capture backend by name.
+
+    Args:
+        name (str): "dde" or "folder"
+        drop_folder (str, optional): Directory watched by the "folder" backend
+        all_books (bool): For "dde", capture every unsaved BookN window, not just Book1
+
+    Returns:
+        CaptureBackend
+    """
+    if name == "dde":
+        return DDECaptureBackend(all_books)
+    if name == "folder":
+        if drop_folder is None:
+            raise ValueError("The folder capture backend needs a drop_folder")
+        return WatchFolderBackend(drop_folder)
+    raise ValueError(f"Unknown capture backend {name!r} (choose from dde, folder)")
@@ -0,0 +1,136 @@
+"""
+capture_queue.py - Multi-Window Capture Queue
+Captures every unsaved Book window found in one sweep, instead of only the
+first Book1 per wake-up.
+
+Excel can only SAVE.AS the active workbook, so the windows themselves are
+captured one at a time; each saved export is handed to on_captured (the
+processing pipeline) as soon as it lands, so transforming Book1 overlaps
+with capturing Book2, Book3, ...
+
+A window that fails (e.g. it couldn't be brought to the foreground) is
+marked failed and the sweep moves on; it is still an unsaved BookN, so
+the next sweep tries it again.
+
+    sweep(windows) --> queued --> capturing --> captured --> on_captured(path)
+                                           \\-> failed
+"""
+
+import os
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+from window_registry import book_name
+
+QUEUED = "queued"
+CAPTURING = "capturing"
+CAPTURED = "captured"
+FAILED = "failed"
+
+
+class WindowCapture:
+    """One window's trip through a capture sweep."""
+
+    def __init__(self, pid, hwnd, title):
+        self.pid = pid
+        self.hwnd = hwnd
+        self.title = title
+        self.state = QUEUED
+        self.path = None
+        self.error = None
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def name(self):
+        """Workbook name for filenames and messages ("Book2")."""
+        return book_name(self.title) or self.title
+
+    def __repr__(self):
+        return f"WindowCapture({self.name!r}, {self.state})"
+
+
+def capture_filename(name, save_folder=None):
+    """
+    Captured_<timestamp>_<BookN>.xlsx, e.g. Captured_06-12-2025_14.03.07_Book2.xlsx.
+
+    With save_folder, a _2, _3, ... suffix keeps it clear of a capture
+    already saved there (two Book1s within one second), which a worker may
+    still be reading.
+    """
+    timestamp = datetime.now().strftime("%m-%d-%Y_%H.%M.%S")
+    stem = f"Captured_{timestamp}_{name}"
+    filename = f"{stem}.xlsx"
+    suffix = 2
+    while save_folder is not None and os.path.exists(os.path.join(save_folder, filename)):
+        filename = f"{stem}_{suffix}.xlsx"
+        suffix += 1
+    return filename
+
+
+class CaptureQueue:
+    """
+    Captures a batch of windows in order, tracking each one's state.
+
+    self.jobs keeps the most recent WindowCaptures (latest last) across
+    sweeps, and self.stats counts every job by final state.
+    """
+
+    def __init__(self, capture_one, history=500):
+        """
+        Args:
+            capture_one (callable): capture_one(job, save_folder, filename, verbose)
+                -> saved path or None; saves a single window
+            history (int): WindowCaptures kept in self.jobs
+        """
+        self.capture_one = capture_one
+        self.jobs = deque(maxlen=history)
+        self.stats = Counter()
+
+    def sweep(self, windows, save_folder, on_captured=None, verbose=True):
+        """
+        Capture every window in windows.
+
+        Args:
+            windows (list): (pid, hwnd, title, ...) tuples, in capture order
+            save_folder (str): Directory to save captured files in
+            on_captured (callable, optional): Called with each saved path as
+                soon as it lands (e.g. ProcessingPipeline.submit)
+            verbose (bool): Whether to print status messages
+
+        Returns:
+            list: The sweep's WindowCapture jobs, in capture order
+        """
+        pending = deque(WindowCapture(pid, hwnd, title) for pid, hwnd, title, *_ in windows)
+        jobs = list(pending)
+        self.jobs.extend(jobs)
+        if verbose and len(jobs) > 1:
+            print(f"📚 {len(jobs)} unsaved workbooks: {', '.join(job.name for job in jobs)}")
+
+        while pending:
+            job = pending.popleft()
+            job.state = CAPTURING
+            job.started_at = time.perf_counter()
+            try:
+                job.path = self.capture_one(job, save_folder, capture_filename(job.name, save_folder), verbose)
+            except Exception as e:
+                job.error = e
+            job.finished_at = time.perf_counter()
+            job.state = CAPTURED if job.path else FAILED
+            self.stats[job.state] += 1
+
+            if job.state == FAILED:
+                if verbose:
+                    reason = f": {job.error}" if job.error is not None else ""
+                    print(f"❌ Failed to capture {job.name}{reason}")
+                continue
+            if on_captured is not None:
+                on_captured(job.path)
+
+        return jobs
+
+    def counts(self):
+        """How many of the jobs in self.jobs are in each state."""
+        return Counter(job.state for job in self.jobs)
@@ -0,0 +1,99 @@
+"""
+completion.py - Wait-For-Completion Helpers
+Poll for a condition with exponentially growing intervals instead of
+sleeping a fixed amount, so callers wait only as long as the other side
+(Excel, the window manager, a file writer) actually needs.
+"""
+
+import os
+import time
+
+ZIP_EOCD_SIGNATURE = b"PK\x05\x06"
+ZIP_EOCD_SIZE = 22
+ZIP_MAX_COMMENT = 0xFFFF
+
+
+def wait_until(predicate, timeout=5.0, initial_interval=0.02, max_interval=0.5, backoff=2.0, sleep=time.sleep):
+    """
+    Poll predicate() until it returns True or timeout seconds pass.
+
+    Args:
+        predicate (callable): Condition to wait for
+        timeout (float): Give up after this many seconds
+        initial_interval (float): First pause between polls
+        max_interval (float): Longest pause between polls
+        backoff (float): Factor the pause grows by after each miss
+        sleep (callable): Sleep function (swap out in tests)
+
+    Returns:
+        bool: True if the condition was met, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
+
+
+def has_zip_eocd(path):
+    """
+    Check that a file ends with a complete ZIP end-of-central-directory record.
+
+    xlsx files are ZIP containers and the EOCD record is the last thing
+    written, so a valid one means the writer has finished.
+    """
+    try:
+        size = os.path.getsize(path)
+        if size < ZIP_EOCD_SIZE:
+            return False
+        with open(path, "rb") as f:
+            tail_size = min(size, ZIP_EOCD_SIZE + ZIP_MAX_COMMENT)
+            f.seek(size - tail_size)
+            tail = f.read(tail_size)
+    except OSError:
+        return False
+
+    pos = tail.rfind(ZIP_EOCD_SIGNATURE)
+    if pos < 0 or len(tail) - pos < ZIP_EOCD_SIZE:
+        return False
+    comment_length = int.from_bytes(tail[pos + 20:pos + 22], "little")
+    return pos + ZIP_EOCD_SIZE + comment_length == len(tail)
+
+
+def wait_for_file_complete(path, timeout=10.0, initial_interval=0.05, max_interval=1.0,
+                           backoff=2.0, require_zip=True, sleep=time.sleep):
+    """
+    Wait until a file exists, has stopped growing and (optionally) is a
+    complete ZIP/xlsx container.
+
+    Args:
+        path (str): File being written by someone else
+        timeout (float): Give up after this many seconds
+        initial_interval (float): First pause between polls
+        max_interval (float): Longest pause between polls
+        backoff (float): Factor the pause grows by after each miss
+        require_zip (bool): Also require a valid ZIP end-of-central-directory
+        sleep (callable): Sleep function (swap out in tests)
+
+    Returns:
+        bool: True once the file is complete, False on timeout
+    """
+    last_size = [None]
+
+    def _complete():
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        stable = size > 0 and size == last_size[0]
+        last_size[0] = size
+        if not stable:
+            return False
+        return not require_zip or has_zip_eocd(path)
+
+    return wait_until(_complete, timeout, initial_interval, max_interval, backoff, sleep)
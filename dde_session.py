@@ -0,0 +1,311 @@
+"""
+dde_session.py - Persistent DDE Session to Excel
+Keeps one DDE server and one Excel|System conversation alive across
+captures, instead of creating and tearing down both for every save.
+
+    execute(command) --> connected? --no--> create server (once) + connect
+                             |                         (retried once on failure)
+                        idle > health_interval? --> Request("Status"), reconnect if dead
+                             |
+                        Exec(command) --fails--> drop conversation, raise
+
+Exec itself is never re-sent: a failure may be a timeout while Excel is
+still carrying the command out, and commands like SAVE.AS are not safe to
+repeat. The next execute() starts from a fresh conversation.
+
+close() (also run at interpreter exit for the shared session) closes the
+conversation and shuts the server down, however the last capture ended.
+
+Transports:
+    PyWin32DDETransport - the real win32ui + dde calls (Windows with Excel)
+    FakeDDETransport    - in-memory stand-in with setup costs, call counts
+                          and SAVE.AS that writes a copy of a template file
+"""
+
+import re
+import time
+import atexit
+import shutil
+import threading
+from collections import Counter
+
+
+class DDEError(Exception):
+    """A DDE call failed (raised by FakeDDETransport; pywin32 raises dde.error)."""
+
+
+class PyWin32DDETransport:
+    """The pywin32 DDE calls a DDESession needs."""
+
+    def __init__(self):
+        import win32ui  # noqa: F401 - must be loaded before dde
+        import dde
+
+        self._dde = dde
+
+    def create_server(self, name):
+        server = self._dde.CreateServer()
+        server.Create(name)
+        return server
+
+    def connect(self, server, service, topic):
+        conversation = self._dde.CreateConversation(server)
+        conversation.ConnectTo(service, topic)
+        return conversation
+
+    def execute(self, conversation, command):
+        conversation.Exec(command)
+
+    def request(self, conversation, item):
+        return conversation.Request(item)
+
+    def disconnect(self, conversation):
+        conversation.Close()
+
+    def shutdown(self, server):
+        server.Shutdown()
+
+
+class FakeDDETransport:
+    """
+    In-memory stand-in for PyWin32DDETransport.
+
+    Server creation and connecting sleep server_seconds / connect_seconds,
+    roughly what they cost against a real Excel. SAVE.AS("path") copies
+    save_template to path. crash() makes the next calls on the current
+    conversation fail, as when Excel is closed or restarted; refuse_connects
+    makes connecting fail while Excel is "gone". Every call is counted in
+    self.calls, and self.live_servers shows servers created but never shut down.
+    """
+
+    SAVE_AS = re.compile(r'\[SAVE\.AS\("(.*)"\)\]')
+
+    def __init__(self, save_template=None, server_seconds=0.02, connect_seconds=0.03, exec_seconds=0.0):
+        self.save_template = save_template
+        self.server_seconds = server_seconds
+        self.connect_seconds = connect_seconds
+        self.exec_seconds = exec_seconds
+        self.refuse_connects = False
+        self.calls = Counter()
+        self.live_servers = 0
+        self.executed = []
+        self._generation = 0
+
+    def crash(self):
+        """Break every open conversation (Excel closed or restarted)."""
+        self._generation += 1
+
+    def create_server(self, name):
+        self.calls["create_server"] += 1
+        time.sleep(self.server_seconds)
+        self.live_servers += 1
+        return {"name": name, "open": True}
+
+    def connect(self, server, service, topic):
+        self.calls["connect"] += 1
+        time.sleep(self.connect_seconds)
+        if self.refuse_connects or not server["open"]:
+            raise DDEError(f"ConnectTo {service}|{topic} failed")
+        return {"generation": self._generation, "open": True}
+
+    def _check(self, conversation):
+        if not conversation["open"] or conversation["generation"] != self._generation:
+            raise DDEError("Conversation is no longer connected")
+
+    def execute(self, conversation, command):
+        self.calls["execute"] += 1
+        self._check(conversation)
+        time.sleep(self.exec_seconds)
+        self.executed.append(command)
+        match = self.SAVE_AS.fullmatch(command)
+        if match and self.save_template:
+            shutil.copyfile(self.save_template, match.group(1))
+
+    def request(self, conversation, item):
+        self.calls["request"] += 1
+        self._check(conversation)
+        return "Ready" if item == "Status" else ""
+
+    def disconnect(self, conversation):
+        self.calls["disconnect"] += 1
+        conversation["open"] = False
+
+    def shutdown(self, server):
+        self.calls["shutdown"] += 1
+        if server["open"]:
+            server["open"] = False
+            self.live_servers -= 1
+
+
+class DDESession:
+    """
+    Long-lived DDE conversation with Excel.
+
+    Connects lazily on the first execute(). Use it from the capture thread
+    only; the lock just keeps a stray second caller from interleaving.
+
+    Stats in self.stats: servers (servers created), connects, reconnects,
+    health_checks, executes and failures.
+    """
+
+    def __init__(self, transport=None, service="Excel", topic="System",
+                 client_name="CaptureClient", health_interval=5.0):
+        """
+        Args:
+            transport: PyWin32DDETransport-like object (defaults to the real pywin32 calls)
+            service (str): DDE service to talk to
+            topic (str): DDE topic
+            client_name (str): Name our DDE server registers under
+            health_interval (float): Seconds idle before execute() checks the
+                conversation with a Status request first
+        """
+        self.transport = transport
+        self.service = service
+        self.topic = topic
+        self.client_name = client_name
+        self.health_interval = health_interval
+        self.stats = Counter()
+        self._server = None
+        self._conversation = None
+        self._last_ok = None
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def connected(self):
+        return self._conversation is not None
+
+    def connect(self):
+        """
+        Make sure the server and conversation exist.
+
+        Returns:
+            bool: True if a new conversation was opened, False if one was already up
+        """
+        with self._lock:
+            if self._conversation is not None:
+                return False
+            if self.transport is None:
+                self.transport = PyWin32DDETransport()
+            if self._server is None:
+                self._server = self.transport.create_server(self.client_name)
+                self.stats["servers"] += 1
+            try:
+                self._conversation = self.transport.connect(self._server, self.service, self.topic)
+            except Exception:
+                # The server may be what's broken; start clean next time
+                self._shutdown_server()
+                raise
+            self.stats["connects"] += 1
+            self._last_ok = time.monotonic()
+            return True
+
+    def is_healthy(self):
+        """Cheap liveness probe: a Status request on the open conversation."""
+        with self._lock:
+            if self._conversation is None:
+                return False
+            self.stats["health_checks"] += 1
+            try:
+                self.transport.request(self._conversation, "Status")
+            except Exception:
+                return False
+            self._last_ok = time.monotonic()
+            return True
+
+    def execute(self, command, retries=1):
+        """
+        Send a DDE Exec command over a live conversation.
+
+        Getting the conversation ready (health check, connect) is retried;
+        once Exec has been sent, a failure is raised as-is and the command
+        is not re-sent (the caller checks for the result, e.g. with
+        wait_for_file_complete).
+
+        Args:
+            command (str): e.g. '[SAVE.AS("C:\\\\path\\\\file.xlsx")]'
+            retries (int): Reconnect attempts if the conversation can't be set up
+
+        Returns:
+            bool: True if this call had to open a new conversation
+        """
+        with self._lock:
+            reconnected = self._ready(retries)
+            try:
+                self.transport.execute(self._conversation, command)
+            except Exception:
+                # Maybe dispatched; don't resend, just start clean next time
+                self.stats["failures"] += 1
+                self._drop_conversation()
+                raise
+            self.stats["executes"] += 1
+            self._last_ok = time.monotonic()
+            return reconnected
+
+    def _ready(self, retries):
+        """Health-check or (re)connect until a conversation is up; True if a new one was opened."""
+        for attempt in range(retries + 1):
+            try:
+                if self._conversation is not None and self._idle() > self.health_interval:
+                    if not self.is_healthy():
+                        self._drop_conversation()
+                if not self.connect():
+                    return False
+                if self.stats["connects"] > 1:
+                    self.stats["reconnects"] += 1
+                return True
+            except Exception:
+                self.stats["failures"] += 1
+                self._drop_conversation()
+                if attempt == retries:
+                    raise
+
+    def close(self):
+        """Close the conversation and shut the server down (safe to call twice)."""
+        with self._lock:
+            self._drop_conversation()
+            self._shutdown_server()
+
+    def _idle(self):
+        return time.monotonic() - self._last_ok if self._last_ok is not None else float("inf")
+
+    def _drop_conversation(self):
+        if self._conversation is None:
+            return
+        try:
+            self.transport.disconnect(self._conversation)
+        except Exception:
+            pass
+        self._conversation = None
+
+    def _shutdown_server(self):
+        if self._server is None:
+            return
+        try:
+            self.transport.shutdown(self._server)
+        except Exception:
+            pass
+        self._server = None
+
+
+_default_session = None
+
+
+def get_dde_session():
+    """Return the shared process-wide DDESession, closed automatically at exit."""
+    global _default_session
+    if _default_session is None:
+        _default_session = DDESession()
+        atexit.register(_default_session.close)
+    return _default_session
+
+
+def close_dde_session():
+    """Close the shared session, if one was ever opened."""
+    if _default_session is not None:
+        _default_session.close()
@@ -0,0 +1,160 @@
+"""
+dedupe_index.py - Invoice Line Deduplication Index
+Remembers every export line already processed as a 64-bit hash of
+(Invoice Number, Item ID, Ship Date, Acctid), so lines repeated by
+overlapping exports are dropped instead of counted again.
+
+The index is a sorted uint64 .npy file opened memory-mapped: startup is
+instant, lookups are a vectorized binary search, and merging new hashes
+streams through the file in fixed-size chunks, so memory stays bounded
+even with tens of millions of lines.
+
+Lines handed out by filter_new() stay reserved until add() or release(),
+so captures processed concurrently never both count the same line.
+"""
+
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+LINE_KEY_COLUMNS = ["Invoice Number", "Item ID", "Ship Date", "Acctid"]
+MERGE_CHUNK = 1 << 20  # hashes per chunk when merging into the index file
+
+
+def line_hashes(df):
+    """
+    Hash each export line's identity to a uint64.
+
+    Ship Date is normalized to YYYY-MM-DD so xlsx (datetime cells) and csv
+    (text) exports of the same line hash the same.
+    """
+    keys = pd.DataFrame(index=df.index)
+    for column in LINE_KEY_COLUMNS:
+        values = df[column] if column in df.columns else pd.Series("", index=df.index)
+        if column == "Ship Date":
+            parsed = pd.to_datetime(values, errors="coerce")
+            values = parsed.dt.strftime("%Y-%m-%d").where(parsed.notna(), values.astype(str))
+        keys[column] = values.astype(str).str.strip()
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+
+class LineDedupIndex:
+    """Persistent, memory-mapped set of line hashes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._hashes = self._open()
+        self._pending = np.empty(0, dtype=np.uint64)  # sorted, reserved by filter_new()
+
+    def _open(self):
+        if not os.path.exists(self.path):
+            return np.empty(0, dtype=np.uint64)
+        return np.load(self.path, mmap_mode="r")
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def contains(self, hashes):
+        """Return a boolean array: True where a hash is already in the index."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        base = self._hashes
+        if len(base) == 0 or len(hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        # Probe in sorted order so the binary searches walk the mmap forwards
+        order = np.argsort(hashes, kind="stable")
+        probe = hashes[order]
+        pos = np.searchsorted(base, probe)
+        found_sorted = np.zeros(len(probe), dtype=bool)
+        in_range = pos < len(base)
+        found_sorted[in_range] = base[pos[in_range]] == probe[in_range]
+        found = np.empty(len(hashes), dtype=bool)
+        found[order] = found_sorted
+        return found
+
+    def add(self, hashes):
+        """
+        Record hashes as seen and persist the index.
+
+        Returns:
+            int: Number of hashes that were new
+        """
+        with self._lock:
+            hashes = np.unique(np.asarray(hashes, dtype=np.uint64))
+            new = hashes[~self.contains(hashes)]
+            if len(new):
+                tmp_path = self.path + ".tmp"
+                self._write_merged(new, tmp_path)
+                # Drop our mmap of the old file before replacing it (required
+                # on Windows); reopen whichever file is in place afterwards
+                self._hashes = None
+                try:
+                    os.replace(tmp_path, self.path)
+                finally:
+                    self._hashes = self._open()
+            # Release the reservations only once the lines are recorded
+            self._pending = np.setdiff1d(self._pending, hashes, assume_unique=True)
+            return len(new)
+
+    def _write_merged(self, new, tmp_path):
+        """Write the index merged with the sorted, unseen hashes in new to tmp_path."""
+        base = self._hashes
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint64, shape=(len(base) + len(new),))
+        out_pos = 0
+        new_pos = 0
+        for start in range(0, len(base), MERGE_CHUNK):
+            # Copy the block: a slice would keep the old file mapped after we return
+            block = np.array(base[start:start + MERGE_CHUNK])
+            last_block = start + MERGE_CHUNK >= len(base)
+            new_end = len(new) if last_block else int(np.searchsorted(new, block[-1]))
+            merged = np.concatenate([block, new[new_pos:new_end]])
+            merged.sort()
+            out[out_pos:out_pos + len(merged)] = merged
+            out_pos += len(merged)
+            new_pos = new_end
+        out[out_pos:] = new[new_pos:]
+        out.flush()
+        del out
+
+    def filter_new(self, df, own=None):
+        """
+        Split off lines seen in earlier captures or reserved by one in progress.
+
+        Args:
+            df (DataFrame): Capture (or one chunk of it)
+            own (array, optional): Hashes already reserved by earlier chunks of
+                the same capture; those lines are not treated as seen
+
+        Returns:
+            tuple: (DataFrame of unseen lines, their hashes); pass the hashes
+            to add() once the capture has been processed successfully, or to
+            release() if it failed
+        """
+        hashes = line_hashes(df)
+        with self._lock:
+            reserved = np.isin(hashes, self._pending)
+            if own is not None and len(own):
+                reserved &= ~np.isin(hashes, own)
+            seen = self.contains(hashes) | reserved
+            new_hashes = hashes[~seen]
+            self._pending = np.union1d(self._pending, new_hashes)
+        return df[~seen], new_hashes
+
+    def release(self, hashes):
+        """Drop the reservation on hashes from filter_new() without recording them."""
+        with self._lock:
+            self._pending = np.setdiff1d(self._pending, np.unique(np.asarray(hashes, dtype=np.uint64)),
+                                         assume_unique=True)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_line_index(path):
+    """Return the shared process-wide LineDedupIndex for path."""
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = LineDedupIndex(path)
+        return _indexes[path]
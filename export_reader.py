@@ -0,0 +1,168 @@
+"""
+export_reader.py - Captured Export Reader
+Reads captured xlsx/csv exports with column projection, explicit dtypes
+and categorical string columns, using the calamine engine when it is
+installed and openpyxl otherwise.
+
+iter_export_chunks() streams an export in row chunks instead, for exports
+too large to hold in memory.
+"""
+
+import math
+import pandas as pd
+
+# Columns the processed reports actually need from the ERP export
+REPORT_COLUMNS = ["Item ID", "Account Name", "Invoice Number", "Sale Price", "Unit Cost"]
+
+# Extra columns needed for quantity-weighted profit (aggregation.py)
+QUANTITY_COLUMNS = ["Sale Quantity", "RT Quantity"]
+
+# Explicit dtypes so nothing is inferred per cell
+EXPORT_DTYPES = {
+    "Item ID": str,
+    "Invoice Number": str,
+    "Acctid": str,
+    "Zipcode": str,
+    "Sale Price": "float64",
+    "Unit Cost": "float64",
+    "Unit Price": "float64",
+    "Order Quantity": "float64",
+    "Sale Quantity": "float64",
+    "RT Quantity": "float64",
+}
+
+# Repetitive string columns held as pandas Categoricals: far less memory
+# than one Python string per row, and groupby works on integer codes
+CATEGORICAL_COLUMNS = ["Account Name", "Salesman", "City", "State", "Item Status"]
+
+
+def _calamine_available():
+    """True if python-calamine is installed and pandas (2.2+) has the calamine engine."""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    major, minor = (int(part) for part in pd.__version__.split(".")[:2])
+    return (major, minor) >= (2, 2)
+
+
+def _projection(usecols):
+    # A callable tolerates exports that are missing an optional column
+    if usecols is None:
+        return None
+    wanted = set(usecols)
+    return lambda column: column in wanted
+
+
+def normalize_categoricals(df):
+    """Convert the CATEGORICAL_COLUMNS present in df to category dtype."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def read_export(filepath, usecols=REPORT_COLUMNS, engine="auto"):
+    """
+    Read a captured export.
+
+    Args:
+        filepath (str): xlsx or csv export
+        usecols (list, optional): Columns to keep; None reads every column
+        engine (str): "auto" or "calamine" (calamine where available, else
+            openpyxl) or "openpyxl". Ignored for csv.
+
+    Returns:
+        DataFrame: The export's rows
+    """
+    projection = _projection(usecols)
+    dtypes = EXPORT_DTYPES if usecols is None else {c: t for c, t in EXPORT_DTYPES.items() if c in usecols}
+
+    if filepath.lower().endswith(".csv"):
+        return normalize_categoricals(pd.read_csv(filepath, usecols=projection, dtype=dtypes))
+
+    # Only the engine's availability decides the fallback; errors in the data
+    # (e.g. text in Sale Price) are raised from the first parse
+    if engine in ("auto", "calamine"):
+        engine = "calamine" if _calamine_available() else "openpyxl"
+
+    df = pd.read_excel(filepath, usecols=projection, dtype=dtypes, engine=engine)
+    return normalize_categoricals(df)
+
+
+def _cell_text(value):
+    # Match read_excel(dtype=str): whole floats lose their ".0", blanks stay NaN
+    if value is None:
+        return math.nan
+    if isinstance(value, float):
+        if math.isnan(value):
+            return value
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def _iter_xlsx_chunks(filepath, usecols, dtypes, chunk_rows):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+        keep = [i for i, c in enumerate(header) if usecols is None or c in usecols]
+        columns = [header[i] for i in keep]
+
+        def to_frame(batch):
+            df = pd.DataFrame(batch, columns=columns)
+            for column, dtype in dtypes.items():
+                if column not in df.columns:
+                    continue
+                if dtype is str:
+                    df[column] = df[column].map(_cell_text)
+                else:
+                    df[column] = pd.to_numeric(df[column]).astype(dtype)
+            return normalize_categoricals(df)
+
+        batch = []
+        for row in rows:
+            if not any(v is not None for v in row):
+                continue  # read_excel skips fully blank rows
+            batch.append([row[i] if i < len(row) else None for i in keep])
+            if len(batch) == chunk_rows:
+                yield to_frame(batch)
+                batch = []
+        if batch:
+            yield to_frame(batch)
+    finally:
+        workbook.close()
+
+
+def iter_export_chunks(filepath, usecols=REPORT_COLUMNS, chunk_rows=100_000):
+    """
+    Read a captured export as a sequence of row chunks.
+
+    CSV is read with pandas' chunked reader; xlsx with openpyxl's read-only
+    row iterator. Columns and dtypes match read_export(), so each chunk
+    looks like a slice of what read_export() would return.
+
+    Args:
+        filepath (str): xlsx or csv export
+        usecols (list, optional): Columns to keep; None reads every column
+        chunk_rows (int): Rows per chunk
+
+    Yields:
+        DataFrame: Up to chunk_rows rows of the export
+    """
+    dtypes = EXPORT_DTYPES if usecols is None else {c: t for c, t in EXPORT_DTYPES.items() if c in usecols}
+
+    if filepath.lower().endswith(".csv"):
+        reader = pd.read_csv(filepath, usecols=_projection(usecols), dtype=dtypes, chunksize=chunk_rows)
+        with reader:
+            for chunk in reader:
+                yield normalize_categoricals(chunk)
+        return
+
+    yield from _iter_xlsx_chunks(filepath, None if usecols is None else set(usecols), dtypes, chunk_rows)
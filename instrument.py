@@ -0,0 +1,186 @@
+"""
+instrument.py - Per-Stage Timing and Memory Instrumentation
+Wrap pipeline stages in span("name") to record wall time, CPU time and
+RSS change. Records are written as JSON lines to a log file and can be
+summarized at the end of each capture run.
+
+Disabled by default: span() then returns a shared no-op context manager,
+so instrumented code costs one function call and a flag check.
+
+Runs may overlap when captures are processed in the background
+(pipeline.py): a worker thread calls bind_run() with the capture's run id
+so its spans are attributed to the right run. CPU time is per thread
+(time.thread_time), so a span only counts its own thread's work; RSS is
+process-wide, so while runs overlap rss_delta_mb includes the other
+threads' allocations too and is only indicative.
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from collections import deque
+from datetime import datetime
+
+MAX_RECORDS = 10000  # span records kept in memory for summarize()
+
+_enabled = False
+_log_path = None
+_run_id = None
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _rss_bytes():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def set(self, **fields):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        """Attach extra values known only inside the span (e.g. row counts)."""
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.run_id = current_run()
+        self.rss_start = _rss_bytes()
+        self.cpu_start = time.thread_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.thread_time() - self.cpu_start
+        rss_end = _rss_bytes()
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "run": self.run_id,
+            "stage": self.name,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "rss_delta_mb": None if rss_end is None else round((rss_end - self.rss_start) / 1e6, 3),
+            "ok": exc_type is None,
+        }
+        record.update(self.fields)
+        _emit(record)
+        return False
+
+
+def _emit(record):
+    with _lock:
+        _records.append(record)
+        if _log_path:
+            with open(_log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+def configure(log_path=None, enabled=True):
+    """
+    Turn instrumentation on or off.
+
+    Args:
+        log_path (str, optional): JSON-lines file to append span records to
+        enabled (bool): Whether span() records anything
+    """
+    global _enabled, _log_path
+    _enabled = enabled
+    _log_path = log_path
+    if log_path:
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+
+
+def is_enabled():
+    return _enabled
+
+
+def span(name, **fields):
+    """
+    Context manager timing one stage.
+
+    Args:
+        name (str): Stage name (detect, foreground, dde_save, read, ...)
+        **fields: Extra values to store with the record (e.g. rows=...)
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, fields)
+
+
+def start_run():
+    """Begin a new capture run; later spans on this thread are tagged with its id."""
+    global _run_id
+    run_id = uuid.uuid4().hex[:8]
+    with _lock:
+        _run_id = run_id
+    _local.run_id = run_id
+    return run_id
+
+
+def bind_run(run_id):
+    """Tag spans on the calling thread with run_id (e.g. in a pipeline worker)."""
+    _local.run_id = run_id
+
+
+def current_run():
+    """Run id for spans on this thread: its bound run, else the latest run."""
+    return getattr(_local, "run_id", None) or _run_id
+
+
+def summarize(verbose=True, run_id=None):
+    """
+    Summarize one run's spans by stage.
+
+    Args:
+        verbose (bool): Whether to print the summary
+        run_id (str, optional): Run to summarize (defaults to current_run())
+
+    Returns:
+        list: (stage, total wall s, total cpu s, rss delta MB) in first-seen order
+    """
+    if not _enabled:
+        return []
+
+    run_id = run_id or current_run()
+    with _lock:
+        records = [record for record in _records if record["run"] == run_id]
+
+    totals = {}
+    for record in records:
+        wall, cpu, rss = totals.get(record["stage"], (0.0, 0.0, 0.0))
+        totals[record["stage"]] = (
+            wall + record["wall_s"],
+            cpu + record["cpu_s"],
+            rss + (record["rss_delta_mb"] or 0.0),
+        )
+    summary = [(stage,) + values for stage, values in totals.items()]
+
+    if verbose and summary:
+        total_wall = sum(row[1] for row in summary)
+        print(f"⏱️ Stage timings (run {run_id}):")
+        for stage, wall, cpu, rss in summary:
+            print(f"   {stage:<12} {wall * 1000:>9.1f} ms wall {cpu * 1000:>9.1f} ms cpu {rss:>+8.1f} MB")
+        print(f"   {'total':<12} {total_wall * 1000:>9.1f} ms")
+    return summary
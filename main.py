@@ -1,62 +1,382 @@
 """
 Updated Main Processing Code
 Now uses autosaver.py module for reliable Book1 capture
+
+Only the light capture/watch modules load at startup. pandas, numpy and the
+report modules are imported by a background thread while the watcher is
+already scanning (or on first use), so the first scan never waits for them.
 """
 
 import os
 import time
-import pandas as pd
-from autosaver import capture_book1, is_book1_available
+import importlib
+import threading
+from datetime import date, datetime
+from capture_backends import create_capture_backend
+from report_writer import get_writer, report_path
+from window_watcher import create_window_watcher
+from pipeline import ProcessingPipeline
+from dde_session import close_dde_session
+import instrument
+from instrument import span
 
 # Configuration
 SAVE_FOLDER = r"C:\Users\sasuk\Documents\CapturedExports"
 PROCESSED_FOLDER = r"C:\Users\sasuk\Documents\ProcessedExports"
 
-# Ensure directories exist
-os.makedirs(SAVE_FOLDER, exist_ok=True)
-os.makedirs(PROCESSED_FOLDER, exist_ok=True)
+# Where exports come from: "dde" (unsaved Book1 in Excel) or "folder" (files dropped into DROP_FOLDER)
+CAPTURE_BACKEND = "dde"
+DROP_FOLDER = r"C:\Users\sasuk\Documents\ExportDrop"
+
+# Capture every waiting export in one sweep (every unsaved BookN window for "dde").
+# Off by default: with "dde" it also saves any blank BookN the operator is still
+# typing in, so only turn it on when every new workbook is an ERP export.
+# False captures one export (Book1 only for "dde") per wake-up.
+CAPTURE_ALL_BOOKS = False
+
+# Report output backend: "xlsx" (streaming), "openpyxl" (legacy to_excel), "csv" or "parquet"
+REPORT_WRITER = "xlsx"
+
+# "workbook": all reports as sheets of one processed_<name>.xlsx (opens one file)
+# "separate": processed_ver-id_/-br_/-brcat_ files, one per report
+OUTPUT_MODE = "workbook"
+INCLUDE_RAW_SHEET = False  # Add the brand-enriched rows as an extra sheet
+
+# Open each capture's processed reports afterwards: True, False, or None to open
+# them only for the "dde" backend (someone is at the Excel desktop). Never on
+# systems without os.startfile (anything but Windows).
+OPEN_REPORTS = None
+
+# "unit": sum Sale Price / Unit Cost once per line (original figures)
+# "quantity": extended revenue and cost, price x (Sale Quantity - RT Quantity)
+PROFIT_WEIGHTING = "unit"
+
+# Read exports in chunks of this many rows (e.g. 200_000) so memory stays bounded
+# however large the export is; None reads the whole export at once. Reports are
+# identical either way; the raw sheet and Parquet archive need the whole export.
+STREAM_CHUNK_ROWS = None
+
+# Rolling per-invoice totals across captures (query with aggregate_store.py),
+# e.g. os.path.join(PROCESSED_FOLDER, "rolling_totals.sqlite"); None to disable
+AGGREGATE_STORE_PATH = None
+
+# Drop lines (Invoice/Item/Ship Date/Acctid) already counted by an earlier capture,
+# e.g. os.path.join(PROCESSED_FOLDER, "seen_lines.npy"); None counts every line
+DEDUPE_INDEX_PATH = None
+
+# Parquet dataset of every capture's enriched rows, partitioned by Ship Date month,
+# e.g. os.path.join(PROCESSED_FOLDER, "archive"); None to skip (needs pyarrow)
+PARQUET_ARCHIVE_PATH = None
+
+# JSON-lines log of per-stage timings (wall/CPU/RSS) for each capture run; None disables it
+INSTRUMENTATION_LOG = None
+
+# Background threads that transform captures while the loop watches for the next
+# Book1 (0 processes each capture inline), and how many captures may wait for one
+PROCESS_WORKERS = 2
+PROCESS_QUEUE_SIZE = 4
+
+RETRY_DELAY = 5             # Seconds to back off after a failed capture or error
+WAIT_STATUS_INTERVAL = 60   # Seconds between "still waiting" checkpoints
+
+# Imported by the background preload; optional ones are skipped if missing
+PRELOAD_MODULES = [
+    "numpy", "pandas",
+    "brand_cache", "export_reader", "aggregation",
+    "aggregate_store", "dedupe_index", "parquet_archive",
+]
+OPTIONAL_PRELOAD_MODULES = ["python_calamine", "openpyxl", "xlsxwriter"]
 
-def transform_excel_file(filepath):
+def preload_processing(verbose=True):
+    """Import pandas and the report modules and load the brand map."""
+    start = time.perf_counter()
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+    for name in OPTIONAL_PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    from brand_cache import get_brand_map_cache
+    get_brand_map_cache().get()
+    if verbose:
+        print(f"📦 Processing modules ready ({time.perf_counter() - start:.2f}s)")
+
+def start_background_preload(verbose=True):
+    """Run preload_processing() on a daemon thread; returns the thread."""
+    def _run():
+        try:
+            preload_processing(verbose)
+        except Exception as e:
+            # The first capture will import (and report) whatever failed here
+            print(f"⚠️ Background preload failed: {e}")
+
+    thread = threading.Thread(target=_run, name="preload", daemon=True)
+    thread.start()
+    return thread
+
+def planned_report_paths(filepath, processed_folder):
+    """Return the processed file paths an export will produce under the current settings."""
+    writer = get_writer(REPORT_WRITER)
+    if OUTPUT_MODE == "workbook" and writer.supports_sheets:
+        return [report_path(processed_folder, "processed_", filepath, writer)]
+    return [
+        report_path(processed_folder, "processed_ver-id_", filepath, writer),
+        report_path(processed_folder, "processed_ver-br_", filepath, writer),
+        report_path(processed_folder, "processed_ver-brcat_", filepath, writer),
+    ]
+
+def write_reports(reports, report_df, processed_paths, verbose=True):
+    """Write the reports to processed_paths (one workbook, or one file per report)."""
+    writer = get_writer(REPORT_WRITER)
+    grouped_df_id = reports["id"]
+    grouped_df_br = reports["br"]
+    grouped_df_brcat = reports["brcat"]
+
+    if len(processed_paths) == 1:
+        # One workbook, one streaming write, one Excel launch
+        sheets = {
+            "By Account": grouped_df_id,
+            "By Brand": grouped_df_br,
+            "By Brand-Category": grouped_df_brcat,
+        }
+        if INCLUDE_RAW_SHEET:
+            sheets["Enriched Rows"] = report_df
+
+        processed_path = processed_paths[0]
+        writer.write_book(sheets, processed_path)
+
+        if verbose:
+            print(f"✅ Transformed and saved:")
+            print(f"   📊 Report Workbook: {os.path.basename(processed_path)}")
+            print(f"      Sheets: {', '.join(sheets)}")
+    else:
+        processed_path_id, processed_path_br, processed_path_brcat = processed_paths
+
+        # Save processed files
+        writer.write(grouped_df_id, processed_path_id)
+        writer.write(grouped_df_br, processed_path_br)
+        writer.write(grouped_df_brcat, processed_path_brcat)
+
+        if verbose:
+            print(f"✅ Transformed and saved:")
+            print(f"   📊 ID Report: {os.path.basename(processed_path_id)}")
+            print(f"   📊 Brand Report: {os.path.basename(processed_path_br)}")
+            print(f"   📊 Brand-Category Report: {os.path.basename(processed_path_brcat)}")
+
+def report_read_columns():
+    """Columns the reports, dedupe index and rolling store need from an export."""
+    from export_reader import QUANTITY_COLUMNS, REPORT_COLUMNS
+    from dedupe_index import LINE_KEY_COLUMNS
+
+    usecols = REPORT_COLUMNS + LINE_KEY_COLUMNS
+    if PROFIT_WEIGHTING == "quantity":
+        usecols = usecols + QUANTITY_COLUMNS
+    return usecols
+
+def remember_lines(line_index, hashes, verbose=True):
+    """
+    Record a written capture's lines in the dedupe index.
+
+    The reports already exist, so a failure to persist the index (e.g. the
+    file locked by a virus scanner) is reported, not raised; the lines stay
+    reserved, so later captures in this session still skip them.
+    """
+    try:
+        line_index.add(hashes)
+    except OSError as e:
+        if verbose:
+            print(f"   ⚠️ Could not update the dedupe index: {e}")
+
+def process_export(filepath, processed_folder, verbose=True):
+    """
+    Read, enrich, aggregate and write the reports for one captured export.
+
+    Args:
+        filepath (str): Captured xlsx/csv export
+        processed_folder (str): Directory for the processed reports
+        verbose (bool): Whether to print what was written
+
+    Returns:
+        tuple: (list of processed file paths, number of export rows)
+    """
+    if STREAM_CHUNK_ROWS:
+        return process_export_streaming(filepath, processed_folder, verbose)
+
+    from brand_cache import get_brand_map_cache
+    from export_reader import read_export
+    from aggregation import add_brand_category, build_reports
+    from dedupe_index import get_line_index
+    from parquet_archive import archive_capture
+    from aggregate_store import AggregateStore
+
+    os.makedirs(processed_folder, exist_ok=True)
+
+    read_all = INCLUDE_RAW_SHEET or PARQUET_ARCHIVE_PATH
+    usecols = report_read_columns()
+    with span("read", file=os.path.basename(filepath)) as read_span:
+        captured_df = read_export(filepath, usecols=None if read_all else usecols)
+        read_span.set(rows=len(captured_df))
+    with span("merge"):
+        df = get_brand_map_cache().enrich(captured_df)
+        add_brand_category(df)
+
+    # Drop lines an earlier (overlapping) capture already counted
+    report_df = df
+    new_line_hashes = None
+    if DEDUPE_INDEX_PATH:
+        line_index = get_line_index(DEDUPE_INDEX_PATH)
+        with span("dedupe"):
+            report_df, new_line_hashes = line_index.filter_new(df)
+        if verbose and len(report_df) < len(df):
+            print(f"   🔁 Skipped {len(df) - len(report_df)} lines already counted in earlier captures")
+
+    try:
+        # Create processed reports (all three in one aggregation pass)
+        with span("aggregate"):
+            reports = build_reports(report_df, weighting=PROFIT_WEIGHTING)
+
+        processed_paths = planned_report_paths(filepath, processed_folder)
+        with span("write", reports=len(processed_paths)):
+            write_reports(reports, report_df, processed_paths, verbose)
+    except Exception:
+        # Let a later capture count these lines
+        if new_line_hashes is not None:
+            line_index.release(new_line_hashes)
+        raise
+
+    # Remember these lines only once their reports are safely written
+    if new_line_hashes is not None:
+        remember_lines(line_index, new_line_hashes, verbose)
+
+    # Archive the enriched rows for fast historical queries (parquet_archive.py)
+    if PARQUET_ARCHIVE_PATH:
+        capture_name = os.path.splitext(os.path.basename(filepath))[0]
+        captured_at = datetime.fromtimestamp(os.path.getmtime(filepath))
+        with span("archive"):
+            archived = archive_capture(df, PARQUET_ARCHIVE_PATH, capture_name, captured_at)
+        if verbose:
+            print(f"   🗄️ Archived to {len(archived)} Parquet partition(s)")
+
+    # Fold this capture into the rolling totals (its capture date decides which
+    # version of a re-exported invoice is kept; reports select by Ship Date)
+    if AGGREGATE_STORE_PATH and "Invoice Number" in df.columns:
+        os.makedirs(os.path.dirname(AGGREGATE_STORE_PATH) or ".", exist_ok=True)
+        capture_date = date.fromtimestamp(os.path.getmtime(filepath))
+        with span("store"), AggregateStore(AGGREGATE_STORE_PATH) as store:
+            store.append_capture(df, capture_date, weighting=PROFIT_WEIGHTING)
+        if verbose:
+            print(f"   🗃️ Rolling totals updated ({capture_date.isoformat()})")
+
+    return processed_paths, len(captured_df)
+
+def process_export_streaming(filepath, processed_folder, verbose=True):
+    """
+    process_export() for exports too large to hold in memory.
+
+    Reads STREAM_CHUNK_ROWS rows at a time, enriches each chunk and folds it
+    into running per-key sums (and per-invoice partial sums for the rolling
+    store), so memory depends on the number of distinct keys, not rows.
+
+    Returns:
+        tuple: (list of processed file paths, number of export rows)
+    """
+    if INCLUDE_RAW_SHEET or PARQUET_ARCHIVE_PATH:
+        raise ValueError("INCLUDE_RAW_SHEET and PARQUET_ARCHIVE_PATH need the whole export; "
+                         "turn them off or set STREAM_CHUNK_ROWS = None")
+
+    import numpy as np
+    from brand_cache import get_brand_map_cache
+    from export_reader import iter_export_chunks
+    from aggregation import ReportAccumulator, add_brand_category
+    from dedupe_index import get_line_index
+    from aggregate_store import AggregateStore, combine_partials, partial_sums
+
+    os.makedirs(processed_folder, exist_ok=True)
+
+    accumulator = ReportAccumulator(weighting=PROFIT_WEIGHTING)
+    store_partials = []
+    line_index = get_line_index(DEDUPE_INDEX_PATH) if DEDUPE_INDEX_PATH else None
+    new_line_hashes = np.empty(0, dtype=np.uint64)
+    rows = 0
+    skipped = 0
+
+    chunks = iter_export_chunks(filepath, report_read_columns(), STREAM_CHUNK_ROWS)
+    try:
+        while True:
+            with span("read", file=os.path.basename(filepath)) as read_span:
+                chunk = next(chunks, None)
+                read_span.set(rows=0 if chunk is None else len(chunk))
+            if chunk is None:
+                break
+            rows += len(chunk)
+            with span("merge"):
+                df = get_brand_map_cache().enrich(chunk)
+                add_brand_category(df)
+
+            report_df = df
+            if line_index is not None:
+                with span("dedupe"):
+                    report_df, chunk_hashes = line_index.filter_new(df, own=new_line_hashes)
+                new_line_hashes = np.union1d(new_line_hashes, chunk_hashes)
+                skipped += len(df) - len(report_df)
+
+            with span("aggregate"):
+                accumulator.add(report_df)
+                if AGGREGATE_STORE_PATH and "Invoice Number" in df.columns:
+                    # Re-combine as we go so the partials stay one row per invoice key
+                    store_partials = [combine_partials(store_partials + [partial_sums(df, PROFIT_WEIGHTING)])]
+
+        if verbose and skipped:
+            print(f"   🔁 Skipped {skipped} lines already counted in earlier captures")
+
+        processed_paths = planned_report_paths(filepath, processed_folder)
+        with span("write", reports=len(processed_paths)):
+            write_reports(accumulator.reports(), None, processed_paths, verbose)
+    except Exception:
+        if line_index is not None:
+            line_index.release(new_line_hashes)
+        raise
+
+    if line_index is not None:
+        remember_lines(line_index, new_line_hashes, verbose)
+
+    if store_partials:
+        os.makedirs(os.path.dirname(AGGREGATE_STORE_PATH) or ".", exist_ok=True)
+        capture_date = date.fromtimestamp(os.path.getmtime(filepath))
+        with span("store"), AggregateStore(AGGREGATE_STORE_PATH) as store:
+            store.append_partials(store_partials[0], capture_date)
+        if verbose:
+            print(f"   🗃️ Rolling totals updated ({capture_date.isoformat()})")
+
+    return processed_paths, rows
+
+def transform_excel_file(filepath, processed_folder=None, open_reports=True):
     """
     Transform captured Excel file into processed reports.
-    (Your existing processing logic - unchanged)
+
+    Delegates to process_export() (or its chunked form when STREAM_CHUNK_ROWS
+    is set): read the export, enrich it from the brand map, drop lines already
+    counted (DEDUPE_INDEX_PATH), aggregate every report in one pass, write them
+    with REPORT_WRITER, then archive and update the rolling store if enabled.
+    Opens the processed files afterwards and reports errors instead of raising.
+
+    Args:
+        filepath (str): Captured xlsx/csv export
+        processed_folder (str, optional): Defaults to PROCESSED_FOLDER
+        open_reports (bool): Open the processed files in Excel afterwards
+            (skipped where os.startfile doesn't exist)
+
+    Returns:
+        bool: True on success, False on failure
     """
     try:
-        captured_df = pd.read_excel(filepath, dtype={"Item ID": str})
-        brand_map_df = pd.read_csv("brand_map.csv", dtype={"Item ID": str})
-        df = captured_df.merge(brand_map_df, on="Item ID", how="left")
-        df_by_cat = df.dropna(subset=["CATEGORY"]).copy()
-        df_by_cat["Brand : Category"] = df["Brand"].astype(str) + " : " + df["CATEGORY"].astype(str)
-        df_by_cat = df_by_cat.sort_values(by="Item ID")
-
-        # Create processed reports
-        grouped_df_id = calc_profit_percentage_accname(df, 0)
-        grouped_df_br = calc_profit_percentage_brand(df, 0)
-        grouped_df_brcat = calc_profit_percentage_brand(df_by_cat, 1)
-
-        # Generate output filenames
-        processed_filename_id = "processed_ver-id_" + os.path.basename(filepath) 
-        processed_filename_br = "processed_ver-br_" + os.path.basename(filepath) 
-        processed_filename_brcat = "processed_ver-brcat_" + os.path.basename(filepath) 
-        
-        processed_path_id = os.path.join(PROCESSED_FOLDER, processed_filename_id)
-        processed_path_br = os.path.join(PROCESSED_FOLDER, processed_filename_br)
-        processed_path_brcat = os.path.join(PROCESSED_FOLDER, processed_filename_brcat)
-        
-        # Save processed files
-        grouped_df_id.to_excel(processed_path_id, index=False)
-        grouped_df_br.to_excel(processed_path_br, index=False)
-        grouped_df_brcat.to_excel(processed_path_brcat, index=False)
-
-        print(f"✅ Transformed and saved:")
-        print(f"   📊 ID Report: {os.path.basename(processed_path_id)}")
-        print(f"   📊 Brand Report: {os.path.basename(processed_path_br)}")
-        print(f"   📊 Brand-Category Report: {os.path.basename(processed_path_brcat)}")
-        
+        processed_paths, _ = process_export(filepath, processed_folder or PROCESSED_FOLDER)
+
         # Open processed files
-        os.startfile(processed_path_id)
-        os.startfile(processed_path_br)
-        os.startfile(processed_path_brcat)
+        if open_reports:
+            open_processed_reports(processed_paths)
 
         return True
         
@@ -64,95 +384,169 @@ def transform_excel_file(filepath):
         print(f"⚠️ Error during processing: {e}")
         return False
 
-def calc_profit_percentage_accname(df, vernum):
+def _build_report(df, name, weighting):
+    from aggregation import REPORT_SPECS, build_reports
+
+    spec = next(spec for spec in REPORT_SPECS if spec.name == name)
+    return build_reports(df, [spec], weighting)[name]
+
+def calc_profit_percentage_accname(df, vernum, weighting="unit"):
     """Calculate profit percentage by account name."""
     if vernum == 0:
-        grouped_df = df.groupby("Account Name", as_index=False).agg({
-            "Sale Price": "sum",
-            "Unit Cost": "sum",
-        })
-        grouped_df["Profit %"] = ((grouped_df["Sale Price"] - grouped_df["Unit Cost"]) / grouped_df["Sale Price"]) * 100
-        grouped_df["Profit %"] = grouped_df["Profit %"].round(2).astype(str) + "%"
-        grouped_df.rename(columns={"Sale Price": "Agg Sale Price", "Unit Cost": "Agg Unit Cost"}, inplace=True)
-        return grouped_df
-
-def calc_profit_percentage_brand(df, vernum):
+        return _build_report(df, "id", weighting)
+
+def calc_profit_percentage_brand(df, vernum, weighting="unit"):
     """Calculate profit percentage by brand or brand-category."""
     if vernum == 0:
-        grouped_df = df.groupby("Brand", as_index=False).agg({
-            "Sale Price": "sum",
-            "Unit Cost": "sum",
-        })
-        grouped_df["Profit %"] = ((grouped_df["Sale Price"] - grouped_df["Unit Cost"]) / grouped_df["Sale Price"]) * 100
-        grouped_df["Profit %"] = grouped_df["Profit %"].round(2).astype(str) + "%"
-        grouped_df.rename(columns={"Sale Price": "Agg Sale Price", "Unit Cost": "Agg Unit Cost"}, inplace=True)
-        return grouped_df
-    
+        return _build_report(df, "br", weighting)
+
     if vernum == 1:
-        grouped_df = df.groupby("Brand : Category", as_index=False).agg({
-            "Sale Price": "sum",
-            "Unit Cost": "sum",
-        })
-        grouped_df["Profit %"] = ((grouped_df["Sale Price"] - grouped_df["Unit Cost"]) / grouped_df["Sale Price"]) * 100
-        grouped_df["Profit %"] = grouped_df["Profit %"].round(2).astype(str) + "%"
-        grouped_df.rename(columns={"Sale Price": "Agg Sale Price", "Unit Cost": "Agg Unit Cost"}, inplace=True)
-        return grouped_df
-
-def auto_capture_and_transform():
+        return _build_report(df, "brcat", weighting)
+
+def reports_should_open(backend):
+    """Whether processed reports are opened for captures from backend (see OPEN_REPORTS)."""
+    if not hasattr(os, "startfile"):
+        return False
+    if OPEN_REPORTS is None:
+        return backend.name == "dde"
+    return bool(OPEN_REPORTS)
+
+def open_processed_reports(processed_paths):
+    """Open the processed files in their default application (Windows only)."""
+    if not hasattr(os, "startfile"):
+        return
+    with span("open"):
+        for processed_path in processed_paths:
+            os.startfile(processed_path)
+
+def _process_in_background(filepath):
+    # Runs on a pipeline worker; output is printed in order by _report_completion
+    return process_export(filepath, PROCESSED_FOLDER, verbose=False)
+
+def _report_completion(result, open_reports=True):
+    """Log one finished capture and open its reports (called in capture order)."""
+    instrument.bind_run(result.run_id)
+    name = os.path.basename(result.path)
+    if result.error is not None:
+        print(f"❌ Processing failed for {name}: {result.error}")
+    else:
+        processed_paths, rows = result.value
+        print(f"✅ Processed {name}: {rows:,} rows in {result.elapsed_s:.2f}s (queued {result.waited_s:.2f}s)")
+        for processed_path in processed_paths:
+            print(f"   📊 {os.path.basename(processed_path)}")
+        if open_reports:
+            open_processed_reports(processed_paths)
+    instrument.summarize(run_id=result.run_id)
+
+def auto_capture_and_transform(watcher=None, backend=None):
     """
     Main automation loop - continuously monitor for Book1 and process it.
     Now uses reliable autosaver.py module instead of problematic COM approach.
+
+    Args:
+        watcher (WindowWatcher, optional): Source of Book1 wake-ups. Defaults
+            to WinEvent hooks on Windows, adaptive polling elsewhere.
+        backend (CaptureBackend, optional): Where exports come from. Defaults
+            to CAPTURE_BACKEND.
     """
+    # What the loop is waiting for, for the status messages
+    target = "unsaved workbook" if CAPTURE_ALL_BOOKS else "Book1"
+
     print("🚀 Excel Automation with Reliable Auto-Saver")
-    print("👀 Monitoring for Book1 exports...")
+    print(f"👀 Monitoring for {target} exports...")
     print("   (Press Ctrl+C to stop)")
-    
+
+    # Import pandas and load the brand map while the watcher is already scanning,
+    # so neither the first scan nor the first capture waits for them
+    start_background_preload()
+
+    if INSTRUMENTATION_LOG:
+        instrument.configure(INSTRUMENTATION_LOG)
+
+    if backend is None:
+        backend = create_capture_backend(CAPTURE_BACKEND, DROP_FOLDER, CAPTURE_ALL_BOOKS)
+    if watcher is None:
+        watcher = create_window_watcher(backend.detect, prefer_events=backend.supports_window_events)
+
+    open_reports = reports_should_open(backend)
+
+    # Transform in the background so a slow write never delays the next capture
+    pipeline = None
+    if PROCESS_WORKERS > 0:
+        pipeline = ProcessingPipeline(
+            _process_in_background, PROCESS_WORKERS, PROCESS_QUEUE_SIZE,
+            on_complete=lambda result: _report_completion(result, open_reports),
+        )
+
+    def queue_capture(saved_file):
+        print(f"📁 File captured: {os.path.basename(saved_file)}")
+
+        # Blocks while the queue is full, so captures can't outrun processing
+        pipeline.submit(saved_file)
+        print(f"🔄 Queued for transformation ({pipeline.pending} in progress)")
+
+        # The next capture in this sweep gets its own run
+        instrument.start_run()
+
     last_check_failed = False
     
     while True:
         try:
-            # Check if Book1 is available using autosaver module
-            if is_book1_available():
-                print("\n📄 Book1 detected! Starting capture...")
+            # Block until Book1 shows up (or the status interval passes)
+            if watcher.wait(timeout=WAIT_STATUS_INTERVAL):
+                print(f"\n📄 {target.capitalize()} detected! Starting capture...")
+                instrument.start_run()
                 
-                # Capture using autosaver module
-                saved_file = capture_book1(SAVE_FOLDER, verbose=True)
+                # Capture using the configured backend; with a pipeline each export
+                # starts transforming while the rest of the sweep is still captured
+                on_captured = queue_capture if pipeline is not None else None
+                if CAPTURE_ALL_BOOKS:
+                    saved_files = backend.capture_all(SAVE_FOLDER, on_captured, verbose=True)
+                else:
+                    saved_file = backend.capture(SAVE_FOLDER, verbose=True)
+                    saved_files = [saved_file] if saved_file else []
+                    if saved_file and on_captured is not None:
+                        on_captured(saved_file)
                 
-                if saved_file:
-                    print(f"📁 File captured: {os.path.basename(saved_file)}")
-                    
-                    # Process the captured file
-                    print("🔄 Starting data transformation...")
-                    success = transform_excel_file(saved_file)
-                    
-                    if success:
-                        print("✅ Processing completed successfully!")
-                        print("📊 Processed reports opened automatically")
+                if saved_files and pipeline is not None:
+                    print(f"👀 Monitoring for next {target} export...")
+
+                elif saved_files:
+                    for saved_file in saved_files:
+                        print(f"📁 File captured: {os.path.basename(saved_file)}")
                         
-                        # Optional: Clean up captured file after processing
-                        # os.remove(saved_file)
-                        # print(f"🗑️ Cleaned up captured file")
+                        # Process the captured file
+                        print("🔄 Starting data transformation...")
+                        success = transform_excel_file(saved_file, open_reports=open_reports)
                         
-                    else:
-                        print("❌ Processing failed - check error messages above")
+                        if success:
+                            print("✅ Processing completed successfully!")
+                            if open_reports:
+                                print("📊 Processed reports opened automatically")
+                            
+                            # Optional: Clean up captured file after processing
+                            # os.remove(saved_file)
+                            # print(f"🗑️ Cleaned up captured file")
+                            
+                        else:
+                            print("❌ Processing failed - check error messages above")
                     
+                    instrument.summarize()
                     print("\n" + "─" * 50)
-                    print("👀 Monitoring for next Book1 export...")
+                    print(f"👀 Monitoring for next {target} export...")
                     
                 else:
-                    print("❌ Failed to capture Book1 - will retry in 5 seconds")
+                    print(f"❌ Failed to capture {target} - will retry in {RETRY_DELAY} seconds")
+                    time.sleep(RETRY_DELAY)
                 
                 last_check_failed = False
                 
             else:
                 # Only print "waiting" message occasionally to avoid spam
                 if not last_check_failed:
-                    print("⏳ No Book1 detected, waiting for export...")
+                    print(f"⏳ No {target} detected, waiting for export...")
                 last_check_failed = True
             
-            # Wait before next check
-            time.sleep(5)  # Check every 5 seconds
-            
         except KeyboardInterrupt:
             print("\n🛑 Automation stopped by user")
             break
@@ -160,21 +554,34 @@ def auto_capture_and_transform():
         except Exception as e:
             print(f"⚠️ Unexpected error in automation loop: {e}")
             print("🔄 Continuing monitoring...")
-            time.sleep(5)  # Wait longer after errors
+            time.sleep(RETRY_DELAY)  # Wait longer after errors
+
+    watcher.close()
+    close_dde_session()
+    if pipeline is not None:
+        if pipeline.pending:
+            print(f"⏳ Finishing {pipeline.pending} queued export(s)...")
+        pipeline.close()
 
-def capture_once():
+def capture_once(backend=None):
     """
     One-time capture and processing (alternative to continuous monitoring).
     Perfect for manual triggers or GUI integration.
     """
     print("🔍 Looking for Book1 to capture...")
     
-    # Use autosaver module for capture
-    saved_file = capture_book1(SAVE_FOLDER, verbose=True)
+    if INSTRUMENTATION_LOG:
+        instrument.configure(INSTRUMENTATION_LOG)
+    instrument.start_run()
+
+    if backend is None:
+        backend = create_capture_backend(CAPTURE_BACKEND, DROP_FOLDER)
+    saved_file = backend.capture(SAVE_FOLDER, verbose=True)
     
     if saved_file:
         print("🔄 Processing captured file...")
-        success = transform_excel_file(saved_file)
+        success = transform_excel_file(saved_file, open_reports=reports_should_open(backend))
+        instrument.summarize()
         
         if success:
             print("✅ Capture and processing completed!")
@@ -0,0 +1,147 @@
+"""
+parquet_archive.py - Columnar Archive of Enriched Captures
+Writes each capture's brand-enriched rows to a Parquet dataset partitioned
+by Ship Date month (<root>/ship_month=YYYY-MM/<capture>.parquet), with
+dictionary-encoded string columns. query_report() then builds any of the
+profit reports over a date range by reading only the months and columns
+it needs.
+
+Needs pyarrow.
+"""
+
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from aggregation import REPORT_SPECS, add_brand_category, build_reports
+from export_reader import QUANTITY_COLUMNS
+
+# Low-cardinality strings stored as Parquet dictionaries (pandas categoricals).
+# Any other categorical column (City, State, ... from the export reader) is
+# stored as a dictionary too. Every dictionary's index type is pinned to int32:
+# pandas picks int8 or int16 codes by category count, and captures of
+# different sizes must share one schema.
+DICTIONARY_COLUMNS = ["Account Name", "Brand", "CATEGORY", "Salesman"]
+PARTITION_FIELD = "ship_month"
+CAPTURED_AT = "Captured At"
+UNKNOWN_MONTH = "unknown"
+
+_SPECS_BY_NAME = {spec.name: spec for spec in REPORT_SPECS}
+
+
+def _with_fixed_dictionaries(schema):
+    """schema with every dictionary field's index type set to int32."""
+    import pyarrow as pa
+
+    for i, field in enumerate(schema):
+        if pa.types.is_dictionary(field.type):
+            schema = schema.set(i, field.with_type(pa.dictionary(pa.int32(), field.type.value_type)))
+    return schema
+
+
+def archive_capture(df, root, capture_name, captured_at=None):
+    """
+    Append one enriched capture to the archive.
+
+    Re-archiving the same capture_name overwrites its files, so reprocessing
+    a capture is safe.
+
+    Args:
+        df (DataFrame): Brand-enriched capture
+        root (str): Archive directory
+        capture_name (str): Name for this capture's files (e.g. the export's stem)
+        captured_at (datetime, optional): When the capture was taken (defaults to now)
+
+    Returns:
+        list: Paths of the Parquet files written
+    """
+    df = df.drop(columns=["Brand : Category"], errors="ignore").copy()
+    df["Ship Date"] = pd.to_datetime(df["Ship Date"], errors="coerce")
+    df[CAPTURED_AT] = pd.Timestamp(captured_at or datetime.now())
+    for column in DICTIONARY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _with_fixed_dictionaries(pa.Schema.from_pandas(df, preserve_index=False))
+    months = df["Ship Date"].dt.strftime("%Y-%m").fillna(UNKNOWN_MONTH)
+    written = []
+    for month, part in df.groupby(months, sort=True):
+        folder = os.path.join(root, f"{PARTITION_FIELD}={month}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{capture_name}.parquet")
+        table = pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+        pq.write_table(table, path)
+        written.append(path)
+    return written
+
+
+def _months_between(start, end):
+    """Return YYYY-MM strings from start's month through end's month."""
+    months = pd.period_range(start.to_period("M"), end.to_period("M"), freq="M")
+    return [str(m) for m in months]
+
+
+def load_range(root, columns, start=None, end=None):
+    """
+    Read the archived rows with Ship Date in [start, end].
+
+    Only partitions for the months in range and only the requested
+    columns are read. Where overlapping exports archived the same invoice,
+    only the most recent capture's rows are kept.
+    """
+    import pyarrow.dataset as ds
+
+    # Archives written before the index width was pinned hold int8/int16
+    # dictionaries; reading through the fixed schema casts them all to int32
+    discovered = ds.dataset(root, format="parquet", partitioning="hive")
+    dataset = ds.dataset(root, format="parquet", partitioning="hive",
+                         schema=_with_fixed_dictionaries(discovered.schema))
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    partition_filter = None
+    if start is not None and end is not None:
+        partition_filter = ds.field(PARTITION_FIELD).isin(_months_between(start, end))
+    elif start is not None or end is not None:
+        partition_filter = ds.field(PARTITION_FIELD) != UNKNOWN_MONTH
+
+    wanted = list(dict.fromkeys(list(columns) + ["Ship Date", "Invoice Number", CAPTURED_AT]))
+    df = dataset.to_table(columns=wanted, filter=partition_filter).to_pandas()
+
+    if start is not None:
+        df = df[df["Ship Date"] >= start]
+    if end is not None:
+        df = df[df["Ship Date"] < end + pd.Timedelta(days=1)]
+
+    # Same rule as the rolling store: the latest capture of an invoice wins
+    latest = df.groupby("Invoice Number", observed=True)[CAPTURED_AT].transform("max")
+    return df[df[CAPTURED_AT] == latest]
+
+
+def query_report(root, report, start=None, end=None, weighting="unit"):
+    """
+    Build a profit report from the archive for Ship Dates in [start, end].
+
+    Args:
+        root (str): Archive directory
+        report (str): "id", "br" or "brcat"
+        start (date or str, optional): First ship date (inclusive)
+        end (date or str, optional): Last ship date (inclusive)
+        weighting (str): "unit" or "quantity" (see aggregation.py)
+
+    Returns:
+        DataFrame: Same layout as the processed reports
+    """
+    spec = _SPECS_BY_NAME[report]
+    key_columns = ["Brand", "CATEGORY"] if report == "brcat" else [spec.key]
+    value_columns = ["Sale Price", "Unit Cost"]
+    if weighting == "quantity":
+        value_columns += QUANTITY_COLUMNS
+    df = load_range(root, key_columns + value_columns, start, end)
+    if report == "brcat":
+        add_brand_category(df)
+    return build_reports(df, [spec], weighting)[report]
@@ -0,0 +1,156 @@
+"""
+pipeline.py - Background Capture Processing Pipeline
+Lets the capture loop hand captured exports to worker threads, so reading,
+aggregating and writing one export never blocks detecting and capturing
+the next Book1.
+
+    capture loop --submit(path)--> bounded queue --> worker threads
+                                                          |
+    on_complete(result), in capture order <---------------+
+
+submit() blocks while the queue is full (backpressure), so a burst of
+exports can't pile up unbounded work. Completions are reported strictly
+in submission order, even when a later export finishes first.
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import instrument
+
+# seq:       submission number (0, 1, 2, ...)
+# path:      the submitted export
+# run_id:    instrumentation run that was current when it was submitted
+# value:     what process(path) returned (None on error)
+# error:     the exception raised, or None
+# waited_s:  time spent queued before a worker picked it up
+# elapsed_s: time spent processing
+PipelineResult = namedtuple(
+    "PipelineResult", ["seq", "path", "run_id", "value", "error", "waited_s", "elapsed_s"]
+)
+
+_STOP = object()
+
+
+class ProcessingPipeline:
+    """
+    Bounded producer/consumer queue feeding a pool of worker threads.
+
+    At most workers + max_queued exports are outstanding at once; submit()
+    waits for room beyond that. Threads rather than processes, so workers
+    share the warm brand map cache and the capture loop's settings.
+    """
+
+    def __init__(self, process, workers=2, max_queued=4, on_complete=None):
+        """
+        Args:
+            process (callable): process(path) -> value, run on a worker thread
+            workers (int): Worker threads
+            max_queued (int): Exports allowed to wait for a free worker
+            on_complete (callable, optional): Called with each PipelineResult,
+                in submission order, on whichever worker finished it
+        """
+        self.process = process
+        self.on_complete = on_complete
+        self.max_depth = 0
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._submit_lock = threading.Lock()
+        self._done = threading.Condition()
+        self._submitted = 0
+        self._reported = 0
+        self._finished = {}
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"pipeline-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def pending(self):
+        """Exports submitted but not yet reported complete."""
+        with self._done:
+            return self._submitted - self._reported
+
+    def submit(self, path, timeout=None):
+        """
+        Queue an export for processing, waiting while the queue is full.
+
+        Args:
+            path (str): Captured export
+            timeout (float, optional): Give up after this many seconds
+
+        Returns:
+            int: The export's sequence number, or None if the queue stayed full
+        """
+        with self._submit_lock:
+            # Count it before a worker can possibly finish it
+            with self._done:
+                seq = self._submitted
+                self._submitted += 1
+            item = (seq, path, instrument.current_run(), time.perf_counter())
+            try:
+                self._queue.put(item, timeout=timeout)
+            except BaseException as e:
+                # Timed out, or interrupted (Ctrl+C) while blocked on a full
+                # queue: never queued, so it must not count as pending
+                with self._done:
+                    self._submitted -= 1
+                    self._done.notify_all()
+                if isinstance(e, queue.Full):
+                    return None
+                raise
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return seq
+
+    def join(self, timeout=None):
+        """Wait until every submitted export has been reported; False on timeout."""
+        with self._done:
+            return self._done.wait_for(lambda: self._reported == self._submitted, timeout)
+
+    def close(self, wait=True):
+        """Stop the workers, first finishing everything queued if wait is True."""
+        if wait:
+            self.join()
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            seq, path, run_id, queued_at = item
+            instrument.bind_run(run_id)
+            start = time.perf_counter()
+            value = error = None
+            try:
+                value = self.process(path)
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+            self._finish(PipelineResult(seq, path, run_id, value, error, start - queued_at, elapsed))
+
+    def _finish(self, result):
+        # Hold finished results until every earlier export has been reported
+        with self._done:
+            self._finished[result.seq] = result
+            while self._reported in self._finished:
+                ready = self._finished.pop(self._reported)
+                if self.on_complete is not None:
+                    try:
+                        self.on_complete(ready)
+                    except Exception as e:
+                        print(f"⚠️ Completion handler failed for {ready.path}: {e}")
+                self._reported += 1
+            self._done.notify_all()
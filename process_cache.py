@@ -0,0 +1,140 @@
+"""
+process_cache.py - Process Metadata Cache
+Remembers what psutil said about a process, so the capture-side helpers
+don't call psutil.Process(pid).name() for the same few Excel processes on
+every check.
+
+Entries are keyed on (pid, create_time): a pid the OS has handed to a new
+process is never mistaken for the old one. An entry older than max_age is
+revalidated with is_running() (one create_time lookup, far cheaper than
+name(), which resolves the executable path) and evicted once the process
+has exited or its pid was reused.
+
+Failed lookups (access denied, process gone) are cached too, as None, for
+max_age: a pid psutil keeps refusing isn't looked up again on every check.
+
+psutil is imported on first use, keeping autosaver's import light.
+"""
+
+import time
+import threading
+from collections import Counter, namedtuple
+
+EXCEL_EXE = "excel.exe"
+
+# pid:         process id
+# create_time: process start time (psutil), part of the cache key
+# name:        executable name, e.g. "EXCEL.EXE"
+ProcessInfo = namedtuple("ProcessInfo", ["pid", "create_time", "name"])
+
+
+def _psutil_process(pid):
+    import psutil
+    return psutil.Process(pid)
+
+
+def _gone_errors():
+    import psutil
+    return (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+
+class ProcessInfoCache:
+    """
+    pid -> ProcessInfo cache with liveness revalidation.
+
+    Stats in self.stats: hits, misses (a psutil name lookup was needed),
+    revalidations, evictions (process exited or pid reused) and errors
+    (lookups psutil refused, e.g. access denied).
+    """
+
+    def __init__(self, max_age=5.0, process_factory=None):
+        """
+        Args:
+            max_age (float): Seconds an entry is trusted before is_running() is checked again
+            process_factory (callable, optional): pid -> psutil.Process-like object
+        """
+        self.max_age = max_age
+        self.process_factory = process_factory or _psutil_process
+        self.stats = Counter()
+        self._entries = {}   # pid -> (ProcessInfo or None, process object or None, checked_at)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, pid):
+        """
+        Return the ProcessInfo for pid, or None if the process is gone or inaccessible.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is not None:
+                info, process, checked_at = entry
+                if now - checked_at <= self.max_age:
+                    self.stats["hits"] += 1
+                    return info
+                del self._entries[pid]
+                if info is not None:
+                    self.stats["revalidations"] += 1
+                    if self._is_running(process):
+                        self._entries[pid] = (info, process, now)
+                        self.stats["hits"] += 1
+                        return info
+                    self.stats["evictions"] += 1
+
+            self.stats["misses"] += 1
+            try:
+                process = self.process_factory(pid)
+                info = ProcessInfo(pid, process.create_time(), process.name())
+            except _gone_errors():
+                self.stats["errors"] += 1
+                self._entries[pid] = (None, None, now)
+                return None
+            self._entries[pid] = (info, process, now)
+            return info
+
+    def name(self, pid):
+        """Executable name for pid, or None if it can't be looked up."""
+        info = self.get(pid)
+        return info.name if info is not None else None
+
+    def is_excel(self, pid):
+        """True if pid is a running excel.exe."""
+        name = self.name(pid)
+        return name is not None and name.lower() == EXCEL_EXE
+
+    def forget(self, live_pids):
+        """
+        Evict every entry whose pid isn't in live_pids (e.g. the pids that
+        still own an Excel window), without waiting for max_age.
+        """
+        live_pids = set(live_pids)
+        with self._lock:
+            for pid in [p for p in self._entries if p not in live_pids]:
+                del self._entries[pid]
+                self.stats["evictions"] += 1
+
+    def hit_rate(self):
+        """Fraction of lookups answered without a psutil name lookup."""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    @staticmethod
+    def _is_running(process):
+        # psutil compares the stored create_time, so a reused pid reads as not running
+        try:
+            return process.is_running()
+        except _gone_errors():
+            return False
+
+
+_default_cache = None
+
+
+def get_process_cache():
+    """Return the shared process-wide ProcessInfoCache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ProcessInfoCache()
+    return _default_cache
@@ -0,0 +1,170 @@
+"""
+report_writer.py - Pluggable Report Writers
+Backends for writing processed reports: streaming xlsx, legacy
+openpyxl (DataFrame.to_excel), CSV and Parquet. Pick one by name with
+get_writer().
+
+Report values stay numeric; the xlsx writers apply Excel number formats
+per column (COLUMN_FORMATS) instead of baking formatted strings into rows.
+"""
+
+import os
+
+# Excel number format per report column
+COLUMN_FORMATS = {
+    "Profit %": "0.00%",
+}
+# Number format for datetime columns (e.g. Ship Date in the Enriched Rows sheet)
+DATE_FORMAT = "yyyy-mm-dd"
+
+
+def _column_formats(df):
+    """Return (column index, number format) for each formatted column in df."""
+    import pandas as pd
+
+    formats = []
+    for i, (column, dtype) in enumerate(df.dtypes.items()):
+        if column in COLUMN_FORMATS:
+            formats.append((i, COLUMN_FORMATS[column]))
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            formats.append((i, DATE_FORMAT))
+    return formats
+
+
+def _rows(df):
+    """Yield each DataFrame row as a tuple of plain Python values (NaN -> None)."""
+    values = df.astype(object).where(df.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+class OpenpyxlWriter:
+    """Original behavior: DataFrame.to_excel through openpyxl's cell model."""
+
+    name = "openpyxl"
+    extension = ".xlsx"
+    supports_sheets = True
+
+    def write(self, df, path):
+        self.write_book({"Sheet1": df}, path)
+
+    def write_book(self, sheets, path):
+        import pandas as pd
+
+        with pd.ExcelWriter(path, engine="openpyxl") as excel_writer:
+            for sheet_name, df in sheets.items():
+                df.to_excel(excel_writer, sheet_name=sheet_name, index=False)
+                worksheet = excel_writer.sheets[sheet_name]
+                for col_idx, number_format in _column_formats(df):
+                    for (cell,) in worksheet.iter_rows(min_row=2, min_col=col_idx + 1, max_col=col_idx + 1):
+                        cell.number_format = number_format
+
+
+class StreamingXlsxWriter:
+    """
+    Constant-memory xlsx writer.
+
+    Uses xlsxwriter in constant_memory mode when it is installed, otherwise
+    openpyxl's write-only workbook. Either way rows are streamed straight to
+    the file rather than built up as cell objects.
+    """
+
+    name = "xlsx"
+    extension = ".xlsx"
+    supports_sheets = True
+
+    def write(self, df, path):
+        self.write_book({"Sheet1": df}, path)
+
+    def write_book(self, sheets, path):
+        """Stream every (sheet name -> DataFrame) into one workbook in a single write."""
+        try:
+            import xlsxwriter
+        except ImportError:
+            self._write_book_openpyxl(sheets, path)
+            return
+
+        # xlsxwriter writes datetimes as bare serial numbers unless given a date format
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "default_date_format": DATE_FORMAT})
+        try:
+            header_format = workbook.add_format({"bold": True})
+            for sheet_name, df in sheets.items():
+                worksheet = workbook.add_worksheet(sheet_name)
+                # Column formats must be set before constant_memory flushes any rows;
+                # unformatted cells then pick them up
+                for col_idx, number_format in _column_formats(df):
+                    worksheet.set_column(col_idx, col_idx, None, workbook.add_format({"num_format": number_format}))
+                worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+                for row_idx, row in enumerate(_rows(df), start=1):
+                    worksheet.write_row(row_idx, 0, row)
+        finally:
+            workbook.close()
+
+    def _write_book_openpyxl(self, sheets, path):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+
+        workbook = Workbook(write_only=True)
+        for sheet_name, df in sheets.items():
+            worksheet = workbook.create_sheet(sheet_name)
+            worksheet.append([str(c) for c in df.columns])
+            formats = _column_formats(df)
+            for row in _rows(df):
+                if formats:
+                    row = list(row)
+                    for col_idx, number_format in formats:
+                        cell = WriteOnlyCell(worksheet, value=row[col_idx])
+                        cell.number_format = number_format
+                        row[col_idx] = cell
+                worksheet.append(row)
+        workbook.save(path)
+
+
+class CsvWriter:
+    """Plain CSV, the cheapest format to produce."""
+
+    name = "csv"
+    extension = ".csv"
+    supports_sheets = False
+
+    def write(self, df, path):
+        df.to_csv(path, index=False)
+
+
+class ParquetWriter:
+    """Columnar Parquet (needs pyarrow or fastparquet)."""
+
+    name = "parquet"
+    extension = ".parquet"
+    supports_sheets = False
+
+    def write(self, df, path):
+        df.to_parquet(path, index=False)
+
+
+WRITERS = {
+    writer.name: writer
+    for writer in (StreamingXlsxWriter, OpenpyxlWriter, CsvWriter, ParquetWriter)
+}
+
+
+def get_writer(name):
+    """
+    Look up a report writer backend by name.
+
+    Args:
+        name (str): One of "xlsx", "openpyxl", "csv", "parquet"
+
+    Returns:
+        Writer instance with .extension and .write(df, path); writers with
+        .supports_sheets also have .write_book(sheets, path)
+    """
+    try:
+        return WRITERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown report writer {name!r} (choose from {', '.join(WRITERS)})")
+
+
+def report_path(folder, prefix, source_path, writer):
+    """Build the output path for a report, e.g. processed_ver-id_Captured_x.xlsx."""
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(folder, prefix + stem + writer.extension)
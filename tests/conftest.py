@@ -0,0 +1,19 @@
+"""
+Shared pytest setup.
+
+The other scripts in this folder are interactive Windows experiments
+(win32com, input()), not tests; they are kept out of collection.
+"""
+
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+collect_ignore = [
+    name for name in os.listdir(TESTS_DIR)
+    if name.endswith(".py") and not name.startswith("test_") and name != "conftest.py"
+]
@@ -0,0 +1,92 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregate_store import AggregateStore, combine_partials, partial_sums
+from aggregation import add_brand_category, build_reports
+
+
+def capture(*lines):
+    return pd.DataFrame(lines, columns=["Invoice Number", "Account Name", "Brand", "CATEGORY",
+                                        "Ship Date", "Sale Price", "Unit Cost"])
+
+
+JUNE = capture(
+    ("1001", "ACME", "ZETA", "CHEESE", "2025-06-09", 100.0, 60.0),
+    ("1001", "ACME", "ZETA", "CHEESE", "2025-06-09", 50.0, 30.0),
+    ("1002", "BOLT", np.nan, "CHEESE", "2025-06-10", 20.0, 10.0),
+)
+# Whole-export re-capture on Jul 1: June's invoices again (1002 amended) plus a July one
+RE_EXPORT = capture(
+    ("1001", "ACME", "ZETA", "CHEESE", "2025-06-09", 100.0, 60.0),
+    ("1001", "ACME", "ZETA", "CHEESE", "2025-06-09", 50.0, 30.0),
+    ("1002", "BOLT", np.nan, "CHEESE", "2025-06-10", 25.0, 10.0),
+    ("1003", "ACME", "ZETA", "WINE", "2025-07-01", 40.0, 35.0),
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AggregateStore(str(tmp_path / "totals.sqlite")) as store:
+        yield store
+
+
+def totals(report):
+    return dict(zip(report.iloc[:, 0], report["Agg Sale Price"]))
+
+
+def test_re_export_replaces_invoices_but_keeps_their_ship_dates(store):
+    store.append_capture(JUNE, date(2025, 6, 10))
+    assert totals(store.query_report("id", "2025-06-01", "2025-06-30")) == {"ACME": 150.0, "BOLT": 20.0}
+
+    store.append_capture(RE_EXPORT, date(2025, 7, 1))
+    assert totals(store.query_report("id", "2025-06-01", "2025-06-30")) == {"ACME": 150.0, "BOLT": 25.0}
+    assert totals(store.query_report("id", "2025-07-01", "2025-07-31")) == {"ACME": 40.0}
+    assert totals(store.query_report("id")) == {"ACME": 190.0, "BOLT": 25.0}
+
+
+def test_older_capture_does_not_replace_a_newer_one(store):
+    store.append_capture(RE_EXPORT, date(2025, 7, 1))
+    assert store.append_capture(JUNE, date(2025, 6, 10)) == 0
+    assert totals(store.query_report("id", "2025-06-01", "2025-06-30")) == {"ACME": 150.0, "BOLT": 25.0}
+
+
+def test_reports_match_the_per_capture_reports(store):
+    store.append_capture(RE_EXPORT, date(2025, 7, 1))
+    expected = build_reports(add_brand_category(RE_EXPORT.copy()))
+    for name in ("id", "br", "brcat"):
+        stored = store.query_report(name)
+        assert stored.iloc[:, 0].tolist() == expected[name].iloc[:, 0].astype(str).tolist(), name
+        np.testing.assert_allclose(stored["Agg Sale Price"], expected[name]["Agg Sale Price"])
+        np.testing.assert_allclose(stored["Agg Unit Cost"], expected[name]["Agg Unit Cost"])
+    assert store.query_report("brcat")["Brand : Category"].tolist() == [
+        "ZETA : CHEESE", "ZETA : WINE", "nan : CHEESE"]
+
+
+def test_chunked_partials_store_the_same_totals(tmp_path):
+    with AggregateStore(str(tmp_path / "whole.sqlite")) as whole, \
+            AggregateStore(str(tmp_path / "chunked.sqlite")) as chunked:
+        whole.append_capture(RE_EXPORT, date(2025, 7, 1))
+        partial = combine_partials([partial_sums(RE_EXPORT.iloc[:2]), partial_sums(RE_EXPORT.iloc[2:])])
+        chunked.append_partials(partial, date(2025, 7, 1))
+        for name in ("id", "br", "brcat"):
+            pd.testing.assert_frame_equal(whole.query_report(name), chunked.query_report(name))
+
+
+def test_ship_dates_are_normalized(store):
+    cells = RE_EXPORT.assign(**{"Ship Date": pd.to_datetime(RE_EXPORT["Ship Date"])})
+    store.append_capture(cells, date(2025, 7, 1))
+    assert totals(store.query_report("id", date(2025, 7, 1), date(2025, 7, 1))) == {"ACME": 40.0}
+
+
+def test_store_without_ship_dates_is_refused(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE partial_sums (invoice_number TEXT, capture_date TEXT)")
+    conn.close()
+    with pytest.raises(ValueError, match="rebuild"):
+        AggregateStore(path)
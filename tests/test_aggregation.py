@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregation import add_brand_category, build_reports, report_values
+from brand_cache import BrandMapCache
+from synth import generate_export
+
+KEYS = {"id": "Account Name", "br": "Brand", "brcat": "Brand : Category"}
+
+
+def old_reports(df):
+    """The per-report groupby path transform_excel_file used before build_reports."""
+    df_by_cat = df.dropna(subset=["CATEGORY"]).copy()
+    # map(str) labels a missing Brand "nan", as astype(str) did before pandas 3
+    df_by_cat["Brand : Category"] = df["Brand"].map(str) + " : " + df["CATEGORY"].map(str)
+    reports = {}
+    for name, frame in (("id", df), ("br", df), ("brcat", df_by_cat)):
+        grouped_df = frame.groupby(KEYS[name], as_index=False).agg({"Sale Price": "sum", "Unit Cost": "sum"})
+        grouped_df["Profit %"] = (grouped_df["Sale Price"] - grouped_df["Unit Cost"]) / grouped_df["Sale Price"]
+        # Zero sales used to give inf; reports now leave the cell empty
+        grouped_df["Profit %"] = grouped_df["Profit %"].replace([np.inf, -np.inf], np.nan)
+        reports[name] = grouped_df
+    return reports
+
+
+def assert_same_reports(new, old):
+    for name, key in KEYS.items():
+        expected = old[name]
+        actual = new[name]
+        assert actual[key].astype(str).tolist() == expected[key].astype(str).tolist(), name
+        np.testing.assert_allclose(actual["Agg Sale Price"], expected["Sale Price"], rtol=1e-12)
+        np.testing.assert_allclose(actual["Agg Unit Cost"], expected["Unit Cost"], rtol=1e-12)
+        np.testing.assert_allclose(actual["Profit %"], expected["Profit %"], atol=5e-5)
+
+
+def edge_case_export():
+    rows = [
+        # Account Name, Item ID, Brand, CATEGORY, Sale Price, Unit Cost
+        ("ACME", "A1", "ZETA", "CHEESE", 10.0, 6.0),
+        ("ACME", "A2", "ZETA", "WINE", 20.0, 15.0),
+        ("BOLT", "A1", "ZETA", "CHEESE", 5.5, 4.25),
+        (np.nan, "A2", "ZETA", "WINE", 7.0, 3.0),        # no account name
+        ("BOLT", "??1", np.nan, np.nan, 9.0, 1.0),       # Item ID not in the brand map
+        ("ACME", "B1", "ALPHA", np.nan, 4.0, 2.0),       # brand known, CATEGORY missing
+        ("CRUX", "??2", np.nan, "CHEESE", 3.0, 2.0),     # category without a brand -> "nan : CHEESE"
+        ("CRUX", "B2", "ALPHA", "CHEESE", 0.0, 1.0),     # zero sales: no margin
+        ("BOLT", "B1", "ALPHA", "CHEESE", np.nan, 2.0),  # missing price counts as 0
+    ]
+    return pd.DataFrame(rows, columns=["Account Name", "Item ID", "Brand", "CATEGORY", "Sale Price", "Unit Cost"])
+
+
+@pytest.mark.parametrize("categorical", [False, True])
+def test_build_reports_matches_groupby_on_edge_cases(categorical):
+    df = edge_case_export()
+    if categorical:
+        for column in ("Account Name", "Brand", "CATEGORY"):
+            df[column] = df[column].astype("category")
+    old = old_reports(edge_case_export())
+    new = build_reports(add_brand_category(df))
+    assert_same_reports(new, old)
+
+    # NaN keys never form a group; the uncategorized and unknown items drop out of brcat
+    assert "nan" not in new["id"]["Account Name"].astype(str).tolist()
+    assert new["br"]["Brand"].tolist() == ["ALPHA", "ZETA"]
+    assert new["brcat"]["Brand : Category"].tolist() == [
+        "ALPHA : CHEESE", "ZETA : CHEESE", "ZETA : WINE", "nan : CHEESE"]
+    zero_sales = new["brcat"].set_index("Brand : Category").loc["ALPHA : CHEESE"]
+    assert zero_sales["Agg Sale Price"] == 0.0 and np.isnan(zero_sales["Profit %"])
+
+
+def test_build_reports_matches_groupby_on_enriched_export():
+    export = generate_export(20_000, seed=7)
+    rng = np.random.default_rng(7)
+    export.loc[rng.choice(len(export), 200, replace=False), "Item ID"] = "NOT-IN-MAP"
+    export.loc[rng.choice(len(export), 200, replace=False), "Account Name"] = np.nan
+    cache = BrandMapCache()
+
+    old = old_reports(cache.enrich(export))
+    new = build_reports(add_brand_category(cache.enrich(export)))
+    assert_same_reports(new, old)
+    assert new["br"]["Agg Sale Price"].sum() < new["id"]["Agg Sale Price"].sum()
+
+
+def quantity_export(**columns):
+    df = pd.DataFrame({
+        "Account Name": ["ACME", "ACME", "BOLT", "BOLT"],
+        "Brand": ["ZETA", "ZETA", "ZETA", "ALPHA"],
+        "CATEGORY": ["CHEESE", "CHEESE", "CHEESE", np.nan],
+        "Sale Price": [39.24, 34.40, 10.0, 5.0],
+        "Unit Cost": [32.17, 32.17, 8.0, np.nan],
+        "Sale Quantity": [0.5, 0.0, 3.0, np.nan],
+        "RT Quantity": [0, 1, np.nan, 0],
+    })
+    return df.assign(**columns)
+
+
+def test_quantity_weighting_by_hand():
+    values = report_values(quantity_export(), "quantity")
+    # half a case sold; a return (test123.csv rows 16/18: Sale Quantity 0, RT 1)
+    # gives negative revenue and cost; NaN quantities and costs count as 0
+    np.testing.assert_allclose(values["Sale Price"], [19.62, -34.40, 30.0, 0.0])
+    np.testing.assert_allclose(values["Unit Cost"], [16.085, -32.17, 24.0, 0.0])
+
+    reports = build_reports(add_brand_category(quantity_export()), weighting="quantity")
+    by_account = reports["id"].set_index("Account Name")
+    assert by_account.loc["ACME", "Agg Sale Price"] == pytest.approx(19.62 - 34.40)
+    assert by_account.loc["ACME", "Agg Unit Cost"] == pytest.approx(16.085 - 32.17)
+    assert by_account.loc["ACME", "Profit %"] == round((-14.78 + 16.085) / -14.78, 4)
+    assert by_account.loc["BOLT", "Agg Sale Price"] == pytest.approx(30.0)
+    assert reports["brcat"]["Brand : Category"].tolist() == ["ZETA : CHEESE"]
+
+
+def test_quantity_weighting_without_returns_column():
+    df = quantity_export().drop(columns=["RT Quantity"])
+    values = report_values(df, "quantity")
+    np.testing.assert_allclose(values["Sale Price"], [19.62, 0.0, 30.0, 0.0])
+    # Unit weighting ignores quantities entirely
+    np.testing.assert_allclose(report_values(df, "unit")["Sale Price"], [39.24, 34.40, 10.0, 5.0])
+    with pytest.raises(ValueError):
+        report_values(df, "extended")
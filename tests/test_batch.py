@@ -0,0 +1,79 @@
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+import batch
+import main
+from brand_cache import get_brand_map_cache
+from synth import write_export
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    # run_batch applies its settings to main in this process too; undo that afterwards
+    for name in ("REPORT_WRITER", "OUTPUT_MODE", "PROFIT_WEIGHTING", "DEDUPE_INDEX_PATH",
+                 "AGGREGATE_STORE_PATH", "PARQUET_ARCHIVE_PATH", "STREAM_CHUNK_ROWS", "INCLUDE_RAW_SHEET"):
+        monkeypatch.setattr(main, name, getattr(main, name))
+    return {"REPORT_WRITER": "csv", "OUTPUT_MODE": "separate", "PROFIT_WEIGHTING": "unit",
+            "DEDUPE_INDEX_PATH": None, "AGGREGATE_STORE_PATH": None, "PARQUET_ARCHIVE_PATH": None}
+
+
+def test_find_exports_filters_and_sorts(tmp_path):
+    for name in ("b.xlsx", "a.CSV", "~$a.xlsx", "processed_a.xlsx", "notes.txt", "c.xlsx.tmp"):
+        (tmp_path / name).write_text("x")
+    (tmp_path / "sub.xlsx").mkdir()
+    assert [os.path.basename(p) for p in batch.find_exports(str(tmp_path))] == ["a.CSV", "b.xlsx"]
+    assert [os.path.basename(p) for p in batch.find_exports(str(tmp_path / "*.xlsx"))] == ["b.xlsx"]
+
+
+def test_settings_reach_workers_and_reruns_skip_or_redo(tmp_path, settings, monkeypatch):
+    # Spawned workers start from main's defaults (forked ones would inherit the parent's)
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", functools.partial(ProcessPoolExecutor, mp_context=spawn))
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    for i in range(2):
+        write_export(300, str(exports / f"Captured_{i}.csv"), seed=i)
+    out = tmp_path / "processed"
+
+    summary = batch.run_batch(str(exports), str(out), workers=1, settings=settings)
+    assert summary["processed"] == 2
+    # Workers wrote csv reports, one file per report: the overrides reached them
+    assert sorted(os.listdir(out)) == sorted(
+        [batch.SETTINGS_STAMP] + [f"processed_ver-{r}_Captured_{i}.csv" for r in ("id", "br", "brcat") for i in range(2)])
+
+    assert batch.run_batch(str(exports), str(out), workers=1, settings=settings)["skipped"] == 2
+
+    # A different weighting writes the same file names, so it must not be skipped
+    unit_total = pd.read_csv(out / "processed_ver-id_Captured_0.csv")["Agg Sale Price"].sum()
+    summary = batch.run_batch(str(exports), str(out), workers=1, settings=dict(settings, PROFIT_WEIGHTING="quantity"))
+    assert summary["processed"] == 2
+    assert pd.read_csv(out / "processed_ver-id_Captured_0.csv")["Agg Sale Price"].sum() != unit_total
+
+
+def test_is_up_to_date_checks_inputs_and_settings(tmp_path, settings):
+    for name, value in settings.items():
+        setattr(main, name, value)
+    export = write_export(50, str(tmp_path / "Captured_0.csv"))
+    reports = main.planned_report_paths(export, str(tmp_path))
+    stamps = {os.path.basename(r): batch.report_settings() for r in reports}
+    brand_map_time = os.path.getmtime(get_brand_map_cache().path)
+    os.utime(export, (brand_map_time - 100, brand_map_time - 100))
+    for report in reports:
+        open(report, "w").close()
+        os.utime(report, (brand_map_time + 10, brand_map_time + 10))
+
+    assert batch.is_up_to_date(export, str(tmp_path), stamps)
+    assert not batch.is_up_to_date(export, str(tmp_path), {})  # no record of the settings
+
+    # brand_map.csv edited after the reports were written
+    os.utime(reports[0], (brand_map_time - 10, brand_map_time - 10))
+    assert not batch.is_up_to_date(export, str(tmp_path), stamps)
+    os.utime(reports[0], (brand_map_time + 10, brand_map_time + 10))
+
+    os.remove(reports[1])
+    assert not batch.is_up_to_date(export, str(tmp_path), stamps)
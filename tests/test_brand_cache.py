@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from brand_cache import BRAND_MAP_PATH, BrandMapCache
+from synth import generate_export
+
+
+def test_enrich_matches_left_merge_with_one_row_per_item():
+    export = generate_export(5_000, seed=11)
+    export.loc[::50, "Item ID"] = "NOT-IN-MAP"
+    brand_map_df = pd.read_csv(BRAND_MAP_PATH, dtype={"Item ID": str}).drop_duplicates("Item ID")
+    merged = export.merge(brand_map_df, on="Item ID", how="left")
+
+    enriched = BrandMapCache().enrich(export)
+    assert len(enriched) == len(merged) == len(export)
+    for column in ("Brand", "CATEGORY"):
+        assert enriched[column].astype(object).tolist() == merged[column].astype(object).tolist()
+
+
+def test_duplicate_item_ids_warn_and_keep_the_first_row(tmp_path, capsys):
+    path = tmp_path / "brand_map.csv"
+    path.write_text("Item ID,Brand,CATEGORY\nA1,JFC,\nA1,jfc,\nB2,YOGI,TEA\n")
+    table = BrandMapCache(str(path)).get()
+    assert "A1" in capsys.readouterr().out
+    assert table["Brand"].astype(object).to_dict() == {"A1": "JFC", "B2": "YOGI"}
+
+
+def test_reloads_only_when_the_content_changes(tmp_path):
+    path = tmp_path / "brand_map.csv"
+    path.write_text("Item ID,Brand,CATEGORY\nA1,JFC,\n")
+    cache = BrandMapCache(str(path))
+    assert cache.get().loc["A1", "Brand"] == "JFC"
+    cache.get()
+    assert cache.loads == 1
+
+    path.write_text("Item ID,Brand,CATEGORY\nA1,ACME,\n")
+    assert cache.get().loc["A1", "Brand"] == "ACME"
+    assert cache.loads == 2
@@ -0,0 +1,55 @@
+import errno
+import os
+import shutil
+
+import pytest
+
+from capture_backends import WatchFolderBackend
+
+
+@pytest.fixture
+def drop(tmp_path):
+    backend = WatchFolderBackend(str(tmp_path / "drop"), settle_seconds=0)
+    path = tmp_path / "drop" / "export.csv"
+    path.write_text("Item ID,Sale Price\nA1,1.0\n")
+    return backend, path
+
+
+def test_capture_claims_and_moves_the_file(drop, tmp_path):
+    backend, path = drop
+    target = backend.capture(str(tmp_path / "saved"), "Captured.csv", verbose=False)
+    assert target == str(tmp_path / "saved" / "Captured.csv")
+    assert open(target).read().startswith("Item ID")
+    assert os.listdir(backend.drop_folder) == []
+    assert backend.capture(str(tmp_path / "saved"), verbose=False) is None
+
+
+def test_capture_copies_across_volumes(drop, tmp_path, monkeypatch):
+    backend, path = drop
+
+    def same_volume_only(real):
+        def rename(src, dst):
+            # Renames inside one folder work; into another "volume" they fail with EXDEV
+            if os.path.dirname(src) != os.path.dirname(dst):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            real(src, dst)
+        return rename
+
+    monkeypatch.setattr(os, "rename", same_volume_only(os.rename))
+    monkeypatch.setattr(os, "replace", same_volume_only(os.replace))
+    target = backend.capture(str(tmp_path / "saved"), "Captured.csv", verbose=False)
+    assert target is not None and os.path.exists(target)
+    assert os.listdir(backend.drop_folder) == []
+
+
+def test_failed_move_puts_the_file_back(drop, tmp_path, monkeypatch):
+    backend, path = drop
+
+    def move(src, dst):
+        shutil.copyfile(src, dst)
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(shutil, "move", move)
+    assert backend.capture(str(tmp_path / "saved"), "Captured.csv", verbose=False) is None
+    assert os.listdir(backend.drop_folder) == ["export.csv"]
+    assert os.listdir(tmp_path / "saved") == []
@@ -0,0 +1,46 @@
+import re
+
+from capture_queue import CAPTURED, FAILED, CaptureQueue, capture_filename
+
+
+def test_capture_filename_names_the_book_and_never_reuses_a_file(tmp_path):
+    first = capture_filename("Book1", str(tmp_path))
+    assert re.fullmatch(r"Captured_\d\d-\d\d-\d{4}_\d\d\.\d\d\.\d\d_Book1\.xlsx", first)
+    (tmp_path / first).write_bytes(b"queued, not processed yet")
+
+    second = capture_filename("Book1", str(tmp_path))
+    if second.split("_Book1")[0] == first.split("_Book1")[0]:  # same second
+        assert second == first.replace(".xlsx", "_2.xlsx")
+    assert second != first
+    assert capture_filename("Book2", str(tmp_path)).endswith("_Book2.xlsx")
+
+
+def test_sweep_saves_each_window_under_its_own_name(tmp_path):
+    def capture_one(job, save_folder, filename, verbose):
+        if job.name == "Book3":
+            raise RuntimeError("could not activate")
+        path = tmp_path / filename
+        path.write_bytes(b"xlsx")
+        return str(path)
+
+    queue = CaptureQueue(capture_one)
+    captured = []
+    jobs = queue.sweep([(1, 11, "Book1 - Excel"), (1, 12, "Book1 - Excel"), (1, 13, "Book3 - Excel")],
+                       str(tmp_path), captured.append, verbose=False)
+    assert [job.state for job in jobs] == [CAPTURED, CAPTURED, FAILED]
+    assert len(set(captured)) == 2
+    assert queue.stats[CAPTURED] == 2 and queue.stats[FAILED] == 1
+
+
+def test_fake_excel_sweep_captures_every_open_book(tmp_path):
+    from fakes import FakeExcelBackend
+
+    template = tmp_path / "template.xlsx"
+    template.write_bytes(b"PK")
+    backend = FakeExcelBackend(str(template), all_books=True, save_seconds=0)
+    for _ in range(3):
+        backend.open_export()
+    assert backend.detect()
+    paths = backend.capture_all(str(tmp_path / "saved"), verbose=False)
+    assert [p.rsplit("_", 1)[1] for p in paths] == ["Book1.xlsx", "Book2.xlsx", "Book3.xlsx"]
+    assert not backend.detect()
@@ -0,0 +1,67 @@
+import threading
+import time
+import zipfile
+
+from completion import has_zip_eocd, wait_for_file_complete, wait_until
+
+
+def write_zip(path, comment=b""):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", "<workbook/>" * 200)
+        archive.comment = comment
+    return path
+
+
+def test_wait_until_backs_off_and_gives_up():
+    pauses = []
+    assert wait_until(lambda: False, timeout=0.05, initial_interval=0.001, max_interval=0.004,
+                      sleep=lambda s: (pauses.append(s), time.sleep(s))) is False
+    assert pauses[:3] == [0.001, 0.002, 0.004]
+    assert max(pauses) <= 0.004
+
+
+def test_has_zip_eocd_on_complete_and_partial_zip(tmp_path):
+    path = write_zip(tmp_path / "book.xlsx", comment=b"saved by Excel")
+    assert has_zip_eocd(path)
+
+    data = path.read_bytes()
+    partial = tmp_path / "partial.xlsx"
+    partial.write_bytes(data[:-10])  # EOCD cut short
+    assert not has_zip_eocd(partial)
+    partial.write_bytes(data[:len(data) // 2])  # central directory not written yet
+    assert not has_zip_eocd(partial)
+    assert not has_zip_eocd(tmp_path / "missing.xlsx")
+
+
+def test_wait_for_file_complete_rejects_partial_zip(tmp_path):
+    data = write_zip(tmp_path / "full.xlsx").read_bytes()
+    partial = tmp_path / "partial.xlsx"
+    partial.write_bytes(data[:len(data) // 2])
+    assert wait_for_file_complete(partial, timeout=0.2, initial_interval=0.01) is False
+    assert wait_for_file_complete(partial, timeout=0.2, initial_interval=0.01, require_zip=False) is True
+
+
+def test_wait_for_file_complete_waits_for_growing_file(tmp_path):
+    data = write_zip(tmp_path / "full.xlsx").read_bytes()
+    target = tmp_path / "saving.xlsx"
+
+    def writer():
+        with open(target, "wb") as f:
+            for start in range(0, len(data), 256):
+                f.write(data[start:start + 256])
+                f.flush()
+                time.sleep(0.02)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert wait_for_file_complete(target, timeout=5.0, initial_interval=0.01, max_interval=0.05)
+        assert target.read_bytes() == data
+    finally:
+        thread.join()
+
+
+def test_wait_for_file_complete_times_out_on_missing_file(tmp_path):
+    start = time.monotonic()
+    assert wait_for_file_complete(tmp_path / "never.xlsx", timeout=0.1, initial_interval=0.01) is False
+    assert time.monotonic() - start < 1.0
@@ -0,0 +1,74 @@
+import pytest
+
+from dde_session import DDEError, DDESession, FakeDDETransport
+
+
+def fake_excel(**kwargs):
+    return FakeDDETransport(server_seconds=0, connect_seconds=0, **kwargs)
+
+
+def test_session_is_set_up_once_across_captures():
+    transport = fake_excel()
+    with DDESession(transport) as session:
+        assert session.execute("[A]") is True
+        assert session.execute("[B]") is False
+        assert session.execute("[C]") is False
+    assert transport.calls["create_server"] == 1
+    assert transport.calls["connect"] == 1
+    assert transport.executed == ["[A]", "[B]", "[C]"]
+    assert transport.live_servers == 0
+
+
+def test_failed_exec_is_not_resent_and_next_call_reconnects():
+    transport = fake_excel()
+    session = DDESession(transport, health_interval=60)
+    session.execute("[A]")
+    transport.crash()
+    with pytest.raises(DDEError):
+        session.execute('[SAVE.AS("x.xlsx")]')
+    assert transport.calls["execute"] == 2
+    assert not session.connected
+
+    assert session.execute("[B]") is True
+    assert session.stats["reconnects"] == 1
+    assert transport.executed == ["[A]", "[B]"]
+    session.close()
+    assert transport.live_servers == 0
+
+
+def test_health_check_reconnects_before_sending():
+    transport = fake_excel()
+    session = DDESession(transport, health_interval=0)
+    session.execute("[A]")
+    transport.crash()
+    assert session.execute("[B]") is True
+    assert transport.executed == ["[A]", "[B]"]
+    assert session.stats["health_checks"] == 1
+    session.close()
+
+
+def test_connect_failures_never_leak_servers():
+    transport = fake_excel()
+    transport.refuse_connects = True
+    session = DDESession(transport)
+    for _ in range(3):
+        with pytest.raises(DDEError):
+            session.execute("[A]")
+    assert transport.calls["create_server"] == 6   # one per attempt, each shut down
+    assert transport.live_servers == 0
+    assert transport.calls["execute"] == 0
+
+    transport.refuse_connects = False
+    session.execute("[A]")
+    session.close()
+    session.close()
+    assert transport.live_servers == 0
+
+
+def test_save_as_writes_the_template(tmp_path):
+    template = tmp_path / "template.xlsx"
+    template.write_bytes(b"PK\x05\x06" + b"\0" * 18)
+    target = tmp_path / "out.xlsx"
+    with DDESession(fake_excel(save_template=str(template))) as session:
+        session.execute(f'[SAVE.AS("{target}")]')
+    assert target.read_bytes() == template.read_bytes()
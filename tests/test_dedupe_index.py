@@ -0,0 +1,108 @@
+import os
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dedupe_index import LineDedupIndex, line_hashes
+
+
+def export(*lines):
+    return pd.DataFrame(lines, columns=["Invoice Number", "Item ID", "Ship Date", "Acctid", "Quantity"])
+
+
+FIRST = export(("1001", "A1", "2025-05-01", "C1", 2), ("1001", "B2", "2025-05-01", "C1", 1))
+OVERLAP = export(("1001", "B2", "2025-05-01", "C1", 1), ("1002", "A1", "2025-05-02", "C2", 5))
+
+
+def test_line_hashes_ignore_date_format_and_non_key_columns():
+    text = export(("1001", "A1", "2025-05-01", "C1", 2))
+    cells = export(("1001", "A1", pd.Timestamp("2025-05-01"), "C1", 9))
+    assert line_hashes(text)[0] == line_hashes(cells)[0]
+    assert line_hashes(text)[0] != line_hashes(export(("1001", "A1", "2025-05-02", "C1", 2)))[0]
+
+
+def test_add_persists_and_filter_new_drops_seen_lines(tmp_path):
+    path = str(tmp_path / "lines.npy")
+    index = LineDedupIndex(path)
+    fresh, hashes = index.filter_new(FIRST)
+    assert len(fresh) == 2
+    assert index.add(hashes) == 2
+    assert index.add(hashes) == 0
+
+    reopened = LineDedupIndex(path)
+    assert len(reopened) == 2
+    fresh, hashes = reopened.filter_new(OVERLAP)
+    assert fresh["Invoice Number"].tolist() == ["1002"]
+    assert reopened.add(hashes) == 1
+    assert np.all(np.diff(np.load(path)) > 0)  # kept sorted and unique
+
+
+def test_pending_lines_are_reserved_until_add_or_release(tmp_path):
+    index = LineDedupIndex(str(tmp_path / "lines.npy"))
+    fresh, hashes = index.filter_new(FIRST)
+    assert len(fresh) == 2
+
+    # A concurrent capture overlapping the one in progress gets only its own new line
+    other, other_hashes = index.filter_new(OVERLAP)
+    assert other["Invoice Number"].tolist() == ["1002"]
+
+    # The first capture failed: its lines go back to being unseen
+    index.release(hashes)
+    retry, retry_hashes = index.filter_new(FIRST)
+    assert len(retry) == 2
+    assert index.add(retry_hashes) == 2
+    assert index.add(other_hashes) == 1
+    assert len(index._pending) == 0
+
+
+def test_own_reservations_do_not_hide_later_chunks(tmp_path):
+    index = LineDedupIndex(str(tmp_path / "lines.npy"))
+    _, first_chunk = index.filter_new(FIRST.iloc[:1])
+    # A later chunk of the same capture repeating a line it reserved keeps it, as a whole-frame pass would
+    fresh, _ = index.filter_new(FIRST, own=first_chunk)
+    assert len(fresh) == 2
+    fresh, _ = index.filter_new(FIRST)
+    assert len(fresh) == 0
+
+
+def test_repeated_adds_release_the_old_mapping(tmp_path, monkeypatch):
+    path = str(tmp_path / "lines.npy")
+    index = LineDedupIndex(path)
+    index.add(line_hashes(FIRST))
+
+    real_replace = os.replace
+    old_maps = []
+
+    def replace(src, dst):
+        # Windows can't replace a file that is still mapped
+        assert all(ref() is None for ref in old_maps), "old index file still mapped"
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+    for lines in (OVERLAP, export(("1003", "C3", "2025-05-03", "C3", 1))):
+        old_maps.append(weakref.ref(index._hashes._mmap))
+        assert index.add(line_hashes(lines)) == 1
+    assert len(index) == 4
+
+
+def test_failed_replace_keeps_the_index_usable(tmp_path, monkeypatch):
+    index = LineDedupIndex(str(tmp_path / "lines.npy"))
+    index.add(line_hashes(FIRST))
+    fresh, hashes = index.filter_new(OVERLAP)
+
+    def replace(src, dst):
+        raise PermissionError(13, "The process cannot access the file")
+
+    monkeypatch.setattr(os, "replace", replace)
+    with pytest.raises(PermissionError):
+        index.add(hashes)
+    monkeypatch.undo()
+
+    assert len(index) == 2
+    assert index.contains(line_hashes(FIRST)).all()
+    # Still reserved, so a concurrent capture doesn't count them meanwhile
+    assert len(index.filter_new(OVERLAP)[0]) == 0
+    assert index.add(hashes) == 1
+    assert len(index.filter_new(OVERLAP)[0]) == 0
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+import export_reader
+from export_reader import REPORT_COLUMNS, iter_export_chunks, read_export
+from report_writer import get_writer
+from synth import scale_export
+
+
+@pytest.fixture(scope="module")
+def export_xlsx(tmp_path_factory):
+    df = scale_export(200, seed=4)
+    path = str(tmp_path_factory.mktemp("exports") / "export.xlsx")
+    get_writer("xlsx").write(df.drop(columns=["Sale Quantity"]), path)
+    return path
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    used = []
+    read_excel = pd.read_excel
+
+    def spy(*args, **kwargs):
+        used.append(kwargs.get("engine"))
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(export_reader.pd, "read_excel", spy)
+    return used
+
+
+@pytest.mark.parametrize("calamine", [True, False])
+def test_projection_dtypes_and_engine_choice(export_xlsx, engines, monkeypatch, calamine):
+    if calamine:
+        pytest.importorskip("python_calamine")
+    else:
+        monkeypatch.setattr(export_reader, "_calamine_available", lambda: False)
+
+    # Sale Quantity is missing from this export: asked for, silently skipped
+    df = read_export(export_xlsx, REPORT_COLUMNS + ["Sale Quantity"])
+    assert engines == ["calamine" if calamine else "openpyxl"]
+    assert list(df.columns) == [c for c in pd.read_excel(export_xlsx, nrows=0).columns if c in REPORT_COLUMNS]
+    assert len(df) == 200
+    assert df["Item ID"].map(type).eq(str).all()
+    assert isinstance(df["Account Name"].dtype, pd.CategoricalDtype)
+    assert df["Sale Price"].dtype == "float64"
+
+
+def test_engines_and_chunks_agree(export_xlsx, monkeypatch):
+    pytest.importorskip("python_calamine")
+    calamine = read_export(export_xlsx, None, engine="calamine")
+    openpyxl = read_export(export_xlsx, None, engine="openpyxl")
+    chunked = pd.concat(list(iter_export_chunks(export_xlsx, None, 64)), ignore_index=True)
+    for other in (openpyxl, chunked):
+        pd.testing.assert_frame_equal(calamine.astype(object), other.astype(object), check_dtype=False)
+
+
+def test_bad_data_is_raised_without_a_second_parse(tmp_path, engines):
+    pytest.importorskip("python_calamine")
+    df = scale_export(20, seed=1)
+    df["Sale Price"] = df["Sale Price"].astype(object)
+    df.loc[3, "Sale Price"] = "12,50 EUR"
+    path = str(tmp_path / "bad.xlsx")
+    get_writer("xlsx").write(df, path)
+
+    with pytest.raises(ValueError):
+        read_export(path)
+    assert engines == ["calamine"]
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+import main
+from capture_backends import WatchFolderBackend
+from pipeline import PipelineResult
+from synth import write_export
+
+
+@pytest.fixture
+def folders(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "SAVE_FOLDER", str(tmp_path / "captured"))
+    monkeypatch.setattr(main, "PROCESSED_FOLDER", str(tmp_path / "processed"))
+    for name in ("AGGREGATE_STORE_PATH", "DEDUPE_INDEX_PATH", "PARQUET_ARCHIVE_PATH", "INSTRUMENTATION_LOG"):
+        monkeypatch.setattr(main, name, None)
+    return tmp_path
+
+
+def test_capture_once_with_the_folder_backend(folders, monkeypatch):
+    opened = []
+    monkeypatch.setattr(os, "startfile", opened.append, raising=False)
+    backend = WatchFolderBackend(str(folders / "drop"), settle_seconds=0)
+    write_export(500, str(folders / "drop" / "export.csv"))
+
+    saved = main.capture_once(backend)
+    assert saved is not None and os.path.dirname(saved) == main.SAVE_FOLDER
+    assert os.listdir(main.PROCESSED_FOLDER) == ["processed_" + os.path.basename(saved)[:-4] + ".xlsx"]
+    assert opened == []  # headless: OPEN_REPORTS = None only opens for the dde backend
+
+
+def test_capture_once_without_startfile(folders, monkeypatch):
+    monkeypatch.delattr(os, "startfile", raising=False)
+    monkeypatch.setattr(main, "OPEN_REPORTS", True)
+    backend = WatchFolderBackend(str(folders / "drop"), settle_seconds=0)
+    write_export(500, str(folders / "drop" / "export.csv"))
+    assert main.capture_once(backend) is not None
+
+
+def test_reports_should_open(monkeypatch):
+    monkeypatch.setattr(os, "startfile", lambda path: None, raising=False)
+    folder, dde = WatchFolderBackend.__new__(WatchFolderBackend), type("DDE", (), {"name": "dde"})()
+    assert main.reports_should_open(dde) and not main.reports_should_open(folder)
+    monkeypatch.setattr(main, "OPEN_REPORTS", True)
+    assert main.reports_should_open(folder)
+    monkeypatch.delattr(os, "startfile")
+    assert not main.reports_should_open(dde)
+
+
+def test_report_completion_summarizes_without_startfile(monkeypatch, capsys):
+    monkeypatch.delattr(os, "startfile", raising=False)
+    summarized = []
+    monkeypatch.setattr(main.instrument, "summarize", lambda run_id=None: summarized.append(run_id))
+    result = PipelineResult(0, "Captured.csv", 7, (["processed_Captured.xlsx"], 10), None, 0.0, 0.1)
+    main._report_completion(result, open_reports=True)
+    assert summarized == [7]
+    assert "Processed Captured.csv" in capsys.readouterr().out
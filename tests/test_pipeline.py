@@ -0,0 +1,74 @@
+import os
+import time
+import signal
+import _thread
+import threading
+
+from pipeline import ProcessingPipeline
+
+
+def test_completions_are_reported_in_submission_order():
+    # Later submissions finish first; on_complete must still see 0, 1, 2, ...
+    delays = {0: 0.2, 1: 0.1, 2: 0.0, 3: 0.05}
+    reported = []
+    with ProcessingPipeline(lambda seq: time.sleep(delays[seq]) or seq * 10, workers=4, max_queued=4,
+                            on_complete=reported.append) as pipeline:
+        for seq in delays:
+            assert pipeline.submit(seq) == seq
+        assert pipeline.join(timeout=5)
+    assert [result.seq for result in reported] == [0, 1, 2, 3]
+    assert [result.value for result in reported] == [0, 10, 20, 30]
+
+
+def test_errors_are_reported_not_raised():
+    def process(path):
+        raise ValueError(path)
+
+    reported = []
+    with ProcessingPipeline(process, workers=1, on_complete=reported.append) as pipeline:
+        pipeline.submit("bad.xlsx")
+    assert isinstance(reported[0].error, ValueError)
+    assert reported[0].value is None
+
+
+def test_submit_blocks_while_queue_is_full():
+    release = threading.Event()
+    pipeline = ProcessingPipeline(lambda path: release.wait(5), workers=1, max_queued=1)
+    try:
+        assert pipeline.submit("a") == 0         # taken by the worker
+        time.sleep(0.05)
+        assert pipeline.submit("b") == 1         # waits in the queue
+        assert pipeline.submit("c", timeout=0.1) is None
+        assert pipeline.pending == 2
+    finally:
+        release.set()
+        pipeline.close()
+    assert pipeline.pending == 0
+
+
+def test_interrupted_submit_is_not_left_pending():
+    release = threading.Event()
+    pipeline = ProcessingPipeline(lambda path: release.wait(5), workers=1, max_queued=1)
+    try:
+        pipeline.submit("a")
+        time.sleep(0.05)
+        pipeline.submit("b")
+        # Ctrl+C while submit() is blocked on the full queue (a real SIGINT
+        # wakes the blocked put on POSIX; interrupt_main waits for it to return)
+        ctrl_c = (lambda: os.kill(os.getpid(), signal.SIGINT)) if os.name == "posix" else _thread.interrupt_main
+        timer = threading.Timer(0.1, ctrl_c)
+        timer.start()
+        try:
+            pipeline.submit("c")
+        except KeyboardInterrupt:
+            pass
+        else:
+            raise AssertionError("submit() was not interrupted")
+        finally:
+            timer.cancel()
+        release.set()
+        assert pipeline.join(timeout=3)
+        assert pipeline.pending == 0
+    finally:
+        release.set()
+        pipeline.close(wait=False)
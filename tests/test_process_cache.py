@@ -0,0 +1,109 @@
+import psutil
+import pytest
+
+import process_cache
+from process_cache import ProcessInfoCache
+
+
+class FakeProcess:
+    def __init__(self, pid, name, create_time, table):
+        self.pid = pid
+        self._name = name
+        self._create_time = create_time
+        self._table = table
+
+    def create_time(self):
+        return self._create_time
+
+    def name(self):
+        return self._name
+
+    def is_running(self):
+        # Like psutil: False once the pid is gone or belongs to a newer process
+        current = self._table.processes.get(self.pid)
+        return current is not None and current[1] == self._create_time
+
+
+class FakeProcessTable:
+    def __init__(self):
+        self.processes = {}   # pid -> (name, create_time)
+        self.denied = set()
+        self.lookups = 0
+
+    def __call__(self, pid):
+        self.lookups += 1
+        if pid in self.denied:
+            raise psutil.AccessDenied(pid)
+        if pid not in self.processes:
+            raise psutil.NoSuchProcess(pid)
+        name, create_time = self.processes[pid]
+        return FakeProcess(pid, name, create_time, self)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(process_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def table():
+    table = FakeProcessTable()
+    table.processes[100] = ("EXCEL.EXE", 1.0)
+    return table
+
+
+def test_hits_within_max_age(table, clock):
+    cache = ProcessInfoCache(max_age=5, process_factory=table)
+    assert cache.is_excel(100)
+    clock[0] += 4
+    assert cache.name(100) == "EXCEL.EXE"
+    assert table.lookups == 1
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_revalidates_after_max_age_without_a_new_lookup(table, clock):
+    cache = ProcessInfoCache(max_age=5, process_factory=table)
+    cache.get(100)
+    clock[0] += 6
+    assert cache.name(100) == "EXCEL.EXE"
+    assert table.lookups == 1
+    assert cache.stats["revalidations"] == 1
+
+
+def test_reused_pid_is_evicted_and_looked_up_again(table, clock):
+    cache = ProcessInfoCache(max_age=5, process_factory=table)
+    cache.get(100)
+    table.processes[100] = ("notepad.exe", 2.0)  # Excel exited, pid handed to a new process
+    clock[0] += 6
+    assert not cache.is_excel(100)
+    assert cache.get(100).create_time == 2.0
+    assert cache.stats["evictions"] == 1
+    assert table.lookups == 2
+
+
+def test_forget_evicts_pids_without_windows(table, clock):
+    table.processes[200] = ("EXCEL.EXE", 3.0)
+    cache = ProcessInfoCache(max_age=5, process_factory=table)
+    cache.get(100)
+    cache.get(200)
+    cache.forget([200])
+    assert len(cache) == 1
+    cache.get(100)
+    assert table.lookups == 3
+
+
+def test_refused_lookups_are_cached_for_max_age(table, clock):
+    table.denied.add(300)
+    cache = ProcessInfoCache(max_age=5, process_factory=table)
+    for _ in range(10):
+        assert cache.get(300) is None
+    assert table.lookups == 1
+    assert cache.stats["errors"] == 1
+
+    clock[0] += 6
+    table.denied.clear()
+    table.processes[300] = ("EXCEL.EXE", 4.0)
+    assert cache.is_excel(300)
+    assert table.lookups == 2
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from report_writer import OpenpyxlWriter, StreamingXlsxWriter, get_writer
+
+
+def write_streaming(sheets, path):
+    pytest.importorskip("xlsxwriter")
+    StreamingXlsxWriter().write_book(sheets, path)
+
+
+def write_streaming_openpyxl(sheets, path):
+    StreamingXlsxWriter()._write_book_openpyxl(sheets, path)
+
+
+def write_to_excel(sheets, path):
+    OpenpyxlWriter().write_book(sheets, path)
+
+
+XLSX_BACKENDS = [write_streaming, write_streaming_openpyxl, write_to_excel]
+
+
+@pytest.mark.parametrize("write_book", XLSX_BACKENDS)
+def test_enriched_rows_keep_dates_formatted(write_book, tmp_path):
+    rows = pd.DataFrame({
+        "Item ID": ["A1", "B2"],
+        "Ship Date": pd.to_datetime(["2025-06-12", None]),
+        "Sale Price": [12.5, 3.0],
+    })
+    path = tmp_path / "book.xlsx"
+    write_book({"Enriched Rows": rows}, str(path))
+
+    sheet = openpyxl.load_workbook(path)["Enriched Rows"]
+    date_cell = sheet["B2"]
+    assert date_cell.is_date
+    assert date_cell.value.date() == pd.Timestamp("2025-06-12").date()
+    assert date_cell.number_format == "yyyy-mm-dd"
+    assert sheet["B3"].value is None
+    assert sheet["C2"].number_format == "General"
+
+
+def profit_report():
+    from aggregation import add_brand_category, build_reports
+
+    export = pd.DataFrame({
+        "Account Name": ["ACME", "BOLT", "BOLT"],
+        "Brand": ["ZETA", "ZETA", "ZETA"],
+        "CATEGORY": ["CHEESE", "CHEESE", "CHEESE"],
+        "Sale Price": [100.0, 0.0, 0.0],
+        "Unit Cost": [80.88, 5.0, 1.0],
+    })
+    return build_reports(add_brand_category(export))["id"]
+
+
+@pytest.mark.parametrize("write_book", XLSX_BACKENDS)
+def test_profit_percent_round_trips_as_a_formatted_number(write_book, tmp_path):
+    path = tmp_path / "report.xlsx"
+    write_book({"By Account": profit_report()}, str(path))
+
+    sheet = openpyxl.load_workbook(path)["By Account"]
+    assert [cell.value for cell in sheet[1]] == ["Account Name", "Agg Sale Price", "Agg Unit Cost", "Profit %"]
+    acme, bolt = sheet["D2"], sheet["D3"]
+    assert acme.value == pytest.approx(0.1912)
+    assert acme.number_format == "0.00%"
+    # Zero sales: no margin, an empty cell rather than inf or an error
+    assert sheet["A3"].value == "BOLT" and bolt.value is None
+
+
+@pytest.mark.parametrize("name", ["csv", "parquet"])
+def test_profit_percent_stays_numeric_in_flat_files(name, tmp_path):
+    if name == "parquet":
+        pytest.importorskip("pyarrow")
+    writer = get_writer(name)
+    path = str(tmp_path / f"report{writer.extension}")
+    writer.write(profit_report(), path)
+    back = pd.read_csv(path) if name == "csv" else pd.read_parquet(path)
+    assert back["Profit %"].iloc[0] == pytest.approx(0.1912)
+    assert pd.isna(back["Profit %"].iloc[1])
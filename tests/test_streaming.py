@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from aggregation import ReportAccumulator, add_brand_category, build_reports
+from brand_cache import BrandMapCache
+from synth import generate_export, write_export
+
+
+@pytest.fixture(scope="module")
+def enriched():
+    export = generate_export(12_000, seed=3)
+    export["Sale Quantity"] = np.random.default_rng(3).integers(1, 6, len(export))
+    export.loc[::97, "Item ID"] = "NOT-IN-MAP"
+    export.loc[::89, "Account Name"] = np.nan
+    return BrandMapCache().enrich(export)
+
+
+@pytest.mark.parametrize("weighting", ["unit", "quantity"])
+@pytest.mark.parametrize("chunk_rows", [1, 999, 5_000, 50_000])
+def test_accumulator_matches_whole_frame(enriched, weighting, chunk_rows):
+    if chunk_rows == 1:
+        enriched = enriched.iloc[:500]
+    whole = build_reports(add_brand_category(enriched.copy()), weighting=weighting)
+
+    accumulator = ReportAccumulator(weighting=weighting)
+    for start in range(0, len(enriched), chunk_rows):
+        accumulator.add(add_brand_category(enriched.iloc[start:start + chunk_rows].copy()))
+    assert accumulator.rows == len(enriched)
+
+    chunked = accumulator.reports()
+    for name in whole:
+        pd.testing.assert_frame_equal(
+            chunked[name].astype({chunked[name].columns[0]: str}),
+            whole[name].astype({whole[name].columns[0]: str}),
+            check_exact=True,
+        )
+
+
+@pytest.fixture
+def csv_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "REPORT_WRITER", "csv")
+    monkeypatch.setattr(main, "OUTPUT_MODE", "separate")
+    monkeypatch.setattr(main, "INCLUDE_RAW_SHEET", False)
+    monkeypatch.setattr(main, "AGGREGATE_STORE_PATH", None)
+    monkeypatch.setattr(main, "PARQUET_ARCHIVE_PATH", None)
+    monkeypatch.setattr(main, "DEDUPE_INDEX_PATH", None)
+    return tmp_path
+
+
+def run_export(path, out_folder, chunk_rows):
+    main.STREAM_CHUNK_ROWS = chunk_rows
+    paths, rows = main.process_export(path, str(out_folder), verbose=False)
+    return [open(p, "rb").read() for p in paths], rows
+
+
+@pytest.mark.parametrize("extension", ["csv", "xlsx"])
+def test_streaming_process_export_writes_the_same_reports(monkeypatch, csv_settings, extension):
+    monkeypatch.setattr(main, "STREAM_CHUNK_ROWS", None)
+    export = write_export(6_000, str(csv_settings / f"export.{extension}"), seed=5)
+
+    whole, whole_rows = run_export(export, csv_settings / "whole", None)
+    chunked, chunked_rows = run_export(export, csv_settings / "chunked", 700)
+    assert whole_rows == chunked_rows == 6_000
+    assert chunked == whole
+
+
+def test_streaming_dedupe_matches_whole_frame(monkeypatch, csv_settings):
+    monkeypatch.setattr(main, "STREAM_CHUNK_ROWS", None)
+    first = write_export(3_000, str(csv_settings / "first.csv"), seed=1)
+    second = write_export(3_000, str(csv_settings / "second.csv"), seed=2)
+
+    results = {}
+    for mode, chunk_rows in (("whole", None), ("chunked", 400)):
+        monkeypatch.setattr(main, "DEDUPE_INDEX_PATH", str(csv_settings / f"{mode}_lines.npy"))
+        results[mode] = [run_export(path, csv_settings / mode / os.path.basename(path), chunk_rows)
+                         for path in (first, second, first)]
+    assert results["chunked"] == results["whole"]
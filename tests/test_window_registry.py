@@ -0,0 +1,58 @@
+import pytest
+
+from window_registry import EXCEL_WINDOW_CLASS, ExcelWindowRegistry, FakeWin32, book_name, is_unsaved_book
+
+
+@pytest.mark.parametrize("title, name", [
+    ("Book1 - Excel", "Book1"),
+    ("Book12 - Excel", "Book12"),
+    ("Microsoft Excel - Book3", "Book3"),
+])
+def test_unsaved_book_titles(title, name):
+    assert is_unsaved_book(title)
+    assert book_name(title) == name
+
+
+@pytest.mark.parametrize("title", [
+    "Price Book2024.xlsx - Excel",
+    "Vendor-Book7.xlsx - Excel",
+    "Book12.xlsx - Excel",
+    "Captured_10-16-2026_14.05.31_Book2.xlsx - Excel",
+    "Bookings - Excel",
+])
+def test_saved_workbooks_are_never_unsaved_books(title):
+    assert not is_unsaved_book(title)
+    assert book_name(title) is None
+
+
+def test_registry_tracks_titles_and_closed_windows():
+    api = FakeWin32()
+    for i in range(50):
+        api.open_window("Chrome_WidgetWin_1", f"window {i}")
+    saved = api.open_window(EXCEL_WINDOW_CLASS, "Price Book2024.xlsx - Excel", pid=7)
+    book = api.open_window(EXCEL_WINDOW_CLASS, "Book2 - Excel", pid=7)
+    registry = ExcelWindowRegistry(api, max_age=0)
+
+    assert [w.hwnd for w in registry.find_unsaved_books()] == [book]
+    assert registry.find_book1() == (None, None, None)
+
+    api.set_title(book, "Captured_x_Book2.xlsx - Excel")
+    assert registry.find_unsaved_books() == []
+
+    api.close_window(saved)
+    assert [w.hwnd for w in registry.refresh()] == [book]
+    # Every window's class was looked up exactly once
+    assert api.calls["GetClassName"] == 52
+    assert registry.stats["gone_windows"] == 1
+
+
+def test_registry_reuses_recent_refresh():
+    api = FakeWin32()
+    api.open_window(EXCEL_WINDOW_CLASS, "Book1 - Excel")
+    registry = ExcelWindowRegistry(api, max_age=60)
+    assert registry.has_book1()
+    assert registry.has_book1()
+    assert api.calls["EnumWindows"] == 1
+    registry.invalidate()
+    registry.has_book1()
+    assert api.calls["EnumWindows"] == 2
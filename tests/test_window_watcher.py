@@ -0,0 +1,37 @@
+import time
+import threading
+
+from window_watcher import FakeDesktop, FakeWatcher, PollingWatcher
+
+
+def test_fake_watcher_wakes_on_book1():
+    desktop = FakeDesktop()
+    watcher = FakeWatcher(desktop)
+    threading.Timer(0.05, desktop.open_window, ["Book1 - Excel"]).start()
+    start = time.monotonic()
+    assert watcher.wait(timeout=5)
+    assert time.monotonic() - start < 1
+    # Woken by the change event, not by polling
+    assert desktop.checks <= 3
+
+
+def test_fake_watcher_ignores_captured_files_and_times_out():
+    desktop = FakeDesktop()
+    desktop.open_window("Captured_06-01-2025_10.00_Book1.xlsx - Excel")
+    assert not FakeWatcher(desktop).wait(timeout=0.1)
+
+
+def test_polling_watcher_backs_off_and_resets():
+    found = []
+    watcher = PollingWatcher(lambda: bool(found), min_interval=0.01, max_interval=0.04, backoff=2)
+    assert not watcher.wait(timeout=0.1)
+    assert watcher.interval == 0.04
+    found.append(True)
+    assert watcher.wait(timeout=0.1)
+    assert watcher.interval == 0.01
+
+
+def test_closed_watcher_stops_waiting():
+    watcher = PollingWatcher(lambda: False, min_interval=0.01)
+    threading.Timer(0.05, watcher.close).start()
+    assert not watcher.wait()
@@ -0,0 +1,223 @@
+"""
+window_registry.py - Incremental Excel Window Registry
+Keeps a cached hwnd -> (pid, class, title, visible) map of top-level
+windows so Book1 checks don't call GetClassName / GetWindowText on every
+window on the desktop each time.
+
+A refresh still enumerates the top-level hwnds (cheap), but only looks
+up windows it hasn't seen before. A window's class and process never
+change, so non-Excel windows cost nothing after their first sighting;
+only the few XLMAIN windows have their title and visibility re-read.
+Refreshes closer together than max_age seconds reuse the cache outright.
+
+Win32Api wraps the real win32gui/win32process calls; FakeWin32 is an
+in-memory desktop with call counters, for measuring on Linux.
+"""
+
+import re
+import time
+import threading
+from collections import Counter, namedtuple
+
+EXCEL_WINDOW_CLASS = "XLMAIN"
+
+# Excel's title for a new, never-saved workbook: "Book2 - Excel" (or
+# "Microsoft Excel - Book2" on older versions). Anchored, so saved files
+# like "Price Book2024.xlsx - Excel" or "Book12.xlsx - Excel" never match.
+UNSAVED_BOOK_PATTERN = re.compile(r"^(?:Microsoft Excel - )?(Book\d+)(?: - Excel)?$", re.IGNORECASE)
+
+# pid:     owning process id
+# hwnd:    window handle
+# title:   window text (re-read on every refresh for Excel windows)
+# visible: IsWindowVisible (re-read on every refresh for Excel windows)
+ExcelWindow = namedtuple("ExcelWindow", ["pid", "hwnd", "title", "visible"])
+
+
+def is_capturable_book1(title):
+    """Same title rule autosaver has always used for an unsaved Book1."""
+    title = title.lower()
+    return "book1" in title and "captured_" not in title
+
+
+def is_unsaved_book(title):
+    """True for an unsaved BookN window (Book1, Book2, ...); saved files never match."""
+    return UNSAVED_BOOK_PATTERN.match(title.strip()) is not None
+
+
+def book_name(title):
+    """The BookN part of a window title ("Book2 - Excel" -> "Book2"), or None."""
+    match = UNSAVED_BOOK_PATTERN.match(title.strip())
+    return match.group(1) if match else None
+
+
+class Win32Api:
+    """The handful of pywin32 calls the registry needs."""
+
+    def __init__(self):
+        import win32gui
+        import win32process
+
+        self.EnumWindows = win32gui.EnumWindows
+        self.GetClassName = win32gui.GetClassName
+        self.GetWindowText = win32gui.GetWindowText
+        self.IsWindowVisible = win32gui.IsWindowVisible
+        self.GetWindowThreadProcessId = win32process.GetWindowThreadProcessId
+
+
+class FakeWin32:
+    """
+    In-memory stand-in for Win32Api.
+
+    Holds a desktop of (class, title, pid, visible) windows that tests can
+    open, retitle and close from any thread, and counts every API call in
+    self.calls so enumeration cost can be compared across strategies.
+    """
+
+    def __init__(self):
+        self.windows = {}
+        self.calls = Counter()
+        self._next_hwnd = 0x10000
+        self._lock = threading.Lock()
+
+    def open_window(self, class_name, title, pid=1000, visible=True):
+        with self._lock:
+            hwnd = self._next_hwnd
+            self._next_hwnd += 4
+            self.windows[hwnd] = [class_name, title, pid, visible]
+        return hwnd
+
+    def set_title(self, hwnd, title):
+        with self._lock:
+            self.windows[hwnd][1] = title
+
+    def close_window(self, hwnd):
+        with self._lock:
+            del self.windows[hwnd]
+
+    def EnumWindows(self, callback, extra):
+        self.calls["EnumWindows"] += 1
+        with self._lock:
+            hwnds = list(self.windows)
+        for hwnd in hwnds:
+            self.calls["EnumWindows callback"] += 1
+            callback(hwnd, extra)
+
+    def GetClassName(self, hwnd):
+        self.calls["GetClassName"] += 1
+        return self.windows[hwnd][0]
+
+    def GetWindowText(self, hwnd):
+        self.calls["GetWindowText"] += 1
+        return self.windows[hwnd][1]
+
+    def IsWindowVisible(self, hwnd):
+        self.calls["IsWindowVisible"] += 1
+        return self.windows[hwnd][3]
+
+    def GetWindowThreadProcessId(self, hwnd):
+        self.calls["GetWindowThreadProcessId"] += 1
+        return 1, self.windows[hwnd][2]
+
+
+class ExcelWindowRegistry:
+    """
+    Cached view of the desktop's Excel (XLMAIN) windows.
+
+    Stats in self.stats: refreshes (enumeration passes), cache_hits
+    (queries answered without one), enumerated (hwnds seen across all
+    refreshes), new_windows (hwnds that needed a GetClassName),
+    gone_windows and excel_rereads.
+    """
+
+    def __init__(self, api=None, max_age=0.1):
+        """
+        Args:
+            api: Win32Api-like object (defaults to the real pywin32 calls)
+            max_age (float): Seconds a refresh stays fresh enough to reuse
+        """
+        self.api = api if api is not None else Win32Api()
+        self.max_age = max_age
+        self.stats = Counter()
+        self._classes = {}   # hwnd -> class name, for every window seen
+        self._excel = {}     # hwnd -> ExcelWindow, XLMAIN windows only
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Force the next query to refresh (e.g. after a window event)."""
+        with self._lock:
+            self._refreshed_at = None
+
+    def refresh(self, max_age=None):
+        """
+        Bring the cache up to date, unless it was refreshed within max_age seconds.
+
+        Returns:
+            list: Current ExcelWindow entries
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed_at is not None and now - self._refreshed_at <= max_age:
+                self.stats["cache_hits"] += 1
+                return list(self._excel.values())
+
+            hwnds = []
+            self.api.EnumWindows(lambda hwnd, _: hwnds.append(hwnd), None)
+            self.stats["refreshes"] += 1
+            self.stats["enumerated"] += len(hwnds)
+
+            current = set(hwnds)
+            for hwnd in [h for h in self._classes if h not in current]:
+                # Closed window; forget it so a reused handle is looked up again
+                del self._classes[hwnd]
+                self.stats["gone_windows"] += 1
+
+            api = self.api
+            excel = {}  # rebuilt in enumeration (z-) order
+            for hwnd in hwnds:
+                class_name = self._classes.get(hwnd)
+                if class_name is None:
+                    class_name = self._classes[hwnd] = api.GetClassName(hwnd)
+                    self.stats["new_windows"] += 1
+                if class_name != EXCEL_WINDOW_CLASS:
+                    continue
+
+                known = self._excel.get(hwnd)
+                pid = known.pid if known else api.GetWindowThreadProcessId(hwnd)[1]
+                excel[hwnd] = ExcelWindow(pid, hwnd, api.GetWindowText(hwnd), bool(api.IsWindowVisible(hwnd)))
+                self.stats["excel_rereads"] += 1
+
+            self._excel = excel
+            self._refreshed_at = time.monotonic()
+            return list(self._excel.values())
+
+    def excel_windows(self, max_age=None):
+        """Return [(pid, hwnd, title, visible)] for every XLMAIN window."""
+        return [tuple(window) for window in self.refresh(max_age)]
+
+    def find_book1(self, max_age=None):
+        """Return (pid, hwnd, title) of a visible, uncaptured Book1 window, or (None, None, None)."""
+        for window in self.refresh(max_age):
+            if window.visible and is_capturable_book1(window.title):
+                return window.pid, window.hwnd, window.title
+        return None, None, None
+
+    def find_unsaved_books(self, max_age=None):
+        """Return every visible, uncaptured BookN window as ExcelWindow entries, in z-order."""
+        return [window for window in self.refresh(max_age)
+                if window.visible and is_unsaved_book(window.title)]
+
+    def has_book1(self, max_age=None):
+        """True if find_book1() would find a window."""
+        return self.find_book1(max_age)[0] is not None
+
+    def hit_rate(self):
+        """Fraction of queries answered from the cache without enumerating."""
+        total = self.stats["refreshes"] + self.stats["cache_hits"]
+        return self.stats["cache_hits"] / total if total else 0.0
+
+    def class_hit_rate(self):
+        """Fraction of enumerated windows whose class came from the cache."""
+        enumerated = self.stats["enumerated"]
+        return 1 - self.stats["new_windows"] / enumerated if enumerated else 0.0
@@ -0,0 +1,257 @@
+"""
+window_watcher.py - Book1 Window Watchers
+Wakes the automation loop when a capturable Book1 window may have appeared,
+instead of sleeping a fixed 5 seconds between full window scans.
+
+Implementations:
+    WinEventWatcher  - WinEvent hooks (window create / show / name change)
+    PollingWatcher   - periodic checks with adaptive backoff (any platform)
+    FakeWatcher      - in-memory, driven by a FakeDesktop (for Linux testing)
+"""
+
+import sys
+import time
+import threading
+
+
+class WindowWatcher:
+    """
+    Interface shared by all watchers.
+
+    wait(timeout) blocks until a Book1 window is available (returns True)
+    or the timeout expires (returns False). close() releases any hooks.
+    """
+
+    def wait(self, timeout=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PollingWatcher(WindowWatcher):
+    """
+    Calls check() on an interval that starts at min_interval and grows by
+    backoff (up to max_interval) while nothing is found. Finding a window
+    resets the interval, so a burst of exports is picked up quickly.
+    """
+
+    def __init__(self, check, min_interval=0.25, max_interval=2.0, backoff=1.5):
+        self.check = check
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._stop = threading.Event()
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop.is_set():
+            if self.check():
+                self.interval = self.min_interval
+                return True
+
+            delay = self.interval
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            self._stop.wait(delay)
+        return False
+
+    def close(self):
+        self._stop.set()
+
+
+class WinEventWatcher(WindowWatcher):
+    """
+    Event-driven watcher using SetWinEventHook.
+
+    A background thread owns the hook and its message loop; window create,
+    show and name-change events for XLMAIN windows set a flag that wait()
+    blocks on, so the idle loop uses no CPU. check() still confirms a real
+    Book1 is there, and runs at least every recheck_interval seconds in case
+    an event is missed.
+    """
+
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    OBJID_WINDOW = 0
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+
+    def __init__(self, check, recheck_interval=30.0):
+        import ctypes
+        from ctypes import wintypes
+
+        self.check = check
+        self.recheck_interval = recheck_interval
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._signal = threading.Event()
+        self._ready = threading.Event()
+        self._thread_id = None
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run, name="WinEventWatcher", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        ctypes, wintypes, user32 = self._ctypes, self._wintypes, self._user32
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+        )
+        class_buf = ctypes.create_unicode_buffer(16)
+
+        def _callback(hook, event, hwnd, id_object, id_child, thread, event_time):
+            if id_object != self.OBJID_WINDOW or not hwnd:
+                return
+            if event not in (self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_SHOW, self.EVENT_OBJECT_NAMECHANGE):
+                return
+            user32.GetClassNameW(hwnd, class_buf, len(class_buf))
+            if class_buf.value == "XLMAIN":
+                self._signal.set()
+
+        # Keep a reference so the callback isn't garbage collected
+        self._callback = WinEventProc(_callback)
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        # Two narrow ranges rather than CREATE..NAMECHANGE, which would also
+        # deliver LOCATIONCHANGE (every cursor move), FOCUS, SELECTION,
+        # STATECHANGE and VALUECHANGE to the Python callback
+        hooks = [
+            user32.SetWinEventHook(first, last, 0, self._callback, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+            for first, last in (
+                (self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_SHOW),
+                (self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE),
+            )
+        ]
+        if not all(hooks):
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+            self._error = OSError("SetWinEventHook failed")
+            self._ready.set()
+            return
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Clear before checking so an event during check() isn't lost
+            self._signal.clear()
+            if self.check():
+                return True
+
+            delay = self.recheck_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            self._signal.wait(delay)
+
+    def close(self):
+        if self._thread_id is not None:
+            self._user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+            self._thread.join(timeout=2)
+            self._thread_id = None
+
+
+class FakeDesktop:
+    """
+    In-memory stand-in for the Excel windows on a desktop.
+
+    Tests open and close window titles from any thread; watchers see them
+    through is_book1_available() (same title rule as autosaver's
+    find_book1_window_filtered) and, for FakeWatcher, through change events.
+    """
+
+    def __init__(self):
+        self.titles = []
+        self.checks = 0
+        self._changed = threading.Condition()
+
+    def open_window(self, title):
+        with self._changed:
+            self.titles.append(title)
+            self._changed.notify_all()
+
+    def close_window(self, title):
+        with self._changed:
+            self.titles.remove(title)
+            self._changed.notify_all()
+
+    def is_book1_available(self):
+        self.checks += 1
+        for title in list(self.titles):
+            if "book1" in title.lower() and "captured_" not in title.lower():
+                return True
+        return False
+
+
+class FakeWatcher(WindowWatcher):
+    """Event-driven watcher over a FakeDesktop, mirroring WinEventWatcher."""
+
+    def __init__(self, desktop):
+        self.desktop = desktop
+        self._closed = False
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.desktop._changed:
+            while not self._closed:
+                if self.desktop.is_book1_available():
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.desktop._changed.wait(remaining)
+        return False
+
+    def close(self):
+        self._closed = True
+        with self.desktop._changed:
+            self.desktop._changed.notify_all()
+
+
+def create_window_watcher(check, prefer_events=True, verbose=True):
+    """
+    Build the best available watcher for this platform.
+
+    Args:
+        check (callable): Returns True when a Book1 window is available
+        prefer_events (bool): Try WinEvent hooks before falling back to polling
+        verbose (bool): Whether to print which watcher was chosen
+
+    Returns:
+        WindowWatcher
+    """
+    if prefer_events and sys.platform == "win32":
+        try:
+            watcher = WinEventWatcher(check)
+            if verbose:
+                print("👂 Watching for Excel windows via WinEvent hooks")
+            return watcher
+        except Exception as e:
+            if verbose:
+                print(f"⚠️ WinEvent hook unavailable ({e}), falling back to polling")
+
+    if verbose:
+        print("🔁 Watching for Excel windows by polling")
+    return PollingWatcher(check)
@@ -0,0 +1,60 @@
+"""
+xlsx_probe.py - Lightweight xlsx Structure Checks
+Answers "how big is this workbook?" from the sheet's <dimension> tag
+without parsing any cells, so a captured file is fully parsed only once
+(by the transform step).
+"""
+
+import re
+import zipfile
+
+_DIMENSION_RE = re.compile(rb'<dimension\s+ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"')
+_PROBE_BYTES = 4096  # <dimension> sits right after the <worksheet> opening tag
+
+
+def _column_number(letters):
+    """Convert an Excel column name (A, Z, AA...) to a 1-based number."""
+    number = 0
+    for ch in letters.decode("ascii"):
+        number = number * 26 + (ord(ch) - ord("A") + 1)
+    return number
+
+
+def _first_sheet_name(archive):
+    names = archive.namelist()
+    if "xl/worksheets/sheet1.xml" in names:
+        return "xl/worksheets/sheet1.xml"
+    sheets = sorted(n for n in names if n.startswith("xl/worksheets/") and n.endswith(".xml"))
+    return sheets[0] if sheets else None
+
+
+def read_sheet_dimension(path):
+    """
+    Read the used range of the first worksheet of an xlsx file.
+
+    Args:
+        path (str): xlsx file
+
+    Returns:
+        tuple: (rows, columns) including the header row, or None if the
+        file isn't a readable xlsx or has no <dimension> record
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            sheet_name = _first_sheet_name(archive)
+            if sheet_name is None:
+                return None
+            with archive.open(sheet_name) as sheet:
+                head = sheet.read(_PROBE_BYTES)
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+    match = _DIMENSION_RE.search(head)
+    if not match:
+        return None
+    first_col, first_row, last_col, last_row = match.groups()
+    if last_col is None:
+        last_col, last_row = first_col, first_row
+    rows = int(last_row) - int(first_row) + 1
+    columns = _column_number(last_col) - _column_number(first_col) + 1
+    return rows, columns